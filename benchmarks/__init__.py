@@ -0,0 +1 @@
+"""Benchmarks for flashcard study (run as scripts, not part of the test suite)."""
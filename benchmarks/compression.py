@@ -0,0 +1,80 @@
+"""Compare deck size and load/save time with each compression codec.
+
+Usage:
+    python -m benchmarks.compression [SIZE ...]
+
+For each deck size and codec (none, gzip, lzma), reports the bytes on
+disk (manifest plus segments), the median time to load the whole deck,
+the time to write every segment (as after changing codec) and the
+median time to save one review.
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.decks import make_deck
+
+CODECS = [None, "gzip", "lzma"]
+RUNS = 5
+
+
+def _disk_bytes(path: Path) -> int:
+    segments = path.with_suffix('.segments')
+    return path.stat().st_size + sum(p.stat().st_size for p in segments.iterdir())
+
+
+def measure(path: Path, size: int, codec) -> tuple[int, float, float, float]:
+    """Return (bytes on disk, load, full save, review save) for one codec."""
+    from flashcard_study.data.models import BackupPolicy
+    from flashcard_study.data.repository import FlashCardRepository
+    from flashcard_study.domain.spaced_repetition import apply_review
+
+    # No backups, so only the live deck is measured
+    database = make_deck(size)
+    database.compression = codec
+    database.backups = BackupPolicy(recent=0, hourly=0, daily=0, weekly=0)
+
+    repo = FlashCardRepository(path)
+    start = time.perf_counter()
+    repo.save(database)
+    full_save = time.perf_counter() - start
+    disk = _disk_bytes(path)
+
+    loads = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        database = FlashCardRepository(path).load()
+        loads.append(time.perf_counter() - start)
+
+    rng = random.Random(0)
+    saves = []
+    for card in rng.sample(database.cards, RUNS):
+        updated = apply_review(card, 1.0, datetime.now())
+        database.cards = [updated if c.id == updated.id else c for c in database.cards]
+        start = time.perf_counter()
+        repo.save(database)
+        saves.append(time.perf_counter() - start)
+
+    return disk, statistics.median(loads), full_save, statistics.median(saves)
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'cards':>8} {'codec':>6} {'size':>10} {'load':>9} {'full save':>10} {'review':>9}")
+    for size in sizes:
+        for codec in CODECS:
+            with tempfile.TemporaryDirectory() as home:
+                path = Path(home) / "flashcards.json"
+                disk, load, full_save, review = measure(path, size, codec)
+                print(
+                    f"{size:>8} {codec or 'none':>6} {disk / 1024:>8.0f}KB "
+                    f"{load * 1000:>7.1f}ms {full_save * 1000:>8.1f}ms {review * 1000:>7.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000])
@@ -0,0 +1,73 @@
+"""Synthetic deck generation shared by the benchmarks."""
+
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from flashcard_study.data.models import FlashCard, FlashCardDatabase, ReviewHistory
+from flashcard_study.data.repository import FlashCardRepository
+
+TAGS = [
+    "python", "python::asyncio", "python::typing", "algorithms", "algorithms::graphs",
+    "rust", "web::react", "web::css", "databases", "networking",
+]
+
+
+def make_deck(size: int, seed: int = 0, now: datetime = None) -> FlashCardDatabase:
+    """Build a deck of random cards with realistic review histories.
+
+    Args:
+        size: Number of cards
+        seed: Random seed, so runs are comparable
+        now: Reference time (defaults to datetime.now())
+
+    Returns:
+        FlashCardDatabase with `size` cards
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9))) for _ in range(2000)]
+
+    cards = []
+    for _ in range(size):
+        card_type = rng.choice(["qa", "qa", "cloze", "multiple_choice"])
+        answer = " ".join(rng.choices(words, k=rng.randint(1, 4)))
+        question = " ".join(rng.choices(words, k=rng.randint(6, 14)))
+        options = None
+        if card_type == "cloze":
+            question = f"{question} {{{{{answer}}}}}"
+        elif card_type == "multiple_choice":
+            options = [answer] + [" ".join(rng.choices(words, k=2)) for _ in range(3)]
+            rng.shuffle(options)
+
+        card = FlashCard.new(
+            card_type, question, answer, rng.sample(TAGS, rng.randint(1, 3)), options,
+            now=now - timedelta(days=rng.randint(30, 400))
+        )
+        history = []
+        review_time = card.created_at
+        for _ in range(rng.randint(0, 20)):
+            review_time += timedelta(days=rng.uniform(0.5, 20))
+            history.append(ReviewHistory(
+                date=review_time, score=rng.choice([0.0, 0.5, 1.0]),
+                interval_days=rng.uniform(1, 30)
+            ))
+        if history:
+            card = card.model_copy(update={
+                "last_reviewed": history[-1].date,
+                "next_review": history[-1].date + timedelta(days=history[-1].interval_days),
+                "ease_factor": rng.uniform(1.3, 3.0),
+                "interval_days": history[-1].interval_days,
+                "review_count": len(history),
+                "review_history": history,
+            })
+        cards.append(card)
+
+    return FlashCardDatabase(cards=cards)
+
+
+def write_deck(path: Path, size: int, seed: int = 0) -> FlashCardRepository:
+    """Write a synthetic deck to path and return a repository for it."""
+    repo = FlashCardRepository(path)
+    repo.save(make_deck(size, seed))
+    return repo
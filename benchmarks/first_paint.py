@@ -0,0 +1,59 @@
+"""Measure time to first paint of the home screen on large decks.
+
+Usage:
+    python -m benchmarks.first_paint [SIZE ...]
+
+Reports, per deck size, how long the app takes to paint the home screen
+(with placeholder stats) and how long until the stats are filled in.
+HomeScreen only starts loading after its first refresh, so the moment
+the load begins marks the first paint.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.decks import write_deck
+
+
+async def measure() -> tuple[float, float]:
+    """Return (first paint, stats ready) in seconds for the current HOME."""
+    from flashcard_study.app import FlashcardStudyApp
+    from flashcard_study.ui.screens.home import HomeScreen
+
+    marks = {}
+    load_stats = HomeScreen._load_stats
+
+    async def timed_load_stats(screen: HomeScreen) -> None:
+        marks["paint"] = time.perf_counter()
+        await load_stats(screen)
+        marks["ready"] = time.perf_counter()
+
+    HomeScreen._load_stats = timed_load_stats
+    try:
+        app = FlashcardStudyApp()
+        start = time.perf_counter()
+        async with app.run_test():
+            while "ready" not in marks:
+                await asyncio.sleep(0.001)
+    finally:
+        HomeScreen._load_stats = load_stats
+
+    return marks["paint"] - start, marks["ready"] - start
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'cards':>8} {'first paint':>12} {'stats ready':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            write_deck(Path(home) / ".flashcards" / "flashcards.json", size)
+            os.environ["HOME"] = home
+            first_paint, stats_ready = asyncio.run(measure())
+        print(f"{size:>8} {first_paint:>11.3f}s {stats_ready:>11.3f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000, 50_000])
@@ -0,0 +1,73 @@
+"""Simulate daily study of a bulk import with and without load balancing.
+
+Usage:
+    python -m benchmarks.load_balance [SIZE ...]
+
+For each deck size, imports that many new cards on day 0 and reviews
+every due card once a day for DAYS days with the same seeded scores,
+once with plain SM-2 and once with load balancing. Reports the peak,
+mean and standard deviation of reviews per day and the mean time to
+apply one review. Days 0 and 1 (the import and its one-day repeat,
+which is too short to move) are left out of the load figures.
+"""
+
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+DAYS = 120
+# Leading days left out of the load figures
+SKIP_DAYS = 2
+# Chance of each score, as (score, weight)
+SCORES = [(1.0, 0.8), (0.5, 0.12), (0.0, 0.08)]
+
+
+def simulate(size: int, balance: bool) -> tuple[list[int], float]:
+    """Return (reviews on each day, mean seconds to apply a review)."""
+    from flashcard_study.data.models import FlashCard
+    from flashcard_study.domain.load_balance import LoadBalancer
+    from flashcard_study.domain.spaced_repetition import apply_review
+
+    start = datetime(2025, 1, 1, 9)
+    cards = [FlashCard.new("qa", f"Question {i}", f"Answer {i}", now=start) for i in range(size)]
+    balancer = LoadBalancer.from_cards(cards, start) if balance else None
+
+    due = defaultdict(list)
+    for card in cards:
+        due[0].append(card)
+
+    rng = random.Random(0)
+    scores, weights = zip(*SCORES)
+    load = []
+    applying = 0.0
+    for day in range(DAYS):
+        today = start + timedelta(days=day)
+        reviewed = due.pop(day, [])
+        load.append(len(reviewed))
+        for card in reviewed:
+            score = rng.choices(scores, weights)[0]
+            began = time.perf_counter()
+            updated = apply_review(card, score, today, balancer)
+            applying += time.perf_counter() - began
+            due[max(day + 1, (updated.next_review.date() - start.date()).days)].append(updated)
+    return load, applying / max(1, sum(load))
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'cards':>8} {'balance':>8} {'peak/day':>9} {'mean/day':>9} {'stdev':>8} {'per review':>11}")
+    for size in sizes:
+        for balance in (False, True):
+            load, per_review = simulate(size, balance)
+            after = load[SKIP_DAYS:]
+            print(
+                f"{size:>8} {'on' if balance else 'off':>8} {max(after):>9} "
+                f"{statistics.mean(after):>9.1f} {statistics.pstdev(after):>8.1f} "
+                f"{per_review * 1e6:>9.1f}µs"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000])
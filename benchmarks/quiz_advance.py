@@ -0,0 +1,87 @@
+"""Measure how long a quiz takes to advance to the next card on large decks.
+
+Usage:
+    python -m benchmarks.quiz_advance [SIZE ...]
+
+Runs a quiz over QUIZ_LENGTH cards of each deck headlessly and times
+from scoring a card until the next card has been rendered. Each deck is run
+twice: once with the quiz's background writer disabled, to time the
+screen alone, and once saving reviews as a real session would.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.decks import write_deck
+
+QUIZ_LENGTH = 30
+
+
+async def measure(save: bool) -> list[float]:
+    """Return the advance time in seconds for each card of a quiz."""
+    from flashcard_study.app import FlashcardStudyApp
+    from flashcard_study.domain.card_selector import CardSelector
+    from flashcard_study.ui.screens.quiz import QuizScreen
+    from flashcard_study.ui.widgets.card_display import CardDisplay
+
+    marks = {}
+    render = CardDisplay.render
+
+    def timed_render(display: CardDisplay):
+        result = render(display)
+        if display.card.id == marks.get("expect") and display.display:
+            marks["painted"] = time.perf_counter()
+        return result
+
+    app = FlashcardStudyApp()
+    timings = []
+    CardDisplay.render = timed_render
+    try:
+        async with app.run_test(size=(120, 40)) as pilot:
+            cards = CardSelector.select_for_quiz(
+                app.repository.load().cards, count=QUIZ_LENGTH, include_all=True
+            )
+            screen = QuizScreen(cards, app.repository)
+            if not save:
+                screen.writer.submit = lambda card: None
+            await app.push_screen(screen)
+            await pilot.pause()
+
+            for card in cards[1:]:
+                await pilot.press("space")
+                await pilot.pause()
+                marks.clear()
+                marks["expect"] = card.id
+                start = time.perf_counter()
+                await pilot.press("1")
+                while "painted" not in marks:
+                    await asyncio.sleep(0.001)
+                timings.append(marks["painted"] - start)
+    finally:
+        CardDisplay.render = render
+    return timings
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'cards':>8} {'saves':>6} {'median':>9} {'p95':>9} {'max':>9}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            write_deck(Path(home) / ".flashcards" / "flashcards.json", size)
+            os.environ["HOME"] = home
+            for save in (False, True):
+                timings = sorted(asyncio.run(measure(save)))
+                p95 = timings[int(len(timings) * 0.95)]
+                print(
+                    f"{size:>8} {'on' if save else 'off':>6} "
+                    f"{statistics.median(timings) * 1000:>7.1f}ms "
+                    f"{p95 * 1000:>7.1f}ms {timings[-1] * 1000:>7.1f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000])
@@ -0,0 +1,72 @@
+"""Measure the cost of saving a single review on large decks.
+
+Usage:
+    python -m benchmarks.save_review [SIZE ...]
+
+For each deck size, reviews REVIEWS random cards one at a time through
+update_cards(), as the quiz's background writer does, and reports the
+median time per call (which loads the deck, then saves it) and the bytes
+written per review (segment files plus the manifest; the backup
+generation of the old manifest is a hardlink and writes nothing).
+"""
+
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from benchmarks.decks import write_deck
+
+REVIEWS = 20
+
+
+def _written_bytes(directory: Path, before: dict) -> int:
+    """Total size of files created or modified since `before` was taken."""
+    total = 0
+    for path in directory.rglob("*"):
+        if path.is_file():
+            stat = path.stat()
+            if before.get(path) != stat.st_mtime_ns:
+                total += stat.st_size
+    return total
+
+
+def _mtimes(directory: Path) -> dict:
+    return {path: path.stat().st_mtime_ns for path in directory.rglob("*") if path.is_file()}
+
+
+def measure(path: Path, size: int) -> tuple[list[float], list[int]]:
+    """Return save times in seconds and bytes written for each review."""
+    from flashcard_study.domain.spaced_repetition import apply_review
+
+    repo = write_deck(path, size)
+    rng = random.Random(0)
+    cards = repo.load().cards
+    timings, written = [], []
+    for card in rng.sample(cards, REVIEWS):
+        updated = apply_review(card, rng.choice([0.0, 0.5, 1.0]), datetime.now())
+        before = _mtimes(path.parent)
+        start = time.perf_counter()
+        repo.update_cards([updated])
+        timings.append(time.perf_counter() - start)
+        written.append(_written_bytes(path.parent, before))
+    return timings, written
+
+
+def main(sizes: list[int]) -> None:
+    print(f"{'cards':>8} {'update':>9} {'written':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as home:
+            path = Path(home) / ".flashcards" / "flashcards.json"
+            timings, written = measure(path, size)
+            print(
+                f"{size:>8} {statistics.median(timings) * 1000:>7.1f}ms "
+                f"{statistics.median(written) / 1024:>8.1f}KB"
+            )
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [1_000, 10_000])
@@ -4,7 +4,9 @@ from pathlib import Path
 from textual.app import App
 from textual.binding import Binding
 
+from .config import DEFAULT_DECK
 from .data.repository import FlashCardRepository
+from .ui.deck_watcher import DeckWatcher
 from .ui.screens.home import HomeScreen
 
 
@@ -18,14 +20,22 @@ class FlashcardStudyApp(App):
         Binding("question_mark", "help", "Help"),
     ]
 
-    def __init__(self):
-        """Initialize the application."""
+    def __init__(self, deck: str = DEFAULT_DECK):
+        """Initialize the application.
+
+        Args:
+            deck: Name of the deck to study
+        """
         super().__init__()
-        self.repository = FlashCardRepository()
+        self.repository = FlashCardRepository(deck=deck)
+        if deck != DEFAULT_DECK:
+            self.sub_title = f"Deck: {deck}"
+        self.deck_watcher = DeckWatcher(self, self.repository)
 
     def on_mount(self) -> None:
-        """Set up initial screen."""
+        """Set up initial screen and start watching the database file."""
         self.push_screen(HomeScreen(self.repository))
+        self.deck_watcher.start()
 
     def action_help(self) -> None:
         """Show help information."""
@@ -1,16 +1,43 @@
 """Command line interface for flashcard study."""
 
+import hashlib
+import itertools
+import json
+import re
+import signal
+import sys
 import typer
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from typing import Optional
 from pathlib import Path
+from uuid import UUID
 from rich.console import Console
+from rich.markup import escape
 from rich.table import Table
-from datetime import datetime
+from datetime import datetime, timedelta
+from pydantic import ValidationError
 
-from .app import FlashcardStudyApp
+from .config import DEFAULT_DECK
+from .daemon import DaemonClient, DaemonError, DaemonServer, DeckService, socket_path
+from .data.backups import retained
+from .data.catalog import deck_path
+from .data.compression import CODECS
+from .data.models import CardSpec, FlashCard
 from .data.repository import FlashCardRepository
-from .domain.statistics import StatisticsCalculator
-from .domain.anki_exporter import AnkiExporter
+from .domain.card_selector import CardSelector
+from .domain.decks import merge_due, refresh_catalog
+from .domain.history import DEFAULT_HISTORY_LIMIT, compact_cards
+from .domain.integrity import check_repository
+from .domain.load_balance import LoadBalancer
+from .domain.query import QueryError, Term, TextTerm, And, parse_query, plan_cards, plan_repository
+from .domain.statistics import Statistics, StatisticsCalculator
+from .domain.anki_exporter import AnkiExporter, export_deck
+from .domain.anki_importer import AnkiImporter
+from .domain.search import SearchIndex
+from .domain.similarity import DEFAULT_THRESHOLD, SimilarityIndex
+from .domain.spaced_repetition import apply_reviews
+from .domain.sync import DigestCache, plan_sync
+from .domain.tag_index import TagIndex
 
 app = typer.Typer(
     name="flashcard-study",
@@ -19,6 +46,43 @@ app = typer.Typer(
 
 console = Console()
 
+# Deck chosen with the global --deck option
+_deck = DEFAULT_DECK
+
+
+@app.callback(invoke_without_command=True)
+def cli(
+    ctx: typer.Context,
+    deck: str = typer.Option(DEFAULT_DECK, "--deck", envvar="FLASHCARD_DECK", help="Deck to work on (created on first save)"),
+):
+    """Terminal UI for flash card study with spaced repetition.
+
+    Examples:
+        flashcard-study --deck python add cards.jsonl
+        flashcard-study --deck python         # Launch TUI on the python deck
+    """
+    global _deck
+    try:
+        deck_path(deck)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+    _deck = deck
+
+    if ctx.invoked_subcommand is None:
+        _launch_tui()
+
+
+def _repository() -> FlashCardRepository:
+    """Repository for the deck chosen with --deck."""
+    return FlashCardRepository(deck=_deck)
+
+
+def _launch_tui() -> None:
+    # Imported here so headless commands don't load Textual
+    from .app import FlashcardStudyApp
+    FlashcardStudyApp(deck=_deck).run()
+
 
 @app.command()
 def main(
@@ -40,16 +104,21 @@ def main(
         show_quick_stats()
         return
 
-    # Launch TUI
-    tui_app = FlashcardStudyApp()
-    tui_app.run()
+    _launch_tui()
 
 
 def show_quick_stats() -> None:
     """Display quick statistics in terminal."""
-    repo = FlashCardRepository()
-    db = repo.load()
-    stats = StatisticsCalculator.calculate(db.cards, datetime.now())
+    result = _daemon_call("stats")
+    if result is not None:
+        stats = Statistics(**result)
+    else:
+        repo = _repository()
+        index = repo.schedule_index()
+        stats = StatisticsCalculator.calculate_from_index(index, datetime.now()) if index else None
+        if stats is None:
+            db = repo.load()
+            stats = StatisticsCalculator.calculate(db.cards, datetime.now(), db.archive)
 
     table = Table(title="Flash Card Statistics", show_header=True)
     table.add_column("Metric", style="cyan")
@@ -60,6 +129,7 @@ def show_quick_stats() -> None:
     table.add_row("Reviewed Today", str(stats.cards_reviewed_today))
     table.add_row("Current Streak", f"{stats.review_streak_days} days")
     table.add_row("Average Ease", f"{stats.average_ease_factor:.2f}")
+    table.add_row("Retention", f"{stats.retention_rate:.0%}")
 
     console.print(table)
 
@@ -68,8 +138,12 @@ def show_quick_stats() -> None:
 def export(
     output: Path = typer.Argument(..., help="Output path for .apkg file"),
     deck: str = typer.Option("Claude Code", "--deck", "-d", help="Anki deck name"),
-    tags: Optional[str] = typer.Option(None, "--tags", "-t", help="Filter by tags (comma-separated)"),
+    tags: Optional[str] = typer.Option(None, "--tags", "-t", help="Filter by tags (comma-separated; 'python::*' selects a subtree)"),
     format: str = typer.Option("anki", "--format", "-f", help="Export format (currently only 'anki')"),
+    split_by_tag: bool = typer.Option(False, "--split-by-tag", help="Write one .apkg per tag into the OUTPUT directory"),
+    prefix_depth: int = typer.Option(0, "--prefix-depth", help="With --split-by-tag, group on the first N '::' tag components (0 = full tag)"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Worker processes for --split-by-tag (default: CPU count)"),
+    query: Optional[str] = typer.Option(None, "--query", "-q", help="Only cards matching this query (e.g. 'ease<2.0 AND NOT tag:legacy')"),
 ):
     """Export flash cards to Anki format.
 
@@ -77,40 +151,999 @@ def export(
         flashcard-study export cards.apkg
         flashcard-study export --deck "Python Study" cards.apkg
         flashcard-study export --tags python,algorithms cards.apkg
+        flashcard-study export --tags 'python::*' cards.apkg
         flashcard-study export --deck "Web Dev" --tags javascript,react web.apkg
+        flashcard-study export --query 'tag:python AND ease<2.0' hard.apkg
+        flashcard-study export --split-by-tag decks/
+        flashcard-study export --split-by-tag --prefix-depth 1 decks/
     """
     if format != "anki":
         console.print(f"[red]Error: Only 'anki' format is currently supported[/red]")
         raise typer.Exit(1)
 
-    # Load cards
-    repo = FlashCardRepository()
-    db = repo.load()
-
-    if not db.cards:
-        console.print("[yellow]No cards to export[/yellow]")
-        raise typer.Exit(0)
-
     # Parse tags filter
     tags_filter = None
     if tags:
         tags_filter = [t.strip() for t in tags.split(",")]
+    parsed = _parse_query(query)
+
+    if not split_by_tag:
+        # The daemon resolves paths from its own working directory
+        result = _daemon_call("export", output=str(output.resolve()), deck=deck, tags=tags_filter, query=query)
+        if result is not None:
+            _report_export(result["exported"], output, deck, tags_filter, query)
+            return
+
+    # Load cards, including archived ones
+    repo = _repository()
+    if parsed is not None:
+        cards = plan_repository(parsed, repo).run()
+    else:
+        cards = repo.all_cards(repo.load())
+
+    if not cards:
+        console.print("[yellow]No cards to export[/yellow]")
+        raise typer.Exit(0)
+
+    if split_by_tag:
+        export_split_by_tag(cards, output, deck, tags_filter, prefix_depth, workers)
+        return
 
     # Export
     exporter = AnkiExporter(deck_name=deck)
     try:
-        count = exporter.export(db.cards, output, tags_filter)
-
-        if count == 0:
-            console.print("[yellow]No cards matched the filter criteria[/yellow]")
-        else:
-            console.print(f"[green]✓ Exported {count} card(s) to {output}[/green]")
-            console.print(f"[cyan]  Deck: {deck}[/cyan]")
-            if tags_filter:
-                console.print(f"[cyan]  Tags: {', '.join(tags_filter)}[/cyan]")
+        count = exporter.export(cards, output, tags_filter)
     except Exception as e:
         console.print(f"[red]Error exporting cards: {e}[/red]")
         raise typer.Exit(1)
+    _report_export(count, output, deck, tags_filter, query)
+
+
+def _report_export(
+    count: int, output: Path, deck: str, tags_filter: Optional[list[str]], query: Optional[str] = None
+) -> None:
+    """Print the outcome of a single-deck export."""
+    if count == 0:
+        console.print("[yellow]No cards matched the filter criteria[/yellow]")
+    else:
+        console.print(f"[green]✓ Exported {count} card(s) to {output}[/green]")
+        console.print(f"[cyan]  Deck: {deck}[/cyan]")
+        if tags_filter:
+            console.print(f"[cyan]  Tags: {', '.join(tags_filter)}[/cyan]")
+        if query:
+            console.print(f"[cyan]  Query: {escape(query)}[/cyan]")
+
+
+@app.command("import")
+def import_cards(
+    source: Path = typer.Argument(..., help="Anki .apkg package or collection.anki2 file"),
+    tags: Optional[str] = typer.Option(None, "--tags", "-t", help="Extra tags to add to every imported card (comma-separated)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what would be imported without saving"),
+):
+    """Import flash cards from an Anki package.
+
+    Basic, cloze and multiple choice notes are mapped onto flash cards,
+    keeping review intervals, ease and review history. Notes already in
+    the database (same GUID or same content) are skipped.
+
+    Examples:
+        flashcard-study import collection.apkg
+        flashcard-study import --tags anki-import collection.apkg
+    """
+    if not source.exists():
+        console.print(f"[red]Error: {source} does not exist[/red]")
+        raise typer.Exit(1)
+
+    extra_tags = [t.strip() for t in tags.split(",") if t.strip()] if tags else None
+
+    repo = _repository()
+    db = repo.load()
+
+    try:
+        summary = AnkiImporter().import_cards(source, repo.all_cards(db), extra_tags)
+    except Exception as e:
+        console.print(f"[red]Error importing cards: {e}[/red]")
+        raise typer.Exit(1)
+
+    if summary.imported and not dry_run:
+        # Single write for the whole batch
+        repo.add_cards(summary.imported)
+
+    verb = "Would import" if dry_run else "Imported"
+    console.print(f"[green]✓ {verb} {len(summary.imported)} card(s) from {source}[/green]")
+    if summary.duplicates:
+        console.print(f"[cyan]  Skipped {summary.duplicates} duplicate(s)[/cyan]")
+    if summary.skipped:
+        console.print(f"[yellow]  Skipped {summary.skipped} note(s) with unsupported models[/yellow]")
+
+
+@app.command()
+def add(
+    input: typer.FileText = typer.Argument("-", help="JSONL file of card specs (default: stdin)"),
+    skip_invalid: bool = typer.Option(False, "--skip-invalid", help="Add the valid lines even if some lines fail validation"),
+    skip_duplicates: bool = typer.Option(False, "--skip-duplicates", help="Don't add cards that are near-duplicates of existing ones"),
+):
+    """Add cards from JSONL card specs, one card per line.
+
+    Each line is a JSON object with "question" and "answer", plus optional
+    "type" (qa, cloze, multiple_choice), "tags" (list or comma-separated
+    string) and "options". All lines are validated first, then every card
+    is appended in one locked write. By default nothing is written if any
+    line is invalid. Near-duplicates of existing cards are reported.
+
+    Examples:
+        echo '{"question": "What is O(1)?", "answer": "Constant time"}' | flashcard-study add
+        flashcard-study add --skip-invalid cards.jsonl
+        flashcard-study add --skip-duplicates cards.jsonl
+    """
+    now = datetime.now()
+    specs = []
+    cards = []
+    errors = []
+
+    for line_no, line in enumerate(input, 1):
+        if not line.strip():
+            continue
+        try:
+            spec = CardSpec.model_validate(json.loads(line))
+        except json.JSONDecodeError as e:
+            errors.append((line_no, f"invalid JSON: {e.msg}"))
+        except ValidationError as e:
+            errors.append((line_no, _format_validation_error(e)))
+        else:
+            specs.append(spec)
+            cards.append((line_no, spec.to_card(now)))
+
+    for line_no, message in errors:
+        console.print(f"[red]Line {line_no}: {escape(message)}[/red]")
+
+    if errors and not skip_invalid:
+        console.print(f"[red]No cards added: {len(errors)} invalid line(s)[/red]")
+        raise typer.Exit(1)
+
+    if not cards:
+        console.print("[yellow]No cards to add[/yellow]")
+        raise typer.Exit(1 if errors else 0)
+
+    result = _daemon_call(
+        "add",
+        specs=[spec.model_dump(mode="json") for spec in specs],
+        skip_duplicates=skip_duplicates,
+    )
+    if result is not None:
+        line_nos = [line_no for line_no, _ in cards]
+        for n, match_id, similarity, question in result["duplicates"]:
+            console.print(
+                f"[yellow]Line {line_nos[n]}: {similarity:.0%} similar to {match_id}: "
+                f"{escape(question)}[/yellow]"
+            )
+        new_cards = [FlashCard.model_validate(card) for card in result["added"]]
+        _report_added(new_cards, len(cards), errors)
+        return
+
+    repo = _repository()
+    with repo.lock():
+        db = repo.load()
+        existing = repo.all_cards(db)
+        index = _load_similarity_index(repo, existing)
+        by_id = {card.id: card for card in existing}
+
+        new_cards = []
+        for line_no, card in cards:
+            matches = index.query(card)
+            for match_id, similarity in matches[:3]:
+                console.print(
+                    f"[yellow]Line {line_no}: {similarity:.0%} similar to {match_id}: "
+                    f"{escape(by_id[match_id].question)}[/yellow]"
+                )
+            if matches and skip_duplicates:
+                continue
+            index.add(card)
+            by_id[card.id] = card
+            new_cards.append(card)
+
+        if new_cards:
+            db.cards.extend(new_cards)
+            repo.save(db)
+            index.save(_similarity_cache_path(repo))
+
+    _report_added(new_cards, len(cards), errors)
+
+
+def _report_added(new_cards: list[FlashCard], valid: int, errors: list) -> None:
+    """Print the outcome of an add run."""
+    console.print(f"[green]✓ Added {len(new_cards)} card(s)[/green]")
+    for card in new_cards:
+        console.print(f"  [cyan]{card.id}[/cyan] ({card.type}) {escape(card.question)}")
+    if len(new_cards) < valid:
+        console.print(f"[yellow]  Skipped {valid - len(new_cards)} near-duplicate(s)[/yellow]")
+    if errors:
+        raise typer.Exit(1)
+
+
+@app.command()
+def review(
+    input: typer.FileText = typer.Argument("-", help="Review records file (default: stdin)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Validate and apply in memory without saving"),
+):
+    """Apply a batch of review scores in one pass.
+
+    Each line is either a JSON object with "card_id", "score" and
+    "timestamp" keys, or a CSV row "card_id,score,timestamp". Scores range
+    from 0 to 1 and timestamps are ISO-8601. Reviews are applied in
+    timestamp order in memory and the database is saved once.
+
+    Examples:
+        flashcard-study review reviews.jsonl
+        echo "<card-id>,1,2025-01-31T09:00:00" | flashcard-study review
+    """
+    records = []
+    errors = []
+
+    for line_no, line in enumerate(input, 1):
+        line = line.strip()
+        if not line or line.lower().startswith("card_id,"):
+            continue
+        try:
+            records.append(_parse_review_record(line))
+        except (ValueError, KeyError, TypeError) as e:
+            errors.append((line_no, str(e)))
+
+    for line_no, message in errors:
+        console.print(f"[red]Line {line_no}: {escape(message)}[/red]")
+    if errors:
+        console.print(f"[red]No reviews applied: {len(errors)} invalid line(s)[/red]")
+        raise typer.Exit(1)
+
+    result = _daemon_call(
+        "review",
+        reviews=[[str(card_id), score, when.isoformat()] for card_id, score, when in records],
+        dry_run=dry_run,
+    )
+    if result is not None:
+        applied, unknown = result["applied"], result["unknown"]
+    else:
+        repo = _repository()
+        with repo.lock():
+            db = repo.load()
+            repo.unarchive(db, [card_id for card_id, _, _ in records])
+            balancer = LoadBalancer.from_cards(repo.all_cards(db)) if db.load_balance else None
+            db.cards, applied, unknown = apply_reviews(db.cards, records, balancer)
+            if applied and not dry_run:
+                repo.save(db)
+
+    verb = "Would apply" if dry_run else "Applied"
+    console.print(f"[green]✓ {verb} {applied} review(s)[/green]")
+    if unknown:
+        console.print(f"[yellow]  Skipped {len(unknown)} review(s) for unknown cards[/yellow]")
+        for card_id in sorted(set(map(str, unknown))):
+            console.print(f"[yellow]    {card_id}[/yellow]")
+
+
+def _parse_review_record(line: str) -> tuple[UUID, float, datetime]:
+    """Parse one JSON or CSV review record.
+
+    Raises:
+        ValueError: If the record is malformed or the score is out of range
+    """
+    if line.startswith("{"):
+        data = json.loads(line)
+        card_id, score, timestamp = data["card_id"], data["score"], data["timestamp"]
+    else:
+        parts = [p.strip() for p in line.split(",")]
+        if len(parts) != 3:
+            raise ValueError("expected card_id,score,timestamp")
+        card_id, score, timestamp = parts
+
+    score = float(score)
+    if not 0 <= score <= 1:
+        raise ValueError(f"score must be between 0 and 1, got {score}")
+
+    review_time = datetime.fromisoformat(timestamp)
+    if review_time.tzinfo is not None:
+        # Cards store naive local times
+        review_time = review_time.astimezone().replace(tzinfo=None)
+
+    return UUID(card_id), score, review_time
+
+
+@app.command()
+def compact(
+    keep: int = typer.Option(DEFAULT_HISTORY_LIMIT, "--keep", "-k", min=0, help="Raw review entries to keep per card"),
+    auto: Optional[bool] = typer.Option(None, "--auto/--no-auto", help="Compact to --keep entries on every save from now on (--no-auto turns it off)"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what would be compacted without saving"),
+):
+    """Roll old review history into per-card summaries.
+
+    Each card keeps its most recent --keep reviews verbatim; older reviews
+    are folded into a summary of their count, lapses and review days, so
+    streak and retention statistics are unchanged while the file shrinks.
+
+    Examples:
+        flashcard-study compact
+        flashcard-study compact --keep 10 --auto
+    """
+    repo = _repository()
+    with repo.lock():
+        db = repo.load()
+        cards, compacted, rolled = compact_cards(
+            db.cards, keep, datetime.now().date(), db.archive.review_days if db.archive else ()
+        )
+        if not dry_run:
+            db.cards = cards
+            if auto is not None:
+                db.history_limit = keep if auto else None
+            if compacted or auto is not None:
+                repo.save(db)
+
+    verb = "Would compact" if dry_run else "Compacted"
+    console.print(f"[green]✓ {verb} {compacted} card(s), rolled up {rolled} review(s)[/green]")
+    if auto and not dry_run:
+        console.print(f"[green]  History will be kept to {keep} review(s) per card on save[/green]")
+    elif auto is False and not dry_run:
+        console.print("[green]  Automatic compaction turned off[/green]")
+
+
+@app.command()
+def sync(
+    remote: Path = typer.Argument(..., help="Other copy of the deck: a database file, or a directory standing in for a remote"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what would change without saving"),
+):
+    """Two-way sync this deck with another copy of it.
+
+    Only cards whose hashes differ are examined. A card changed on one
+    side is copied to the other; a card reviewed on both sides gets both
+    review histories, without duplicates, and a schedule recomputed from
+    them. Both copies hold the same cards afterwards. Deletions are not
+    synced: a card missing on one side is copied back to it.
+
+    Examples:
+        flashcard-study sync /mnt/desktop/.flashcards/flashcards.json
+        flashcard-study --deck python sync ~/Dropbox/flashcards/
+    """
+    repo = _repository()
+    remote_path = remote / repo.file_path.name if remote.is_dir() else remote
+    if remote_path.resolve() == repo.file_path.resolve():
+        console.print("[red]Error: cannot sync a deck with itself[/red]")
+        raise typer.Exit(1)
+    remote_repo = FlashCardRepository(remote_path)
+
+    with repo.lock(), remote_repo.lock():
+        db = repo.load()
+        remote_db = remote_repo.load()
+        plan = plan_sync(
+            repo.all_cards(db), remote_repo.all_cards(remote_db),
+            _sync_digests(repo, db), _sync_digests(remote_repo, remote_db),
+        )
+        if not dry_run:
+            _apply_sync(repo, db, plan.to_local)
+            _apply_sync(remote_repo, remote_db, plan.to_remote)
+
+    verb = "Would sync" if dry_run else "Synced"
+    console.print(f"[green]✓ {verb} with {remote_path}[/green]")
+    console.print(f"[cyan]  Pulled {plan.pulled}, pushed {plan.pushed}, merged {plan.merged} card(s)[/cyan]")
+
+
+def _sync_digests(repo: FlashCardRepository, db) -> dict:
+    """Card digests for sync, hashing only cards in files changed since the last one."""
+    cache_path = repo.file_path.with_suffix(".merkle.json")
+    cache = DigestCache.load(cache_path)
+    digests = {}
+    for source, cards in repo.card_sources(db):
+        digests.update(cache.digests(source, cards))
+    cache.save(cache_path)
+    return digests
+
+
+def _apply_sync(repo: FlashCardRepository, db, updates: dict) -> None:
+    """Replace and add synced cards, then save (call under repo.lock())."""
+    if not updates:
+        return
+    updates = dict(updates)
+    # Archived cards come back into the deck; saving re-archives cold ones
+    cards = [updates.pop(card.id, card) for card in repo.all_cards(db)]
+    db.cards = cards + list(updates.values())
+    db.archive = None
+    repo.save(db)
+
+
+@app.command()
+def select(
+    tags: Optional[str] = typer.Option(None, "--tags", "-t", help="Only cards with any of these tags (comma-separated; 'python::*' selects a subtree)"),
+    count: int = typer.Option(10, "--count", "-n", help="Maximum number of cards"),
+    include_all: bool = typer.Option(False, "--all", help="Include cards that are not due yet"),
+    all_decks: bool = typer.Option(False, "--all-decks", help="Merge due cards from every deck (adds a \"deck\" key)"),
+    query: Optional[str] = typer.Option(None, "--query", "-q", help="Only cards matching this query (e.g. 'ease<2.0 AND type:cloze')"),
+):
+    """Print cards to quiz as JSONL, in spaced repetition priority order.
+
+    Overdue cards come first (most overdue first), then never reviewed
+    cards, then with --all the upcoming cards (soonest first). With
+    --all-decks, due cards from every deck are merged by due date, and
+    only the decks needed to fill --count are loaded.
+
+    Examples:
+        flashcard-study select
+        flashcard-study select --tags algorithms --count 5
+        flashcard-study select --all --tags python
+        flashcard-study select --tags 'python::*'
+        flashcard-study select --query 'ease<2.0 AND NOT tag:legacy'
+        flashcard-study select --all-decks --count 20
+    """
+    tags_filter = [t.strip() for t in tags.split(",") if t.strip()] if tags else None
+    parsed = _parse_query(query)
+
+    if all_decks:
+        if include_all:
+            console.print("[red]Error: --all cannot be combined with --all-decks[/red]")
+            raise typer.Exit(1)
+        due = merge_due(tags=tags_filter)
+        if parsed is not None:
+            now = datetime.now()
+            due = ((deck, card) for deck, card in due if parsed.matches(card, now))
+        for deck, card in itertools.islice(due, count):
+            print(json.dumps({"deck": deck, **card.model_dump(mode="json")}))
+        return
+
+    cards = _daemon_call("select", tags=tags_filter, count=count, include_all=include_all, query=query)
+    if cards is None:
+        selected = CardSelector.select_from_repository(
+            _repository(), tags=tags_filter, count=count, include_all=include_all, query=parsed
+        )
+        cards = [card.model_dump(mode="json") for card in selected]
+
+    for card in cards:
+        print(json.dumps(card))
+
+
+@app.command()
+def decks():
+    """List decks with their card and due counts.
+
+    Counts come from the deck catalog; only decks changed outside
+    flashcard-study since they were last counted are loaded.
+
+    Examples:
+        flashcard-study decks
+    """
+    catalog = refresh_catalog()
+    if not catalog:
+        console.print("[yellow]No decks yet[/yellow]")
+        raise typer.Exit(0)
+
+    now = datetime.now()
+    tomorrow = now.date() + timedelta(days=1)
+    table = Table(title="Decks", show_header=True)
+    table.add_column("Deck", style="cyan")
+    table.add_column("Cards", style="green", justify="right")
+    table.add_column("Due Today", style="green", justify="right")
+    table.add_column("Next Due")
+    for name, info in catalog.items():
+        next_due = "-"
+        if info.earliest_next_review is not None:
+            next_due = "now" if info.has_due(now) else info.earliest_next_review.strftime("%Y-%m-%d")
+        marker = " *" if name == _deck else ""
+        table.add_row(name + marker, str(info.cards), str(info.due_before(tomorrow)), next_due)
+    console.print(table)
+
+
+@app.command()
+def backups(
+    recent: Optional[int] = typer.Option(None, "--recent", min=0, help="Keep this many latest generations"),
+    hourly: Optional[int] = typer.Option(None, "--hourly", min=0, help="Keep one generation per hour for this many hours"),
+    daily: Optional[int] = typer.Option(None, "--daily", min=0, help="Keep one generation per day for this many days"),
+    weekly: Optional[int] = typer.Option(None, "--weekly", min=0, help="Keep one generation per week for this many weeks"),
+):
+    """List the deck's backup generations, optionally changing how many are kept.
+
+    Every save keeps the previous version of the deck as a generation.
+    The latest ones are hardlinks sharing the deck's files; older ones
+    kept for the hourly, daily and weekly slots are gzip-compressed.
+    Setting every option to 0 turns backups off.
+
+    Examples:
+        flashcard-study backups
+        flashcard-study backups --recent 5 --daily 30
+    """
+    repo = _repository()
+    changes = {
+        name: value
+        for name, value in (("recent", recent), ("hourly", hourly), ("daily", daily), ("weekly", weekly))
+        if value is not None
+    }
+    if changes:
+        with repo.lock():
+            db = repo.load()
+            db.backups = db.backups.model_copy(update=changes)
+            repo.save(db)
+        policy = db.backups
+        console.print(
+            f"[green]✓ Keeping {policy.recent} recent, {policy.hourly} hourly, "
+            f"{policy.daily} daily and {policy.weekly} weekly generation(s)[/green]"
+        )
+    else:
+        policy = repo.load().backups
+
+    generations = repo.backups.generations()
+    if not generations:
+        console.print("[yellow]No backups yet[/yellow]")
+        raise typer.Exit(0)
+
+    kept = retained(generations, policy)
+    table = Table(title="Backups", show_header=True)
+    table.add_column("Generation", style="cyan")
+    table.add_column("Saved")
+    table.add_column("Kept As", style="green")
+    table.add_column("Stored")
+    table.add_column("Size", justify="right")
+    for generation in generations:
+        table.add_row(
+            generation.name,
+            generation.taken.strftime("%Y-%m-%d %H:%M:%S"),
+            kept.get(generation.name, "-"),
+            generation.codec or "linked",
+            f"{generation.path.stat().st_size / 1024:.1f}KB",
+        )
+    console.print(table)
+
+
+@app.command()
+def restore(
+    generation: str = typer.Argument(..., help="Generation name, as listed by the backups command"),
+):
+    """Restore the deck to a backup generation.
+
+    The current version of the deck is backed up first, so a restore can
+    itself be undone with another restore.
+
+    Examples:
+        flashcard-study restore 20260119T093012123456
+    """
+    repo = _repository()
+    try:
+        db = repo.restore(generation)
+    except ValueError as e:
+        console.print(f"[red]Error: {e}[/red]")
+        raise typer.Exit(1)
+
+    console.print(f"[green]✓ Restored {len(db.cards)} card(s) from {generation}[/green]")
+
+
+@app.command()
+def compression(
+    codec: Optional[str] = typer.Argument(None, help="gzip, lzma or none (default: show the current setting)"),
+):
+    """Show or change how the deck's files are compressed on disk.
+
+    gzip shrinks segment files about fourfold at a small cost in load
+    time; lzma shrinks them about sixfold but saves several times more
+    slowly. Changing the setting rewrites every segment file. Compressed
+    backups use the same codec (gzip when the deck is uncompressed).
+
+    Examples:
+        flashcard-study compression
+        flashcard-study compression gzip
+        flashcard-study compression none
+    """
+    repo = _repository()
+    if codec is None:
+        console.print(f"[cyan]Compression: {repo.load().compression or 'none'}[/cyan]")
+        return
+    if codec != "none" and codec not in CODECS:
+        console.print(f"[red]Error: unknown codec {codec!r} (use {', '.join(CODECS)} or none)[/red]")
+        raise typer.Exit(1)
+
+    with repo.lock():
+        db = repo.load()
+        db.compression = None if codec == "none" else codec
+        repo.save(db)
+    console.print(f"[green]✓ Compression set to {codec}[/green]")
+
+
+@app.command()
+def balance(
+    setting: Optional[str] = typer.Argument(None, help="on or off (default: show the current setting)"),
+):
+    """Show or change whether reviews are load-balanced across days.
+
+    With balancing on, each review's next due date may move by a few
+    days (about a tenth of the interval, at most a week) to the day with
+    the fewest reviews due, so cards studied together stop coming due
+    together. Intervals under two days are never moved.
+
+    Examples:
+        flashcard-study balance
+        flashcard-study balance on
+    """
+    repo = _repository()
+    if setting is None:
+        console.print(f"[cyan]Load balancing: {'on' if repo.settings().load_balance else 'off'}[/cyan]")
+        return
+    if setting not in ("on", "off"):
+        console.print(f"[red]Error: expected on or off, got {setting!r}[/red]")
+        raise typer.Exit(1)
+
+    with repo.lock():
+        db = repo.load()
+        db.load_balance = setting == "on"
+        repo.save(db)
+    console.print(f"[green]✓ Load balancing turned {setting}[/green]")
+
+
+@app.command()
+def fsck(
+    repair: bool = typer.Option(False, "--repair", help="Write a repaired deck keeping every salvageable card"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Worker processes for checking cards (default: CPU count)"),
+):
+    """Check the deck's files card by card and optionally repair them.
+
+    Unlike loading, which fails on a single malformed card and falls back
+    to a backup, fsck reports every unreadable file, invalid card,
+    duplicate ID, impossible schedule (e.g. ease outside 1.3-3.0) and
+    inconsistent review history, with the file and position of each
+    record. --repair drops what can't be salvaged, fixes the rest and
+    saves; the replaced deck stays available as a backup generation.
+
+    Examples:
+        flashcard-study fsck
+        flashcard-study fsck --repair
+    """
+    repo = _repository()
+    with repo.lock():
+        report = check_repository(repo, workers)
+        if report.ok:
+            console.print(f"[green]✓ No problems in {report.records} card record(s)[/green]")
+            return
+
+        table = Table(title="Problems", show_header=True)
+        table.add_column("File", style="cyan")
+        table.add_column("Record", justify="right")
+        table.add_column("Card", style="magenta")
+        table.add_column("Problem", style="yellow")
+        table.add_column("Repair", style="green")
+        for problem in report.problems:
+            table.add_row(
+                problem.source,
+                "-" if problem.position is None else f"#{problem.position}",
+                (problem.card_id or "-")[:8],
+                escape(problem.message),
+                problem.repair,
+            )
+        console.print(table)
+        console.print(f"[yellow]{len(report.problems)} problem(s) in {report.records} card record(s)[/yellow]")
+
+        if not repair:
+            console.print("[cyan]  Run with --repair to fix them[/cyan]")
+            raise typer.Exit(1)
+        database, archived = report.repaired()
+        repo.replace(database, archived)
+
+    console.print(
+        f"[green]✓ Wrote repaired deck with {len(database.cards)} card(s)"
+        f" and {len(archived)} archived card(s)[/green]"
+    )
+
+
+@app.command()
+def daemon():
+    """Serve the deck from memory over a local Unix socket until stopped.
+
+    While the daemon runs, --stats, select, add, review and export talk to
+    it instead of loading the deck themselves, and it serializes their
+    writes. Without a daemon those commands read the file directly.
+
+    Examples:
+        flashcard-study daemon &
+    """
+    repo = _repository()
+    path = socket_path(repo)
+    service = DeckService(repo)
+    try:
+        server = DaemonServer(path, service)
+    except (RuntimeError, OSError) as e:
+        console.print(f"[red]Error starting daemon: {e}[/red]")
+        raise typer.Exit(1)
+
+    # Load the deck up front so the first request is served from memory
+    repo.snapshot()
+
+    # Exit cleanly (removing the socket) on kill as well as Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    console.print(f"[green]✓ Serving {repo.file_path} on {path}[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def _daemon_call(method: str, **params):
+    """Call the daemon if one is running.
+
+    Returns:
+        The method's result, or None if there is no daemon and the caller
+        should read the database file directly
+    """
+    client = DaemonClient.connect(socket_path(_repository()))
+    if client is None:
+        return None
+    with client:
+        try:
+            return client.call(method, **params)
+        except (DaemonError, OSError) as e:
+            # Don't fall back once the daemon has the request: a write
+            # may already have been applied
+            console.print(f"[red]Error from daemon ({method}): {escape(str(e))}[/red]")
+            raise typer.Exit(1)
+
+
+@app.command()
+def dedupe(
+    threshold: float = typer.Option(DEFAULT_THRESHOLD, "--threshold", help="Minimum similarity (0-1) to count as a near-duplicate"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Worker processes for signing cards (default: CPU count)"),
+):
+    """Report clusters of near-duplicate cards across the whole deck.
+
+    Examples:
+        flashcard-study dedupe
+        flashcard-study dedupe --threshold 0.5
+    """
+    repo = _repository()
+    cards = repo.all_cards(repo.load())
+    index = _load_similarity_index(repo, cards, threshold, workers)
+    clusters = index.clusters()
+
+    if not clusters:
+        console.print("[green]✓ No near-duplicates found[/green]")
+        return
+
+    by_id = {card.id: card for card in cards}
+    for n, cluster in enumerate(clusters, 1):
+        table = Table(title=f"Cluster {n}", show_header=True)
+        table.add_column("ID", style="cyan")
+        table.add_column("Question")
+        table.add_column("Answer", style="green")
+        for card_id in cluster:
+            card = by_id[card_id]
+            table.add_row(str(card_id), escape(card.question), escape(card.answer))
+        console.print(table)
+
+    duplicates = sum(len(c) for c in clusters)
+    console.print(f"[yellow]{len(clusters)} cluster(s), {duplicates} card(s) involved[/yellow]")
+
+
+@app.command()
+def search(
+    query: str = typer.Argument(..., help="Words or word prefixes to search for, or a query"),
+    limit: int = typer.Option(20, "--limit", "-n", help="Maximum number of results"),
+    explain: bool = typer.Option(False, "--explain", help="Show how the query would run instead of running it"),
+):
+    """Search card questions, answers and tags.
+
+    Every word must match (as a whole word or a word prefix); results are
+    ranked by relevance. Words can be combined with query terms such as
+    tag:python or ease<2.0 (see the query command).
+
+    Examples:
+        flashcard-study search "binary search"
+        flashcard-study search --limit 5 asyn
+        flashcard-study search "heap AND tag:algorithms AND NOT is:new"
+    """
+    parsed = _parse_query(query, required=True)
+    repo = _repository()
+    cards = repo.all_cards(repo.load())
+    index = SearchIndex(cards)
+    plan = plan_cards(parsed, cards, tag_index=TagIndex(cards), search_index=index)
+    if explain:
+        console.print(escape(plan.explain()), soft_wrap=True)
+        return
+
+    # Rank by the words ANDed into the query; other matches follow in deck order
+    terms = parsed.terms if isinstance(parsed, And) else (parsed,)
+    words = [word for term in terms if isinstance(term, TextTerm) for word in term.words]
+    matches = {card.id: card for card in plan.run()}
+    ranked = [card_id for card_id, _ in index.search(" ".join(words), limit=0) if card_id in matches]
+    results = list(dict.fromkeys(ranked + list(matches)))
+    if limit:
+        results = results[:limit]
+
+    if not results:
+        console.print("[yellow]No matching cards[/yellow]")
+        raise typer.Exit(0)
+
+    table = Table(title=f"Search: {escape(query)}", show_header=True)
+    table.add_column("ID", style="cyan")
+    table.add_column("Question")
+    table.add_column("Answer", style="green")
+    table.add_column("Tags", style="magenta")
+    for card_id in results:
+        card = matches[card_id]
+        table.add_row(
+            str(card_id), escape(card.question), escape(card.answer), escape(", ".join(card.tags))
+        )
+    console.print(table)
+
+
+@app.command("query")
+def run_query(
+    query: str = typer.Argument(..., help="Query, e.g. 'tag:python AND NOT tag:legacy AND ease<2.0 AND due<7d'"),
+    limit: int = typer.Option(0, "--limit", "-n", min=0, help="Maximum number of cards (0 = all)"),
+    explain: bool = typer.Option(False, "--explain", help="Show how the query would run instead of running it"),
+):
+    """Print the cards matching a query as JSONL, archived ones included.
+
+    Terms are combined with AND, OR, NOT and parentheses (adjacent terms
+    are ANDed): tag:NAME (tag:NAME::* for a subtree), type:qa|cloze|
+    multiple_choice, is:new, is:due, ease/interval/reviews compared with
+    <, <=, >, >=, = or != to a number, due<7d (h, d or w) and words or
+    text:WORD matched against question, answer and tags. Everything but
+    words is checked in the schedule index, so only the segments holding
+    matching cards are read.
+
+    Examples:
+        flashcard-study query 'tag:python AND NOT tag:legacy AND ease<2.0 AND due<7d AND type:cloze'
+        flashcard-study query --explain 'tag:algorithms::* OR is:new'
+        flashcard-study query 'interval>=30 heap'
+    """
+    plan = plan_repository(_parse_query(query), _repository())
+    if explain:
+        console.print(escape(plan.explain()), soft_wrap=True)
+        return
+
+    cards = plan.run()
+    for card in cards[:limit] if limit else cards:
+        print(json.dumps(card.model_dump(mode="json")))
+
+
+def _parse_query(query: Optional[str], required: bool = False) -> Optional[Term]:
+    """Parse a --query option, exiting with an error if it is malformed.
+
+    An empty query yields None, or is an error when `required` is set.
+    """
+    if not query and not required:
+        return None
+    try:
+        return parse_query(query)
+    except QueryError as e:
+        console.print(f"[red]Error: Invalid query: {escape(str(e))}[/red]")
+        raise typer.Exit(1)
+
+
+def _similarity_cache_path(repo: FlashCardRepository) -> Path:
+    """Sidecar file holding cached MinHash signatures for a repository."""
+    return repo.file_path.with_suffix(".minhash.json")
+
+
+def _load_similarity_index(
+    repo: FlashCardRepository,
+    cards: list,
+    threshold: float = DEFAULT_THRESHOLD,
+    workers: Optional[int] = 1,
+) -> SimilarityIndex:
+    """Load the cached similarity index and bring it up to date with cards."""
+    cache_path = _similarity_cache_path(repo)
+    index = SimilarityIndex.load(cache_path, threshold)
+    index.sync(cards, workers)
+    index.save(cache_path)
+    return index
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    """Flatten a pydantic error into a single line."""
+    parts = []
+    for item in error.errors():
+        loc = ".".join(str(p) for p in item["loc"])
+        parts.append(f"{loc}: {item['msg']}" if loc else item["msg"])
+    return "; ".join(parts)
+
+
+def export_split_by_tag(
+    cards: list,
+    output_dir: Path,
+    deck: str,
+    tags_filter: Optional[list[str]],
+    prefix_depth: int,
+    workers: Optional[int],
+) -> None:
+    """Export one Anki deck per tag (or tag prefix) across a process pool.
+
+    Args:
+        cards: All loaded cards
+        output_dir: Directory to write .apkg files into
+        deck: Parent Anki deck name; each deck is named "<deck>::<tag>"
+        tags_filter: Optional list of tags to split on (default: every tag)
+        prefix_depth: Number of leading tag components to group on
+        workers: Maximum worker processes (None = CPU count)
+    """
+    partitions = TagIndex(cards).partition(prefix_depth, tags_filter)
+
+    if not partitions:
+        console.print("[yellow]No tagged cards matched the filter criteria[/yellow]")
+        raise typer.Exit(0)
+
+    file_names = _split_file_names(list(partitions))
+    clashes = _clashing_names(file_names)
+    if clashes:
+        for name, clashing in clashes.items():
+            console.print(f"[red]Error: tags {', '.join(map(repr, clashing))} would all be written to {name}[/red]")
+        raise typer.Exit(1)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    table = Table(title="Split Export", show_header=True)
+    table.add_column("Tag", style="cyan")
+    table.add_column("Cards", style="green", justify="right")
+    table.add_column("Time", style="green", justify="right")
+    table.add_column("File")
+
+    failed = False
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {}
+        for tag, tag_cards in partitions.items():
+            path = output_dir / file_names[tag]
+            future = pool.submit(export_deck, f"{deck}::{tag}", tag_cards, path)
+            futures[future] = (tag, path)
+
+        results = []
+        for future in as_completed(futures):
+            tag, path = futures[future]
+            try:
+                count, seconds = future.result()
+            except Exception as e:
+                console.print(f"[red]Error exporting {tag}: {e}[/red]")
+                failed = True
+                continue
+            results.append((tag, count, seconds, path))
+
+    for tag, count, seconds, path in sorted(results):
+        table.add_row(tag, str(count), f"{seconds:.2f}s", str(path))
+
+    console.print(table)
+    console.print(f"[green]✓ Exported {len(results)} deck(s) to {output_dir}[/green]")
+    if failed:
+        raise typer.Exit(1)
+
+
+def _slugify_tag(tag: str) -> str:
+    """Turn a tag into a safe file name stem."""
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", tag).strip("_") or "untitled"
+
+
+def _split_file_names(tags: list[str]) -> dict[str, str]:
+    """Choose an .apkg file name for each tag of a split export.
+
+    Tags whose slugs would clash (ignoring case, for case-insensitive
+    file systems), such as "c#" and "c++", get a short hash of the raw
+    tag appended.
+
+    Returns:
+        Dict mapping each tag to its file name
+    """
+    slugs = {tag: _slugify_tag(tag) for tag in tags}
+    counts: dict[str, int] = {}
+    for slug in slugs.values():
+        counts[slug.lower()] = counts.get(slug.lower(), 0) + 1
+
+    names = {}
+    for tag, slug in slugs.items():
+        if counts[slug.lower()] > 1:
+            slug = f"{slug}-{hashlib.sha1(tag.encode()).hexdigest()[:8]}"
+        names[tag] = f"{slug}.apkg"
+    return names
+
+
+def _clashing_names(file_names: dict[str, str]) -> dict[str, list[str]]:
+    """Find file names that more than one tag would be written to.
+
+    Returns:
+        Dict mapping each shared file name to its tags (empty if none)
+    """
+    by_name: dict[str, list[str]] = {}
+    for tag, name in file_names.items():
+        by_name.setdefault(name.lower(), []).append(tag)
+    return {name: tags for name, tags in by_name.items() if len(tags) > 1}
 
 
 if __name__ == "__main__":
@@ -4,6 +4,11 @@ from pathlib import Path
 
 # File paths
 DEFAULT_FLASHCARD_PATH = Path.home() / ".flashcards" / "flashcards.json"
+DECKS_DIR = DEFAULT_FLASHCARD_PATH.parent / "decks"  # One <name>.json per named deck
+DECK_CATALOG_PATH = DEFAULT_FLASHCARD_PATH.parent / "catalog.json"
+
+# Deck stored at DEFAULT_FLASHCARD_PATH
+DEFAULT_DECK = "default"
 
 # UI Colors (Dracula-inspired theme)
 COLOR_PRIMARY = "#8be9fd"  # Cyan
@@ -0,0 +1,371 @@
+"""Local daemon that keeps the deck loaded and serves it over a Unix socket.
+
+The daemon owns the loaded database, its indexes and the write path.
+Clients speak newline-delimited JSON-RPC 2.0: one request object per line,
+answered by one response object per line. Reads are served from memory;
+writes go through a single lock, so concurrent clients never overwrite
+each other. Changes made to the file by other processes (e.g. the TUI)
+are picked up through the repository's snapshot cache.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from dataclasses import asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from .data.models import CardSpec, FlashCard, FlashCardDatabase
+from .data.repository import FlashCardRepository
+from .domain.anki_exporter import AnkiExporter
+from .domain.card_selector import CardSelector
+from .domain.load_balance import LoadBalancer
+from .domain.query import filter_query, parse_query
+from .domain.similarity import SimilarityIndex
+from .domain.spaced_repetition import apply_reviews
+from .domain.statistics import StatisticsCalculator
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class DaemonError(RuntimeError):
+    """Raised by DaemonClient when the daemon answers with an error."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+def socket_path(repository: FlashCardRepository) -> Path:
+    """Socket the daemon for a repository listens on."""
+    return repository.file_path.with_suffix(".sock")
+
+
+class DeckService:
+    """In-memory deck operations exposed by the daemon.
+
+    Every method takes and returns JSON-compatible values.
+    """
+
+    METHODS = ("stats", "select", "review", "add", "export")
+
+    def __init__(self, repository: FlashCardRepository):
+        """Initialize service.
+
+        Args:
+            repository: FlashCardRepository to serve
+        """
+        self.repository = repository
+        # Serializes writes and snapshot refreshes
+        self._lock = threading.RLock()
+        self._similarity: Optional[SimilarityIndex] = None
+        self._indexed: Optional[FlashCardDatabase] = None
+
+    def _database(self) -> FlashCardDatabase:
+        """Current database, re-read only if the file changed on disk."""
+        with self._lock:
+            return self.repository.snapshot()
+
+    def stats(self) -> dict:
+        """Return deck statistics (see Statistics)."""
+        database = self._database()
+        stats = StatisticsCalculator.calculate(database.cards, datetime.now(), database.archive)
+        return asdict(stats)
+
+    def select(
+        self,
+        tags: Optional[list[str]] = None,
+        count: int = 10,
+        include_all: bool = False,
+        query: Optional[str] = None
+    ) -> list[dict]:
+        """Select cards for a quiz in spaced repetition priority order.
+
+        Args:
+            tags: Optional list of tags to filter by (OR logic)
+            count: Maximum number of cards to return
+            include_all: If True, include cards not yet due
+            query: Optional query cards must also match (see domain.query)
+
+        Returns:
+            Selected cards as JSON objects
+        """
+        now = datetime.now()
+        parsed = parse_query(query) if query else None
+        database = self._database()
+        if database.archive is not None and database.archive.has_due(now):
+            with self._lock:
+                self.repository.promote_due(now)
+                database = self.repository.snapshot()
+
+        cards = CardSelector.select_for_quiz(
+            database.cards, tags=tags, count=count, include_all=include_all, now=now, query=parsed
+        )
+        return [card.model_dump(mode="json") for card in cards]
+
+    def review(self, reviews: list[list], dry_run: bool = False) -> dict:
+        """Apply review records and save once.
+
+        Args:
+            reviews: [card_id, score, timestamp] records (ISO-8601 timestamps)
+            dry_run: Apply in memory without saving
+
+        Returns:
+            {"applied": count, "unknown": [card_id, ...]}
+        """
+        records = [
+            (UUID(card_id), float(score), datetime.fromisoformat(timestamp))
+            for card_id, score, timestamp in reviews
+        ]
+        with self._lock, self.repository.lock():
+            database = self.repository.snapshot().model_copy()
+            self.repository.unarchive(database, [card_id for card_id, _, _ in records])
+            balancer = None
+            if database.load_balance:
+                balancer = LoadBalancer.from_cards(self.repository.all_cards(database))
+            cards, applied, unknown = apply_reviews(database.cards, records, balancer)
+            if applied and not dry_run:
+                self.repository.save(database.model_copy(update={"cards": cards}))
+        return {"applied": applied, "unknown": sorted(set(map(str, unknown)))}
+
+    def add(self, specs: list[dict], skip_duplicates: bool = False) -> dict:
+        """Validate card specs and add them in one write.
+
+        Nothing is written if any spec is invalid.
+
+        Args:
+            specs: CardSpec objects
+            skip_duplicates: Don't add near-duplicates of existing cards
+
+        Returns:
+            {"added": [card, ...],
+             "duplicates": [[spec index, card_id, similarity, question], ...]}
+        """
+        now = datetime.now()
+        cards = [CardSpec.model_validate(spec).to_card(now) for spec in specs]
+
+        with self._lock, self.repository.lock():
+            database = self.repository.snapshot()
+            index = self._similarity_index(database)
+
+            added = {}
+            duplicates = []
+            for n, card in enumerate(cards):
+                matches = index.query(card)[:3]
+                for match_id, similarity in matches:
+                    match = added.get(match_id) or self._card(database, match_id)
+                    duplicates.append([n, str(match_id), similarity, match.question])
+                if matches and skip_duplicates:
+                    continue
+                index.add(card)
+                added[card.id] = card
+
+            if added:
+                database = database.model_copy(
+                    update={"cards": database.cards + list(added.values())}
+                )
+                self.repository.save(database)
+                self._indexed = database
+        return {
+            "added": [card.model_dump(mode="json") for card in added.values()],
+            "duplicates": duplicates,
+        }
+
+    def export(
+        self,
+        output: str,
+        deck: str = "Claude Code",
+        tags: Optional[list[str]] = None,
+        query: Optional[str] = None
+    ) -> dict:
+        """Export cards to an Anki package.
+
+        Args:
+            output: Output path for the .apkg file
+            deck: Anki deck name
+            tags: Optional list of tags to filter by
+            query: Optional query cards must also match
+
+        Returns:
+            {"exported": count}
+        """
+        parsed = parse_query(query) if query else None
+        exporter = AnkiExporter(deck_name=deck)
+        cards = filter_query(self.repository.all_cards(self._database()), parsed)
+        return {"exported": exporter.export(cards, Path(output), tags)}
+
+    def close(self) -> None:
+        """Persist index caches for the next start."""
+        with self._lock:
+            if self._similarity is not None:
+                self._similarity.save(self._similarity_cache_path())
+
+    def _similarity_index(self, database: FlashCardDatabase) -> SimilarityIndex:
+        """Near-duplicate index kept in step with the database (call under lock)."""
+        if self._similarity is None:
+            self._similarity = SimilarityIndex.load(self._similarity_cache_path())
+        if database is not self._indexed:
+            self._similarity.sync(self.repository.all_cards(database))
+            self._indexed = database
+        return self._similarity
+
+    def _card(self, database: FlashCardDatabase, card_id: UUID) -> FlashCard:
+        """Look up a card in the database or the archive."""
+        found = self.repository.get_cards([card_id])
+        if found:
+            return found[0]
+        return next(c for c in self.repository.archived_cards(database) if c.id == card_id)
+
+    def _similarity_cache_path(self) -> Path:
+        return self.repository.file_path.with_suffix(".minhash.json")
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Answers newline-delimited JSON-RPC requests on one connection."""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.dispatch(line)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server dispatching to a DeckService."""
+
+    daemon_threads = True
+
+    def __init__(self, path: Path, service: DeckService):
+        """Bind the server socket.
+
+        Args:
+            path: Unix socket path (a stale socket file is replaced)
+            service: DeckService handling requests
+
+        Raises:
+            RuntimeError: If another daemon is already listening on path
+        """
+        if DaemonClient.connect(path) is not None:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        path.unlink(missing_ok=True)
+        self.path = path
+        self.service = service
+        super().__init__(str(path), _RequestHandler)
+        os.chmod(path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.path.unlink(missing_ok=True)
+
+    def dispatch(self, line: bytes) -> dict:
+        """Run one JSON-RPC request and build its response."""
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return _error(None, PARSE_ERROR, f"Parse error: {e}")
+
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Invalid request")
+
+        request_id = request.get("id")
+        method = request["method"]
+        params = request.get("params") or {}
+        if method not in DeckService.METHODS:
+            return _error(request_id, METHOD_NOT_FOUND, f"Unknown method {method!r}")
+        if not isinstance(params, dict):
+            return _error(request_id, INVALID_PARAMS, "params must be an object")
+
+        try:
+            result = getattr(self.service, method)(**params)
+        except TypeError as e:
+            return _error(request_id, INVALID_PARAMS, str(e))
+        except ValidationError as e:
+            return _error(request_id, INVALID_PARAMS, "Invalid card spec", e.errors(
+                include_url=False, include_context=False, include_input=False
+            ))
+        except (ValueError, KeyError) as e:
+            return _error(request_id, INVALID_PARAMS, str(e))
+        except Exception as e:
+            return _error(request_id, SERVER_ERROR, str(e))
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def _error(request_id: Any, code: int, message: str, data: Any = None) -> dict:
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+class DaemonClient:
+    """Client for a running daemon; one connection, requests in sequence."""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._file = sock.makefile("rwb")
+        self._next_id = 0
+
+    @classmethod
+    def connect(cls, path: Path) -> Optional["DaemonClient"]:
+        """Connect to the daemon listening on path.
+
+        Args:
+            path: Unix socket path
+
+        Returns:
+            DaemonClient, or None if no daemon is running there
+        """
+        if not hasattr(socket, "AF_UNIX") or not path.exists():
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(str(path))
+        except OSError:
+            sock.close()
+            return None
+        return cls(sock)
+
+    def call(self, method: str, **params) -> Any:
+        """Call a daemon method and return its result.
+
+        Raises:
+            DaemonError: If the daemon reports an error
+            ConnectionError: If the daemon closed the connection
+        """
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": params}
+        self._file.write(json.dumps(request).encode("utf-8") + b"\n")
+        self._file.flush()
+
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("Daemon closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            raise DaemonError(error["code"], error["message"], error.get("data"))
+        return response["result"]
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self) -> "DaemonClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
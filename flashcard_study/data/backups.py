@@ -0,0 +1,166 @@
+"""Generational backups of a segmented database.
+
+Segment files are never modified, so a backup of the database as it was
+before a save only needs its manifest: the outgoing manifest is
+hardlinked into the backup directory, which costs a single system call.
+Recent generations stay as such links and keep their segments alive.
+Older generations kept by the hourly, daily and weekly slots of the
+BackupPolicy are turned into self-contained compressed files once, when
+they first leave the recent window, so they no longer pin any segment.
+"""
+
+import os
+import shutil
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from .compression import CODECS, compress, extension
+from .models import BackupPolicy, FlashCardDatabase
+from .segments import manifest_segments, read_database
+
+# Generation names are the time the backed-up version was saved
+GENERATION_FORMAT = "%Y%m%dT%H%M%S%f"
+
+# Codec for compressed generations when the deck doesn't set one
+DEFAULT_BACKUP_CODEC = "gzip"
+
+_CODEC_SUFFIXES = {'json' + ext: codec for codec, ext in CODECS.items()}
+
+
+@dataclass
+class Generation:
+    """One backed-up version of the database."""
+    name: str
+    taken: datetime
+    path: Path
+    codec: Optional[str]  # None while still a linked manifest
+
+    @property
+    def compressed(self) -> bool:
+        return self.codec is not None
+
+
+class BackupStore:
+    """Backup generations of one database file, in <name>.backups/."""
+
+    def __init__(self, path: Path):
+        """Initialize store.
+
+        Args:
+            path: Database file being backed up
+        """
+        self.path = path
+        self.directory = path.with_suffix('.backups')
+
+    def keep_current(self) -> None:
+        """Back up the current manifest before it is replaced (call under lock)."""
+        try:
+            taken = datetime.fromtimestamp(self.path.stat().st_mtime)
+        except FileNotFoundError:
+            return
+        self.directory.mkdir(exist_ok=True)
+        target = self.directory / f"{taken.strftime(GENERATION_FORMAT)}.json"
+        try:
+            os.link(self.path, target)
+        except FileExistsError:
+            pass
+        except OSError:
+            # No hardlinks on this filesystem; manifests are small
+            shutil.copy2(self.path, target)
+
+    def generations(self) -> list[Generation]:
+        """Return every generation, newest first."""
+        if not self.directory.is_dir():
+            return []
+        found = []
+        for path in self.directory.iterdir():
+            name, _, suffix = path.name.partition('.')
+            if suffix != 'json' and suffix not in _CODEC_SUFFIXES:
+                continue
+            try:
+                taken = datetime.strptime(name, GENERATION_FORMAT)
+            except ValueError:
+                continue
+            found.append(Generation(name, taken, path, _CODEC_SUFFIXES.get(suffix)))
+        return sorted(found, key=lambda g: g.taken, reverse=True)
+
+    def get(self, name: str) -> Generation:
+        """Look up a generation by name.
+
+        Raises:
+            ValueError: If there is no such generation
+        """
+        for generation in self.generations():
+            if generation.name == name:
+                return generation
+        raise ValueError(f"No backup generation {name!r}")
+
+    def load(self, generation: Generation) -> FlashCardDatabase:
+        """Read the database as it was in a generation."""
+        return read_database(generation.path, self.path)
+
+    def rotate(self, policy: BackupPolicy, codec: Optional[str] = None) -> None:
+        """Apply the retention policy: drop, keep or compress each generation.
+
+        Args:
+            policy: Retention policy
+            codec: Codec for newly compressed generations (default: gzip)
+        """
+        generations = self.generations()
+        kept = retained(generations, policy)
+        for generation in generations:
+            reason = kept.get(generation.name)
+            if reason is None:
+                generation.path.unlink(missing_ok=True)
+            elif reason != "recent" and not generation.compressed:
+                self._compress(generation, codec or DEFAULT_BACKUP_CODEC)
+
+    def pinned_segments(self) -> set[str]:
+        """Segments still referenced by uncompressed generations."""
+        pinned = set()
+        for generation in self.generations():
+            if not generation.compressed:
+                pinned.update(manifest_segments(generation.path))
+        return pinned
+
+    def _compress(self, generation: Generation, codec: str) -> None:
+        """Replace a linked manifest with a self-contained compressed file."""
+        database = self.load(generation)
+        data = database.model_dump_json(exclude={"segments"}).encode("utf-8")
+        target = generation.path.with_name(f"{generation.name}.json{extension(codec)}")
+        temp_path = target.with_name(target.name + '.tmp')
+        temp_path.write_bytes(compress(data, codec))
+        temp_path.replace(target)
+        generation.path.unlink()
+
+
+def retained(generations: list[Generation], policy: BackupPolicy) -> dict[str, str]:
+    """Choose which generations the policy keeps.
+
+    The newest `recent` generations are kept, plus the oldest generation
+    of each of the latest `hourly` hours, `daily` days and `weekly` weeks
+    that have any. Taking the oldest keeps the choice stable as newer
+    generations arrive.
+
+    Args:
+        generations: Generations, newest first
+        policy: Retention policy
+
+    Returns:
+        Reason ("recent", "hourly", "daily" or "weekly") by generation name
+    """
+    kept = {g.name: "recent" for g in generations[:policy.recent]}
+    slots = (
+        ("hourly", policy.hourly, lambda t: t.replace(minute=0, second=0, microsecond=0)),
+        ("daily", policy.daily, lambda t: t.date()),
+        ("weekly", policy.weekly, lambda t: t.isocalendar()[:2]),
+    )
+    for reason, count, bucket in slots:
+        oldest = {}
+        for generation in generations:
+            oldest[bucket(generation.taken)] = generation
+        for key in sorted(oldest, reverse=True)[:count]:
+            kept.setdefault(oldest[key].name, reason)
+    return kept
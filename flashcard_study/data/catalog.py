@@ -0,0 +1,151 @@
+"""Named decks and the catalog that summarizes them."""
+
+import json
+import re
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+from ..config import DECK_CATALOG_PATH, DECKS_DIR, DEFAULT_DECK, DEFAULT_FLASHCARD_PATH
+from .models import DeckInfo, FlashCardDatabase
+
+_DECK_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9_-]*")
+
+
+def deck_path(name: str) -> Path:
+    """Return the file a named deck is stored in.
+
+    Args:
+        name: Deck name (letters, digits, '-' and '_')
+
+    Returns:
+        DEFAULT_FLASHCARD_PATH for the default deck, else DECKS_DIR/<name>.json
+
+    Raises:
+        ValueError: If the name is not a valid deck name
+    """
+    if name == DEFAULT_DECK:
+        return DEFAULT_FLASHCARD_PATH
+    if not _DECK_NAME.fullmatch(name):
+        raise ValueError(f"Invalid deck name {name!r}: use letters, digits, '-' and '_'")
+    return DECKS_DIR / f"{name}.json"
+
+
+def deck_names() -> list[str]:
+    """Return the names of every deck that exists on disk."""
+    names = []
+    if DEFAULT_FLASHCARD_PATH.exists():
+        names.append(DEFAULT_DECK)
+    if DECKS_DIR.is_dir():
+        # Sidecars (x.archive.json, ...) have dotted stems and are skipped
+        names.extend(sorted(
+            p.stem for p in DECKS_DIR.glob("*.json")
+            if _DECK_NAME.fullmatch(p.stem) and p.stem != DEFAULT_DECK
+        ))
+    return names
+
+
+def summarize_deck(database: FlashCardDatabase, stat: Optional[tuple[int, int]]) -> DeckInfo:
+    """Build the catalog entry for a deck.
+
+    Args:
+        database: The deck's database
+        stat: (mtime_ns, size) of the deck file the database was read from
+
+    Returns:
+        DeckInfo counting hot and archived cards
+    """
+    info = DeckInfo(stat=stat)
+    due_days = defaultdict(int)
+    archive = database.archive
+    if archive is not None:
+        info.cards = archive.count
+        info.earliest_next_review = archive.earliest_next_review
+        due_days.update(archive.due_days)
+
+    for card in database.cards:
+        info.cards += 1
+        if info.earliest_next_review is None or card.next_review < info.earliest_next_review:
+            info.earliest_next_review = card.next_review
+        due_days[card.next_review.date()] += 1
+
+    info.due_days = dict(sorted(due_days.items()))
+    return info
+
+
+class DeckCatalog:
+    """Small JSON file with a DeckInfo per deck.
+
+    Entries are written by every save of a deck and carry the deck file's
+    stat, so a stale entry (e.g. a deck edited by hand) can be detected
+    and recounted.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """Initialize catalog.
+
+        Args:
+            path: Catalog file. Defaults to DECK_CATALOG_PATH
+        """
+        self.path = path or DECK_CATALOG_PATH
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the catalog for a read-modify-write."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path.with_suffix(".json.lock"), "w") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self) -> dict[str, DeckInfo]:
+        """Read every entry.
+
+        The catalog only holds derived data, so a missing or unreadable
+        file reads as empty and is rebuilt as decks are saved or refreshed.
+        """
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return {name: DeckInfo.model_validate(info) for name, info in data["decks"].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def record(self, name: str, info: DeckInfo) -> None:
+        """Store the entry for one deck.
+
+        Args:
+            name: Deck name
+            info: New summary of the deck
+        """
+        self._update(lambda decks: decks.__setitem__(name, info))
+
+    def forget(self, names: list[str]) -> None:
+        """Drop the entries of decks that no longer exist."""
+        self._update(lambda decks: [decks.pop(name, None) for name in names])
+
+    def _update(self, change) -> None:
+        with self.lock():
+            decks = self.load()
+            change(decks)
+            data = {"decks": {
+                name: info.model_dump(mode="json") for name, info in sorted(decks.items())
+            }}
+            temp_path = self.path.with_suffix(".json.tmp")
+            with open(temp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            temp_path.replace(self.path)
@@ -0,0 +1,44 @@
+"""Optional compression of database files, chosen by file extension.
+
+Files ending in .gz or .xz are read through gzip or lzma, decompressing
+from the file as it is read rather than from a compressed copy in
+memory. Any other file is read as plain JSON. Since a deck is stored as
+segments of at most SEGMENT_SIZE cards, the loader only ever holds one
+segment's decompressed JSON at a time.
+"""
+
+import gzip
+import lzma
+from pathlib import Path
+from typing import Optional
+
+# Codec name -> file extension
+CODECS = {"gzip": ".gz", "lzma": ".xz"}
+
+# gzip's default level 9 is much slower for little gain on JSON
+GZIP_LEVEL = 6
+
+
+def extension(codec: Optional[str]) -> str:
+    """File extension for a codec ("" for uncompressed)."""
+    return CODECS[codec] if codec else ""
+
+
+def compress(data: bytes, codec: Optional[str]) -> bytes:
+    """Compress data with a codec (returned unchanged for None)."""
+    if codec == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    if codec == "lzma":
+        return lzma.compress(data)
+    return data
+
+
+def read_bytes(path: Path) -> bytes:
+    """Read a file, decompressing it if its extension says so."""
+    if path.suffix == ".gz":
+        with gzip.open(path, "rb") as f:
+            return f.read()
+    if path.suffix == ".xz":
+        with lzma.open(path, "rb") as f:
+            return f.read()
+    return path.read_bytes()
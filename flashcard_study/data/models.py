@@ -1,9 +1,15 @@
 """Pydantic models for flash card data structures."""
 
-from datetime import datetime
+import hashlib
+from datetime import date, datetime
 from typing import Optional, Literal
-from pydantic import BaseModel, Field
-from uuid import UUID
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
+from uuid import UUID, uuid4
+
+from ..domain.cloze import parse_cloze
+
+# Raw review history entries kept per card when saving, unless changed
+DEFAULT_HISTORY_LIMIT = 20
 
 
 class ReviewHistory(BaseModel):
@@ -13,6 +19,17 @@ class ReviewHistory(BaseModel):
     interval_days: float
 
 
+class HistorySummary(BaseModel):
+    """Roll-up of review history entries that were compacted away."""
+    count: int = 0
+    score_total: float = 0.0
+    lapses: int = 0  # Reviews scored 0
+    first_review: Optional[datetime] = None
+    last_review: Optional[datetime] = None
+    # Distinct days, sorted; only those in the review streak when compacted
+    review_days: list[date] = Field(default_factory=list)
+
+
 class FlashCard(BaseModel):
     """A single flash card with spaced repetition metadata."""
     id: UUID
@@ -28,9 +45,170 @@ class FlashCard(BaseModel):
     interval_days: float = 0.0
     review_count: int = 0
     review_history: list[ReviewHistory] = Field(default_factory=list)
+    history_summary: Optional[HistorySummary] = None  # Older, compacted reviews
+    version: int = 0  # Bumped on every review or edit, for sync
+
+    @classmethod
+    def new(
+        cls,
+        type: str,
+        question: str,
+        answer: str,
+        tags: Optional[list[str]] = None,
+        options: Optional[list[str]] = None,
+        now: Optional[datetime] = None
+    ) -> "FlashCard":
+        """Create a fresh, never-reviewed card that is due immediately.
+
+        Args:
+            type: Card type ("qa", "cloze" or "multiple_choice")
+            question: Card question
+            answer: Card answer
+            tags: Optional tags
+            options: Options for multiple_choice cards
+            now: Creation time (defaults to datetime.now())
+
+        Returns:
+            New FlashCard with a generated UUID
+        """
+        if now is None:
+            now = datetime.now()
+        return cls(
+            id=uuid4(),
+            type=type,
+            question=question,
+            answer=answer,
+            tags=tags or [],
+            options=options,
+            created_at=now,
+            next_review=now,
+            ease_factor=2.5,
+            interval_days=0.0,
+            review_count=0,
+        )
+
+    def content_hash(self) -> str:
+        """Hash the card's content (type, question, answer), ignoring scheduling.
+
+        Returns:
+            Hex digest identifying the card content
+        """
+        payload = "\x1f".join((self.type, self.question.strip(), self.answer.strip()))
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class CardSpec(BaseModel):
+    """User-supplied description of a new card (e.g. one JSONL line)."""
+    type: Literal["qa", "cloze", "multiple_choice"] = "qa"
+    question: str
+    answer: str
+    tags: list[str] = Field(default_factory=list)
+    options: Optional[list[str]] = None
+
+    @field_validator("question", "answer")
+    @classmethod
+    def _not_blank(cls, value: str) -> str:
+        if not value.strip():
+            raise ValueError("must not be empty")
+        return value
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _split_tags(cls, value):
+        # Accept "a, b" as well as ["a", "b"]
+        if isinstance(value, str):
+            value = value.split(",")
+        return [t.strip() for t in value if t and t.strip()]
+
+    @model_validator(mode="after")
+    def _check_type_fields(self) -> "CardSpec":
+        if self.type == "cloze":
+            parse_cloze(self.question)  # ClozeError is a ValueError
+        if self.type == "multiple_choice" and not self.options:
+            raise ValueError("multiple_choice cards need options")
+        return self
+
+    def to_card(self, now: Optional[datetime] = None) -> FlashCard:
+        """Build a new FlashCard from this spec.
+
+        Args:
+            now: Creation time (defaults to datetime.now())
+        """
+        return FlashCard.new(
+            self.type, self.question, self.answer, self.tags, self.options, now
+        )
+
+
+class ArchiveSummary(BaseModel):
+    """Precomputed aggregates of the cards in the cold-tier archive."""
+    count: int = 0
+    earliest_next_review: Optional[datetime] = None
+    due_days: dict[date, int] = Field(default_factory=dict)  # Cards per next_review day
+    ease_total: float = 0.0
+    reviews: int = 0  # Including compacted history
+    lapses: int = 0
+    review_days: list[date] = Field(default_factory=list)  # Distinct days, sorted
+    tag_counts: dict[str, int] = Field(default_factory=dict)
+    tag_subtrees: dict[str, int] = Field(default_factory=dict)  # Cards per tag prefix
+
+    def has_due(self, now: datetime) -> bool:
+        """Whether any archived card is due at `now`."""
+        return self.earliest_next_review is not None and self.earliest_next_review <= now
+
+    def due_before(self, day: date) -> int:
+        """Count archived cards whose next review falls before `day`."""
+        return sum(n for due, n in self.due_days.items() if due < day)
+
+
+class DeckInfo(BaseModel):
+    """Catalog entry summarizing one deck, so decks can be listed unloaded."""
+    cards: int = 0  # Including archived cards
+    earliest_next_review: Optional[datetime] = None
+    due_days: dict[date, int] = Field(default_factory=dict)  # Cards per next_review day
+    stat: Optional[tuple[int, int]] = None  # (mtime_ns, size) of the deck file when counted
+
+    def has_due(self, now: datetime) -> bool:
+        """Whether any card in the deck is due at `now`."""
+        return self.earliest_next_review is not None and self.earliest_next_review <= now
+
+    def due_before(self, day: date) -> int:
+        """Count cards whose next review falls before `day`."""
+        return sum(n for due, n in self.due_days.items() if due < day)
+
+
+class BackupPolicy(BaseModel):
+    """How many backup generations of a deck to keep."""
+    recent: int = Field(default=10, ge=0)  # Latest generations, uncompressed
+    hourly: int = Field(default=24, ge=0)  # One per hour for this many hours
+    daily: int = Field(default=7, ge=0)  # One per day for this many days
+    weekly: int = Field(default=4, ge=0)  # One per week for this many weeks
 
 
 class FlashCardDatabase(BaseModel):
     """Container for all flash cards."""
-    version: str = "1.0"
+    version: str = "1.1"
+    # Saves compact each card's history to this many raw entries (None: never)
+    history_limit: Optional[int] = DEFAULT_HISTORY_LIMIT
+    # Cards moved to the cold-tier archive file (None when it is empty)
+    archive: Optional[ArchiveSummary] = None
+    # Segment files holding the cards, in order (None when cards are inline)
+    segments: Optional[list[str]] = None
+    backups: BackupPolicy = Field(default_factory=BackupPolicy)
+    # Codec for segment files and compressed backups (None: plain JSON)
+    compression: Optional[Literal["gzip", "lzma"]] = None
+    # Move reviews to lightly loaded days near their due date (see domain.load_balance)
+    load_balance: bool = False
     cards: list[FlashCard] = Field(default_factory=list)
+
+    # (segment file, cards as loaded) for each segment, so a save can tell
+    # which segments hold replaced, added or removed cards
+    _loaded_segments: Optional[list[tuple[str, list[FlashCard]]]] = PrivateAttr(default=None)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _default_history_limit(cls, data):
+        # Version 1.0 files store null when compaction was simply never
+        # turned on; from 1.1 on, null means it was turned off
+        if isinstance(data, dict) and data.get("version") == "1.0" and data.get("history_limit") is None:
+            data = {**data, "version": "1.1", "history_limit": DEFAULT_HISTORY_LIMIT}
+        return data
@@ -1,78 +1,614 @@
 """JSON repository for flash card persistence."""
 
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
-import json
-import shutil
-from typing import Optional
+import threading
+from typing import Callable, Iterable, Iterator, Optional
 from uuid import UUID
 
-from .models import FlashCardDatabase, FlashCard
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+from ..config import DEFAULT_DECK
+from .backups import BackupStore
+from .catalog import DeckCatalog, deck_path, summarize_deck
+from .compression import extension, read_bytes
+from .models import BackupPolicy, FlashCardDatabase, FlashCard
+from .schedule_index import ARCHIVED, HAS_ARCHIVE, ScheduleIndex, write_index
+from .segments import SEGMENT_SIZE, read_database, segment_dir, segment_files, write_segment
+from ..domain.archive import is_cold, summarize_archive
+from ..domain.history import compact_cards
+
+# Fields the card list can be sorted on server-side
+SORT_KEYS = ("created_at", "next_review", "ease_factor", "review_count")
 
 
 class FlashCardRepository:
     """Manages persistence of flash cards to JSON file."""
 
-    def __init__(self, file_path: Optional[Path] = None):
+    def __init__(self, file_path: Optional[Path] = None, deck: Optional[str] = None):
         """Initialize repository with file path.
 
         Args:
-            file_path: Path to JSON file. Defaults to ~/.flashcards/flashcards.json
+            file_path: Path to JSON file. Defaults to the file of `deck`
+            deck: Deck name (defaults to the default deck when no file_path
+                is given). Saves of a named deck update the deck catalog.
+
+        Raises:
+            ValueError: If the deck name is invalid
         """
         if file_path is None:
-            file_path = Path.home() / ".flashcards" / "flashcards.json"
+            deck = deck or DEFAULT_DECK
+            file_path = deck_path(deck)
         self.file_path = file_path
+        self.deck = deck
+        self.catalog = DeckCatalog() if deck is not None else None
+        self.backups = BackupStore(file_path)
+        self.archive_backups = BackupStore(self.archive_path)
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        self._lock_file = None
+        # Guards the cached snapshot and its indexes, which the UI, the deck
+        # watcher and the write-behind thread all read and replace
+        self._snapshot_lock = threading.RLock()
+        self._snapshot: Optional[FlashCardDatabase] = None
+        self._snapshot_stat: Optional[tuple[int, int]] = None
+        self._sort_indexes: dict[str, list[FlashCard]] = {}
+        self._id_index: dict[UUID, FlashCard] = {}
+        self._snapshot_cards: Optional[list[FlashCard]] = None
+        self._archive: Optional[list[FlashCard]] = None
+        self._archive_stat: Optional[tuple[int, int]] = None
         self._ensure_directory()
 
+    @property
+    def archive_path(self) -> Path:
+        """Cold-tier archive file next to the database."""
+        return self.file_path.with_suffix('.archive.json')
+
     def _ensure_directory(self) -> None:
         """Create directory if it doesn't exist."""
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
 
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the database for a read-modify-write.
+
+        Uses an advisory lock on a sidecar ``.lock`` file so that the TUI,
+        the CLI and slash commands don't overwrite each other's changes.
+        Re-entrant within one repository instance.
+        """
+        with self._lock:
+            if self._lock_depth == 0 and fcntl is not None:
+                self._lock_file = open(self.file_path.with_suffix('.json.lock'), 'w')
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0 and self._lock_file is not None:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+                    self._lock_file.close()
+                    self._lock_file = None
+
     def load(self) -> FlashCardDatabase:
         """Load and validate database from JSON.
 
+        The cold-tier archive is not read; see archived_cards().
+
         Returns:
             FlashCardDatabase instance
 
         Raises:
             ValueError: If JSON is invalid and backup recovery fails
         """
-        if not self.file_path.exists():
+        return self._read(self.file_path)
+
+    def settings(self) -> FlashCardDatabase:
+        """Read the database settings without loading its cards.
+
+        Returns:
+            FlashCardDatabase with an empty card list
+        """
+        try:
+            database = FlashCardDatabase.model_validate_json(read_bytes(self.file_path))
+        except FileNotFoundError:
+            return FlashCardDatabase()
+        except Exception:
+            database = self.load()  # Falls back to a backup
+        return database.model_copy(update={"cards": []})
+
+    def _read(self, path: Path) -> FlashCardDatabase:
+        """Read a database file, falling back to its latest readable backup."""
+        if not path.exists():
             return FlashCardDatabase()
 
         try:
-            with open(self.file_path, 'r') as f:
-                data = json.load(f)
-                return FlashCardDatabase.model_validate(data)
+            return read_database(path, path)
         except Exception as e:
             # Try to restore from backup
-            backup_path = self.file_path.with_suffix('.json.bak')
+            store = {self.file_path: self.backups, self.archive_path: self.archive_backups}.get(path)
+            if store is not None:
+                for generation in store.generations():
+                    try:
+                        return store.load(generation)
+                    except Exception:
+                        pass
+            # Single backup file left by older versions
+            backup_path = path.with_suffix('.json.bak')
             if backup_path.exists():
                 try:
-                    with open(backup_path, 'r') as f:
-                        data = json.load(f)
-                        return FlashCardDatabase.model_validate(data)
+                    return read_database(backup_path, path)
                 except Exception:
                     pass
 
-            raise ValueError(f"Failed to load flashcards from {self.file_path}: {e}")
+            raise ValueError(f"Failed to load flashcards from {path}: {e}")
 
     def save(self, database: FlashCardDatabase) -> None:
         """Save database to JSON with atomic write.
 
+        Card histories are compacted to the database's history_limit
+        (20 raw entries unless changed) first. Mastered cards with long intervals
+        are moved to the archive file (see domain.archive.is_cold).
+
         Args:
             database: FlashCardDatabase to persist
         """
-        # Create backup if file exists
-        if self.file_path.exists():
-            backup_path = self.file_path.with_suffix('.json.bak')
-            shutil.copy(self.file_path, backup_path)
+        if database.history_limit is not None:
+            database.cards, _, _ = compact_cards(
+                database.cards,
+                database.history_limit,
+                datetime.now().date(),
+                database.archive.review_days if database.archive else (),
+            )
+
+        with self.lock():
+            self._archive_cold(database, datetime.now())
+            self._write_segments(self.file_path, database)
+            self._set_snapshot(database)
+            if self.catalog is not None:
+                self.catalog.record(self.deck, summarize_deck(database, self._snapshot_stat))
+
+    def restore(self, generation: str) -> FlashCardDatabase:
+        """Replace the database with one of its backup generations.
+
+        The database being replaced becomes a backup generation itself,
+        so a restore can be undone. Cards archived since the generation
+        was taken stay in the archive, and the current backup policy and
+        compression are kept.
 
+        Args:
+            generation: Generation name (see BackupStore.generations())
+
+        Returns:
+            The restored database
+
+        Raises:
+            ValueError: If there is no such generation
+        """
+        with self.lock():
+            database = self.backups.load(self.backups.get(generation))
+            database._loaded_segments = None
+            try:
+                current = self.load()
+                database.backups = current.backups
+                database.compression = current.compression
+            except ValueError:
+                pass
+            hot = {card.id for card in database.cards}
+            archived = [card for card in self._read_archive() if card.id not in hot]
+            database.archive = summarize_archive(archived) if archived else None
+            self.save(database)
+        return database
+
+    def replace(self, database: FlashCardDatabase, archived: list[FlashCard]) -> None:
+        """Replace the database and its archive wholesale, e.g. with repaired copies.
+
+        The replaced database and archive both become backup generations.
+
+        Args:
+            database: New database (its archive summary is recomputed)
+            archived: New contents of the archive
+        """
+        with self.lock():
+            if archived or self.archive_path.exists():
+                self._write_archive(archived, database.backups)
+            database._loaded_segments = None
+            database.archive = summarize_archive(archived) if archived else None
+            self.save(database)
+
+    def _write(self, path: Path, database: FlashCardDatabase, exclude: Optional[set] = None) -> None:
+        """Write a database file atomically (call under lock)."""
         # Atomic write: write to temp, then rename
-        temp_path = self.file_path.with_suffix('.json.tmp')
+        temp_path = path.with_suffix('.json.tmp')
         with open(temp_path, 'w') as f:
-            f.write(database.model_dump_json(indent=2))
+            f.write(database.model_dump_json(indent=2, exclude=exclude))
+
+        temp_path.replace(path)
+
+    def _write_segments(self, path: Path, database: FlashCardDatabase) -> None:
+        """Write the database as a manifest plus segment files (call under lock).
+
+        Only segments whose cards were replaced, added or removed since
+        the database was loaded are written, as new files named by their
+        content hash. Replacing the manifest then commits them atomically:
+        until it is replaced, the old manifest still lists the old
+        segments. The old manifest is kept as a backup generation (see
+        BackupStore) and the generations are rotated; segments listed by
+        neither the manifest nor an uncompressed generation are deleted
+        afterwards.
+
+        Cards keep the segment they were loaded from; new cards fill up
+        the last segment and then new ones. Segments stored with another
+        codec than database.compression count as changed, so changing it
+        rewrites every segment on the next save. The scheduling index
+        (see ScheduleIndex) is rewritten to match the new manifest.
+        """
+        directory = segment_dir(path)
+        directory.mkdir(exist_ok=True)
+        suffix = '.json' + extension(database.compression)
+
+        current = {card.id: card for card in database.cards}
+        segments: list[tuple[Optional[str], list[FlashCard]]] = []  # name is None if dirty
+        placed = set()
+        for name, loaded in database._loaded_segments or []:
+            cards = [current[card.id] for card in loaded if card.id in current]
+            if not cards:
+                continue
+            placed.update(card.id for card in cards)
+            clean = (
+                name.endswith(suffix)
+                and len(cards) == len(loaded)
+                and all(a is b for a, b in zip(cards, loaded))
+            )
+            segments.append((name if clean else None, cards))
+
+        new_cards = [card for card in database.cards if card.id not in placed]
+        if new_cards and segments and len(segments[-1][1]) < SEGMENT_SIZE:
+            room = SEGMENT_SIZE - len(segments[-1][1])
+            segments[-1] = (None, segments[-1][1] + new_cards[:room])
+            new_cards = new_cards[room:]
+        for start in range(0, len(new_cards), SEGMENT_SIZE):
+            segments.append((None, new_cards[start:start + SEGMENT_SIZE]))
+
+        written = [
+            (name or write_segment(directory, cards, database.compression), cards)
+            for name, cards in segments
+        ]
+        database.segments = [name for name, _ in written]
+        self.backups.keep_current()
+        self._write(path, database, exclude={"cards"})
+        database._loaded_segments = written
+        write_index(
+            path,
+            ((card, n) for n, (_, cards) in enumerate(written) for card in cards),
+            database.segments,
+            HAS_ARCHIVE if database.archive is not None else 0,
+        )
+        if database.archive is not None and ScheduleIndex.open(path, self.archive_path) is None:
+            # Archive index missing or in an older format
+            write_index(self.archive_path, ((card, ARCHIVED) for card in self._read_archive()))
+
+        self.backups.rotate(database.backups, database.compression)
+        self._collect_segments(path, set(database.segments) | self.backups.pinned_segments())
+
+    def _collect_segments(self, path: Path, keep: set[str]) -> None:
+        """Delete segment files not in `keep`."""
+        for segment in segment_files(segment_dir(path)):
+            if segment.name not in keep:
+                segment.unlink(missing_ok=True)
+
+    def _write_archive(self, cards: list[FlashCard], policy: BackupPolicy) -> None:
+        """Rewrite the archive file and its index (call under lock).
+
+        The replaced archive is kept as a backup generation, hardlinked
+        like the manifest (see BackupStore), and the archive's generations
+        are rotated with the deck's policy.
+        """
+        self.archive_backups.keep_current()
+        self._write(self.archive_path, FlashCardDatabase(cards=cards))
+        self.archive_backups.rotate(policy)
+        write_index(self.archive_path, ((card, ARCHIVED) for card in cards))
+        stat = self.archive_path.stat()
+        self._archive = cards
+        self._archive_stat = (stat.st_mtime_ns, stat.st_size)
+
+    def _read_archive(self) -> list[FlashCard]:
+        """Every card in the archive file, cached until the file changes."""
+        try:
+            stat = self.archive_path.stat()
+            stat = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return []
+        if self._archive is None or stat != self._archive_stat:
+            self._archive = self._read(self.archive_path).cards
+            self._archive_stat = stat
+        return self._archive
+
+    def schedule_index(self) -> Optional[ScheduleIndex]:
+        """Map the deck's scheduling index, for read-only fast paths.
+
+        Returns:
+            ScheduleIndex, or None if the deck was last written without
+            one (e.g. by an older version), so callers must load it
+        """
+        return ScheduleIndex.open(self.file_path, self.archive_path)
+
+    def archived_cards(self, database: FlashCardDatabase) -> list[FlashCard]:
+        """Return the cards in the cold-tier archive.
+
+        Cards moved back into the deck stay in the archive file until it
+        is next rewritten; the copy in `database` takes precedence.
+
+        Args:
+            database: The loaded database
+
+        Returns:
+            Archived cards not present in the database
+        """
+        if database.archive is None:
+            return []
+        hot = {card.id for card in database.cards}
+        return [card for card in self._read_archive() if card.id not in hot]
+
+    def all_cards(self, database: FlashCardDatabase) -> list[FlashCard]:
+        """Return the database's cards followed by the archived ones.
+
+        Args:
+            database: The loaded database
+
+        Returns:
+            Every card, for operations on content rather than scheduling
+        """
+        return database.cards + self.archived_cards(database)
+
+    def card_sources(
+        self,
+        database: FlashCardDatabase,
+        include_archived: bool = True
+    ) -> list[tuple[str, list[FlashCard]]]:
+        """Group every card by the file it was read from.
+
+        Each group is keyed by a string that changes whenever that file's
+        content does: segment files are named by their content hash, and
+        the archive or an unsegmented deck file by its mtime and size.
+        Callers can therefore cache per-card results by key.
+
+        Args:
+            database: The database as loaded, not yet changed in memory
+            include_archived: Also return the archived cards' group
+
+        Returns:
+            (key, cards) pairs covering the same cards as all_cards(), or
+            as database.cards without the archive
+        """
+        if database._loaded_segments is not None:
+            sources = [(f"segment:{name}", cards) for name, cards in database._loaded_segments]
+        else:
+            mtime, size = self.file_stat() or (0, 0)
+            sources = [(f"deck:{mtime}:{size}", database.cards)]
+        if not include_archived:
+            return sources
+        archived = self.archived_cards(database)
+        if archived:
+            mtime, size = self._archive_stat
+            sources.append((f"archive:{mtime}:{size}", archived))
+        return sources
+
+    def _archive_cold(self, database: FlashCardDatabase, now: datetime) -> None:
+        """Move cold cards from the database to the archive (call under lock).
+
+        The archive is written before the database, so a crash in between
+        leaves cards in both files rather than in neither.
+        """
+        hot = []
+        cold = []
+        for card in database.cards:
+            (cold if is_cold(card, now) else hot).append(card)
+        if not cold:
+            return
+
+        archived = {card.id: card for card in self.archived_cards(database)}
+        archived.update((card.id, card) for card in cold)
+        hot_ids = {card.id for card in hot}
+        cards = [card for card in archived.values() if card.id not in hot_ids]
+
+        self._write_archive(cards, database.backups)
+        database.cards = hot
+        database.archive = summarize_archive(cards)
 
-        temp_path.replace(self.file_path)
+    def unarchive(self, database: FlashCardDatabase, card_ids: Iterable[UUID]) -> int:
+        """Move archived cards back into a loaded database.
+
+        The caller saves the database; the archive file is left as is.
+
+        Args:
+            database: The loaded database (modified in place)
+            card_ids: IDs of cards to move back; IDs not archived are ignored
+
+        Returns:
+            Number of cards moved back
+        """
+        hot = {card.id for card in database.cards}
+        wanted = set(card_ids) - hot
+        if not wanted:
+            return 0
+        return self._unarchive(database, lambda card: card.id in wanted)
+
+    def promote_due(self, now: Optional[datetime] = None) -> int:
+        """Move archived cards that have come due back into the database.
+
+        Args:
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            Number of cards moved back
+        """
+        if now is None:
+            now = datetime.now()
+        with self.lock():
+            database = self.load()
+            if database.archive is None or not database.archive.has_due(now):
+                return 0
+            promoted = self._unarchive(database, lambda card: card.next_review <= now)
+            if promoted:
+                self.save(database)
+            return promoted
+
+    def _unarchive(
+        self,
+        database: FlashCardDatabase,
+        select: Callable[[FlashCard], bool]
+    ) -> int:
+        """Move selected archived cards into the database and re-summarize."""
+        archived = self.archived_cards(database)
+        moved = [card for card in archived if select(card)]
+        if not moved:
+            return 0
+        rest = [card for card in archived if not select(card)]
+        database.cards = database.cards + moved
+        database.archive = summarize_archive(rest) if rest else None
+        return len(moved)
+
+    def snapshot(self) -> FlashCardDatabase:
+        """Return a cached read-only view of the database.
+
+        The file is only re-read when its modification time or size has
+        changed since the last load or save. Callers must not mutate the
+        returned database; use load() for read-modify-write.
+
+        Returns:
+            Cached FlashCardDatabase instance
+        """
+        with self._snapshot_lock:
+            stat = self.file_stat()
+            if self._snapshot is None or stat != self._snapshot_stat:
+                self._snapshot = self.load()
+                self._snapshot_stat = stat
+                self._sort_indexes = {}
+                self._id_index = {}
+                self._snapshot_cards = None
+            return self._snapshot
+
+    def snapshot_cards(self) -> list[FlashCard]:
+        """Return every card of the cached snapshot, archived ones included.
+
+        Like snapshot(), the result is shared and must not be mutated.
+
+        Returns:
+            The snapshot's cards followed by the archived ones
+        """
+        with self._snapshot_lock:
+            database = self.snapshot()
+            if self._snapshot_cards is None:
+                self._snapshot_cards = self.all_cards(database)
+            return self._snapshot_cards
+
+    def count(self) -> int:
+        """Return the number of cards, archived ones included."""
+        return len(self.snapshot_cards())
+
+    def page(
+        self,
+        offset: int,
+        limit: int,
+        sort_by: Optional[str] = None,
+        descending: bool = False
+    ) -> list[FlashCard]:
+        """Fetch one window of cards in sorted order.
+
+        Each sort order is computed once per snapshot and reused, so paging
+        through the deck only slices a pre-sorted list. Archived cards are
+        included, after the others in file order.
+
+        Args:
+            offset: Index of the first card to return
+            limit: Maximum number of cards to return
+            sort_by: One of SORT_KEYS, or None for file order
+            descending: Reverse the sort order
+
+        Returns:
+            Cards in the requested window
+        """
+        if sort_by is not None and sort_by not in SORT_KEYS:
+            raise ValueError(f"Cannot sort by {sort_by!r}")
+        with self._snapshot_lock:
+            cards = self.snapshot_cards()
+            if sort_by is not None:
+                every = cards
+                cards = self._sort_indexes.get(sort_by)
+                if cards is None:
+                    cards = sorted(every, key=lambda c: getattr(c, sort_by))
+                    self._sort_indexes[sort_by] = cards
+
+        if descending:
+            start = max(0, len(cards) - offset - limit)
+            end = max(0, len(cards) - offset)
+            return cards[start:end][::-1]
+        return cards[offset:offset + limit]
+
+    def get_cards(self, card_ids: Iterable[UUID]) -> list[FlashCard]:
+        """Fetch several cards by ID from the cached snapshot or the archive.
+
+        Args:
+            card_ids: UUIDs of the cards to retrieve
+
+        Returns:
+            Found cards in the order requested (missing IDs are skipped)
+        """
+        with self._snapshot_lock:
+            cards = self.snapshot_cards()
+            if not self._id_index:
+                self._id_index = {card.id: card for card in cards}
+            index = self._id_index
+        return [index[i] for i in card_ids if i in index]
+
+    def file_stat(self) -> Optional[tuple[int, int]]:
+        """Return (mtime_ns, size) of the database file, or None if missing."""
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _set_snapshot(self, database: FlashCardDatabase) -> None:
+        """Adopt a just-saved database as the cached snapshot."""
+        with self._snapshot_lock:
+            self._snapshot = database
+            self._snapshot_stat = self.file_stat()
+            self._sort_indexes = {}
+            self._id_index = {}
+            self._snapshot_cards = None
+
+    async def aload(self) -> FlashCardDatabase:
+        """Load the database without blocking the event loop.
+
+        File I/O and validation run in a worker thread.
+
+        Returns:
+            FlashCardDatabase instance
+        """
+        return await asyncio.to_thread(self.load)
+
+    async def asave(self, database: FlashCardDatabase) -> None:
+        """Save the database without blocking the event loop.
+
+        Args:
+            database: FlashCardDatabase to persist
+        """
+        await asyncio.to_thread(self.save, database)
+
+    async def asnapshot(self) -> FlashCardDatabase:
+        """Return the cached snapshot, loading it in a worker thread if stale.
+
+        Returns:
+            Cached FlashCardDatabase instance (read-only)
+        """
+        return await asyncio.to_thread(self.snapshot)
 
     def get_card(self, card_id: UUID) -> Optional[FlashCard]:
         """Get a single card by ID.
@@ -81,10 +617,10 @@ class FlashCardRepository:
             card_id: UUID of the card to retrieve
 
         Returns:
-            FlashCard if found, None otherwise
+            FlashCard if found (in the database or the archive), None otherwise
         """
         database = self.load()
-        for card in database.cards:
+        for card in self.all_cards(database):
             if card.id == card_id:
                 return card
         return None
@@ -95,30 +631,81 @@ class FlashCardRepository:
         Args:
             card: FlashCard to add
         """
-        database = self.load()
-        database.cards.append(card)
-        self.save(database)
+        with self.lock():
+            database = self.load()
+            database.cards.append(card)
+            self.save(database)
+
+    def add_cards(self, cards: list[FlashCard]) -> None:
+        """Add many cards with a single locked load and save.
+
+        Args:
+            cards: FlashCards to add
+        """
+        with self.lock():
+            database = self.load()
+            database.cards.extend(cards)
+            self.save(database)
 
     def update_card(self, card: FlashCard) -> None:
         """Update an existing card.
 
+        An archived card is moved back into the database first.
+
         Args:
             card: FlashCard with updated data
+
+        Raises:
+            ValueError: If the card was not found
         """
-        database = self.load()
-        for i, existing_card in enumerate(database.cards):
-            if existing_card.id == card.id:
-                database.cards[i] = card
-                self.save(database)
-                return
+        with self.lock():
+            database = self.load()
+            self.unarchive(database, [card.id])
+            for i, existing_card in enumerate(database.cards):
+                if existing_card.id == card.id:
+                    database.cards[i] = card
+                    self.save(database)
+                    return
         raise ValueError(f"Card with id {card.id} not found")
 
+    def update_cards(self, cards: list[FlashCard]) -> None:
+        """Update many existing cards with a single locked load and save.
+
+        Cards that are no longer in the database are not re-added;
+        archived cards are moved back into it.
+
+        Args:
+            cards: FlashCards with updated data
+
+        Raises:
+            ValueError: If any card was not found (the others are still saved)
+        """
+        updates = {card.id: card for card in cards}
+        with self.lock():
+            database = self.load()
+            self.unarchive(database, updates)
+            for i, existing_card in enumerate(database.cards):
+                updated = updates.pop(existing_card.id, None)
+                if updated is not None:
+                    database.cards[i] = updated
+            self.save(database)
+        if updates:
+            missing = ", ".join(str(card_id) for card_id in updates)
+            raise ValueError(f"Cards not found: {missing}")
+
     def delete_card(self, card_id: UUID) -> None:
-        """Delete a card by ID.
+        """Delete a card by ID, from the database or the archive.
 
         Args:
             card_id: UUID of the card to delete
         """
-        database = self.load()
-        database.cards = [c for c in database.cards if c.id != card_id]
-        self.save(database)
+        with self.lock():
+            database = self.load()
+            self.unarchive(database, [card_id])
+            database.cards = [c for c in database.cards if c.id != card_id]
+            if any(card.id == card_id for card in self._read_archive()):
+                # Rewrite the archive without it, or its copy there would reappear
+                rest = [c for c in self.archived_cards(database) if c.id != card_id]
+                self._write_archive(rest, database.backups)
+                database.archive = summarize_archive(rest) if rest else None
+            self.save(database)
@@ -0,0 +1,370 @@
+"""Fixed-width sidecar index of the scheduling fields of every card.
+
+Read-only paths such as quick statistics and quiz selection only need
+each card's schedule, not its text. The index stores one fixed-width
+record per card, so readers mmap the file and unpack records with
+struct, without parsing JSON or building FlashCard objects. Only the
+segments holding the cards actually selected are then loaded.
+
+A deck has one index for its database file and one for its archive
+file, each written right after the file it describes. The header holds
+that file's (mtime_ns, size), so an index left stale by any other writer
+is detected and ignored.
+
+Layout (little-endian):
+    header           see _HEADER
+    tags             "\\n"-joined tag names; bit i of a tag mask is tag i
+    segments         "\\n"-joined segment file names
+    review days      uint32 date ordinals (days with any review)
+    records          see _RECORD, in database order
+"""
+
+import mmap
+import struct
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from ..domain.history import review_days, review_totals
+from ..domain.tag_index import TagTrie, subtree_counts
+from .models import FlashCard
+from .segments import read_database, read_segment, segment_dir
+
+_MAGIC = b"FCSI"
+_FORMAT_VERSION = 2
+
+# magic, format version, data file mtime_ns, data file size, flags,
+# records, tags block bytes, segments block bytes, review days
+_HEADER = struct.Struct("<4sHqqBIIII")
+
+# id, next_review, last_reviewed (microseconds since 1970-01-01, naive),
+# ease factor, interval days, review count, reviews and lapses (including
+# compacted history), tag mask, segment number, card type (see CARD_TYPES)
+_RECORD = struct.Struct("<16sqqddIIIQIB")
+
+# Flags
+HAS_ARCHIVE = 1  # The database has archived cards (see FlashCardDatabase.archive)
+TAG_OVERFLOW = 2  # More tags than mask bits; masks cover the first TAG_BITS only
+
+TAG_BITS = 64
+NEVER = -(2 ** 63)  # last_reviewed of never reviewed cards
+ARCHIVED = 0xFFFFFFFF  # Segment number of cards in the archive file
+CARD_TYPES = ("qa", "cloze", "multiple_choice")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_micros(moment: datetime) -> int:
+    """Encode a naive datetime as a record timestamp."""
+    return (moment - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(micros: int) -> datetime:
+    """Decode a record timestamp."""
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def index_path(path: Path) -> Path:
+    """Index file of a database (or archive) file."""
+    return path.with_suffix('.index')
+
+
+def write_index(
+    path: Path,
+    cards: Iterable[tuple[FlashCard, int]],
+    segments: Optional[list[str]] = None,
+    flags: int = 0
+) -> None:
+    """Write the index of a data file that was just written (call under lock).
+
+    Args:
+        path: Data file the index describes (must exist)
+        cards: (card, segment number) pairs in database order; segment
+            numbers index into `segments`, or are ARCHIVED
+        segments: Segment files of the data file
+        flags: HAS_ARCHIVE if the database has archived cards
+    """
+    cards = list(cards)
+    tags: dict[str, int] = {}
+    for card, _ in cards:
+        for tag in card.tags:
+            tags.setdefault(tag, len(tags))
+    if len(tags) > TAG_BITS:
+        flags |= TAG_OVERFLOW
+
+    days: set[date] = set()
+    records = bytearray()
+    for card, segment in cards:
+        mask = 0
+        for tag in card.tags:
+            bit = tags[tag]
+            if bit < TAG_BITS:
+                mask |= 1 << bit
+        reviews, lapses = review_totals(card)
+        days.update(review_days(card))
+        records += _RECORD.pack(
+            card.id.bytes,
+            to_micros(card.next_review),
+            NEVER if card.last_reviewed is None else to_micros(card.last_reviewed),
+            card.ease_factor,
+            card.interval_days,
+            card.review_count,
+            reviews,
+            lapses,
+            mask,
+            segment,
+            CARD_TYPES.index(card.type),
+        )
+
+    tag_block = "\n".join(tags).encode("utf-8")
+    segment_block = "\n".join(segments or []).encode("utf-8")
+    day_block = struct.pack(f"<{len(days)}I", *sorted(d.toordinal() for d in days))
+    stat = path.stat()
+    header = _HEADER.pack(
+        _MAGIC, _FORMAT_VERSION, stat.st_mtime_ns, stat.st_size, flags,
+        len(cards), len(tag_block), len(segment_block), len(days)
+    )
+
+    target = index_path(path)
+    temp_path = target.with_name(target.name + '.tmp')
+    temp_path.write_bytes(header + tag_block + segment_block + day_block + records)
+    temp_path.replace(target)
+
+
+class _IndexFile:
+    """Memory-mapped index of one data file."""
+
+    def __init__(self, path: Path, data: mmap.mmap):
+        self.path = path
+        self._data = data
+        (_, _, _, _, self.flags, self.count,
+         tags_len, segments_len, days_len) = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        tag_block = data[offset:offset + tags_len].decode("utf-8")
+        self.tags = tag_block.split("\n") if tag_block else []
+        offset += tags_len
+        segment_block = data[offset:offset + segments_len].decode("utf-8")
+        self.segments = segment_block.split("\n") if segment_block else []
+        offset += segments_len
+        self.review_days = struct.unpack_from(f"<{days_len}I", data, offset)
+        self._records_offset = offset + 4 * days_len
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["_IndexFile"]:
+        """Map the index of a data file, or None if missing or stale."""
+        try:
+            stat = path.stat()
+            with open(index_path(path), 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            magic, version, mtime_ns, size, *_ = _HEADER.unpack_from(data)
+        except struct.error:
+            return None
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            return None
+        if (mtime_ns, size) != (stat.st_mtime_ns, stat.st_size):
+            return None
+        return cls(path, data)
+
+    def records(self) -> Iterator[tuple]:
+        end = self._records_offset + self.count * _RECORD.size
+        with memoryview(self._data)[self._records_offset:end] as view:
+            yield from _RECORD.iter_unpack(view)
+
+    def sample(self, size: int) -> list[tuple]:
+        """Up to `size` records spread evenly over the file."""
+        step = max(1, -(-self.count // size))
+        return [
+            _RECORD.unpack_from(self._data, self._records_offset + i * _RECORD.size)
+            for i in range(0, self.count, step)
+        ]
+
+    def tag_mask(self, tags: list[str]) -> Optional[int]:
+        """Mask of cards with any of `tags` (or ``::*`` subtrees).
+
+        Returns None if a matching tag is beyond the mask bits.
+        """
+        bits = {tag: i for i, tag in enumerate(self.tags)}
+        mask = 0
+        for tag in TagTrie(self.tags).expand(tags):
+            if bits[tag] >= TAG_BITS:
+                return None
+            mask |= 1 << bits[tag]
+        return mask
+
+    def tags_of(self, mask: int) -> list[str]:
+        """Tags whose bits are set in a mask."""
+        return [tag for bit, tag in enumerate(self.tags[:TAG_BITS]) if mask >> bit & 1]
+
+
+class ScheduleIndex:
+    """Scheduling records of a deck: its database and archive indexes.
+
+    Records are tuples of (id bytes, next_review, last_reviewed, ease
+    factor, interval days, review count, reviews, lapses, tag mask,
+    segment number, card type); timestamps are as encoded by to_micros
+    and card types index CARD_TYPES.
+    """
+
+    def __init__(self, deck: _IndexFile, archive: Optional[_IndexFile]):
+        self._deck = deck
+        self._archive = archive
+
+    @classmethod
+    def open(cls, path: Path, archive_path: Path) -> Optional["ScheduleIndex"]:
+        """Map a deck's indexes, if they are present and current.
+
+        Args:
+            path: Database file
+            archive_path: Archive file of the database
+
+        Returns:
+            ScheduleIndex, or None if an index is missing, unreadable or
+            older than its data file
+        """
+        deck = _IndexFile.open(path)
+        if deck is None:
+            return None
+        archive = None
+        if deck.flags & HAS_ARCHIVE:
+            archive = _IndexFile.open(archive_path)
+            if archive is None:
+                return None
+        return cls(deck, archive)
+
+    @property
+    def complete_tags(self) -> bool:
+        """Whether every tag has a mask bit, so tags can be counted."""
+        files = [self._deck] + ([self._archive] if self._archive else [])
+        return not any(f.flags & TAG_OVERFLOW for f in files)
+
+    def records(self, tags: Optional[list[str]] = None) -> Optional[Iterator[tuple]]:
+        """Return the records of every card, archived ones last.
+
+        Archived cards also present in the database are skipped, as the
+        database's copy takes precedence.
+
+        Args:
+            tags: Only cards with any of these tags (OR logic; ``prefix::*``
+                selects a subtree)
+
+        Returns:
+            Iterator over records, or None if the tags can't be matched
+            from the index
+        """
+        masks = []
+        for index in filter(None, (self._deck, self._archive)):
+            masks.append(index.tag_mask(tags) if tags else None)
+            if tags and masks[-1] is None:
+                return None
+        return self._records(masks)
+
+    def tag_masks(self, tags: list[str]) -> Optional[tuple[int, int]]:
+        """Masks of cards with any of `tags`, for testing records directly.
+
+        Returns:
+            (mask for database records, mask for archived records), or None
+            if the tags can't be matched from the index
+        """
+        masks = []
+        for index in (self._deck, self._archive):
+            mask = index.tag_mask(tags) if index is not None else 0
+            if mask is None:
+                return None
+            masks.append(mask)
+        return masks[0], masks[1]
+
+    def _records(self, masks: list[Optional[int]]) -> Iterator[tuple]:
+        seen = set()
+        mask = masks[0]
+        for record in self._deck.records():
+            seen.add(record[0])
+            if mask is None or record[8] & mask:
+                yield record
+        if self._archive is not None:
+            mask = masks[1]
+            for record in self._archive.records():
+                if record[0] not in seen and (mask is None or record[8] & mask):
+                    yield record
+
+    def sample(self, size: int) -> list[tuple]:
+        """Records spread evenly over the deck and the archive, for estimates.
+
+        Unlike records(), archived cards also present in the database are
+        not skipped.
+
+        Args:
+            size: Records to take from each file, at most
+        """
+        return [r for index in filter(None, (self._deck, self._archive)) for r in index.sample(size)]
+
+    def count_tags(self) -> tuple[dict[str, int], dict[str, int]]:
+        """Cards per tag and per tag subtree (requires complete_tags).
+
+        Returns:
+            (cards per tag, cards per tag prefix as in subtree_counts())
+        """
+        # Cards with the same mask have the same tags; count masks first
+        groups: list[tuple[list[str], int]] = []
+        seen = set()
+        masks: dict[int, int] = {}
+        for record in self._deck.records():
+            seen.add(record[0])
+            masks[record[8]] = masks.get(record[8], 0) + 1
+        groups += [(self._deck.tags_of(mask), n) for mask, n in masks.items()]
+        if self._archive is not None:
+            masks = {}
+            for record in self._archive.records():
+                if record[0] not in seen:
+                    masks[record[8]] = masks.get(record[8], 0) + 1
+            groups += [(self._archive.tags_of(mask), n) for mask, n in masks.items()]
+
+        counts: dict[str, int] = {}
+        for tags, n in groups:
+            for tag in tags:
+                counts[tag] = counts.get(tag, 0) + n
+        return counts, subtree_counts(groups)
+
+    def review_days(self) -> set[date]:
+        """Every day with a review of any card."""
+        days = set(self._deck.review_days)
+        if self._archive is not None:
+            days.update(self._archive.review_days)
+        return {date.fromordinal(d) for d in days}
+
+    def fetch(self, records: list[tuple]) -> list[FlashCard]:
+        """Load the cards of some records, reading only their segments.
+
+        Archived cards are read from the archive file, which is only
+        opened if any record is ARCHIVED.
+
+        Args:
+            records: Records returned by records()
+
+        Returns:
+            The cards, in the order of `records`
+
+        Raises:
+            OSError: If a segment was removed since the index was read
+        """
+        wanted = {r[0]: r[9] for r in records}
+        found = {}
+        directory = segment_dir(self._deck.path)
+        for segment in sorted(set(wanted.values())):
+            if segment == ARCHIVED:
+                cards = read_database(self._archive.path, self._archive.path).cards
+            else:
+                cards = read_segment(directory, self._deck.segments[segment])
+            for card in cards:
+                if wanted.get(card.id.bytes) == segment:
+                    found[card.id.bytes] = card
+        return [found[r[0]] for r in records if r[0] in found]
+
+    def segments_for(self, records: list[tuple]) -> tuple[int, int]:
+        """Return (segments to read for `records`, segments in the deck).
+
+        The archive file, read if any record is ARCHIVED, isn't counted.
+        """
+        return len({r[9] for r in records} - {ARCHIVED}), len(self._deck.segments)
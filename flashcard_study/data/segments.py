@@ -0,0 +1,86 @@
+"""Segmented on-disk layout: a manifest file plus segment files of cards."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+from pydantic import TypeAdapter
+
+from .compression import CODECS, compress, extension, read_bytes
+from .models import FlashCard, FlashCardDatabase
+
+# Cards per segment file; a save rewrites only the segments that changed
+SEGMENT_SIZE = 256
+
+_SEGMENT = TypeAdapter(list[FlashCard])
+
+# Segment file name endings, uncompressed or with any codec
+SEGMENT_SUFFIXES = ('.json',) + tuple('.json' + ext for ext in CODECS.values())
+
+
+def segment_dir(path: Path) -> Path:
+    """Directory holding the segment files of a database file."""
+    return path.with_suffix('.segments')
+
+
+def segment_files(directory: Path) -> list[Path]:
+    """Every segment file in a segment directory."""
+    return [path for path in directory.glob('*.json*') if path.name.endswith(SEGMENT_SUFFIXES)]
+
+
+def write_segment(directory: Path, cards: list[FlashCard], codec: Optional[str] = None) -> str:
+    """Write one segment file, named by its content hash, and return its name.
+
+    Args:
+        directory: Segment directory
+        cards: Cards in the segment
+        codec: Compression codec (see compression.CODECS), or None
+    """
+    data = _SEGMENT.dump_json(cards, indent=2)
+    name = hashlib.sha1(data).hexdigest()[:20] + '.json' + extension(codec)
+    target = directory / name
+    if not target.exists():
+        temp_path = target.with_name(name + '.tmp')
+        temp_path.write_bytes(compress(data, codec))
+        temp_path.replace(target)
+    return name
+
+
+def read_segment(directory: Path, name: str) -> list[FlashCard]:
+    """Read the cards of one segment file."""
+    return _SEGMENT.validate_json(read_bytes(directory / name))
+
+
+def read_database(manifest_path: Path, path: Path) -> FlashCardDatabase:
+    """Read a database file and, if it is a manifest, its segments.
+
+    Files are decompressed according to their extension.
+
+    Args:
+        manifest_path: File to read (the database file or a backup of it)
+        path: Database file whose segment directory holds the segments
+
+    Returns:
+        FlashCardDatabase with every card loaded
+    """
+    database = FlashCardDatabase.model_validate_json(read_bytes(manifest_path))
+
+    if database.segments is not None:
+        directory = segment_dir(path)
+        loaded = [
+            (name, read_segment(directory, name))
+            for name in database.segments
+        ]
+        database.cards = [card for _, cards in loaded for card in cards]
+        database._loaded_segments = loaded
+    return database
+
+
+def manifest_segments(manifest_path: Path) -> list[str]:
+    """Segment names listed by a manifest (empty if unreadable or inline)."""
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f).get("segments") or []
+    except (OSError, ValueError, AttributeError):
+        return []
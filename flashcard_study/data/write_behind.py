@@ -0,0 +1,87 @@
+"""Background writer that persists updated cards off the caller's thread."""
+
+import queue
+import threading
+from typing import Callable, Optional
+
+from .models import FlashCard
+from .repository import FlashCardRepository
+
+# Sentinel telling the writer thread to exit
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """Persists card updates on a background thread.
+
+    Callers submit updated cards and return immediately. The writer thread
+    coalesces everything queued since its last write (keeping the latest
+    version of each card) into a single repository save.
+    """
+
+    def __init__(
+        self,
+        repository: FlashCardRepository,
+        on_error: Optional[Callable[[Exception, list[FlashCard]], None]] = None
+    ):
+        """Start the writer thread.
+
+        Args:
+            repository: FlashCardRepository to write to
+            on_error: Called from the writer thread with the exception and the
+                cards that failed to save. Must not block on the caller's thread.
+        """
+        self.repository = repository
+        self.on_error = on_error
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="flashcard-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, card: FlashCard) -> None:
+        """Queue an updated card for saving.
+
+        Args:
+            card: FlashCard with updated data
+        """
+        if self._closed:
+            raise RuntimeError("Writer is closed")
+        self._queue.put(card)
+
+    def flush(self) -> None:
+        """Block until every submitted card has been written (or failed)."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending writes and stop the writer thread. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Writer loop: wait for work, drain the queue, write once."""
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            cards = {c.id: c for c in batch if c is not _STOP}
+            try:
+                if cards:
+                    self.repository.update_cards(list(cards.values()))
+            except Exception as e:
+                if self.on_error is not None:
+                    self.on_error(e, list(cards.values()))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+            if any(item is _STOP for item in batch):
+                return
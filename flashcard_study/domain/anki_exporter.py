@@ -2,10 +2,13 @@
 
 import genanki
 import random
+import time
 from pathlib import Path
 from typing import Optional
 
 from ..data.models import FlashCard
+from .cloze import ClozeError, parse_cloze, to_anki
+from .tag_index import filter_cards
 
 
 class AnkiExporter:
@@ -37,14 +40,15 @@ class AnkiExporter:
         Args:
             cards: List of flash cards to export
             output_path: Path to save .apkg file
-            tags_filter: Optional list of tags to filter by (OR logic)
+            tags_filter: Optional list of tags to filter by (OR logic;
+                ``prefix::*`` selects a subtree)
 
         Returns:
             Number of cards exported
         """
         # Filter by tags if specified
         if tags_filter:
-            cards = [c for c in cards if any(t in c.tags for t in tags_filter)]
+            cards = filter_cards(cards, tags_filter)
 
         if not cards:
             return 0
@@ -201,8 +205,10 @@ class AnkiExporter:
     def _create_cloze_note(self, card: FlashCard, model: genanki.Model) -> genanki.Note:
         """Create Anki note for cloze card."""
         # Convert our {{answer}} format to Anki's {{c1::answer}} format
-        import re
-        text = re.sub(r'\{\{(.+?)\}\}', r'{{c1::\1}}', card.question)
+        try:
+            text = to_anki(parse_cloze(card.question))
+        except ClozeError:
+            text = card.question
 
         return genanki.Note(
             model=model,
@@ -225,3 +231,25 @@ class AnkiExporter:
             tags=card.tags,
             guid=str(card.id)
         )
+
+
+def export_deck(
+    deck_name: str,
+    cards: list[FlashCard],
+    output_path: Path
+) -> tuple[int, float]:
+    """Export one deck and time it.
+
+    Module-level so it can be dispatched to a process pool.
+
+    Args:
+        deck_name: Name of the Anki deck to create
+        cards: Cards to export (already filtered)
+        output_path: Path to save .apkg file
+
+    Returns:
+        Tuple of (cards exported, seconds spent)
+    """
+    start = time.perf_counter()
+    count = AnkiExporter(deck_name=deck_name).export(cards, output_path)
+    return count, time.perf_counter() - start
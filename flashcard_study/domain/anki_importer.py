@@ -0,0 +1,302 @@
+"""Import flash cards from Anki .apkg packages and collections."""
+
+import html
+import json
+import re
+import shutil
+import sqlite3
+import tempfile
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+from uuid import UUID, uuid5
+
+from ..data.models import FlashCard, ReviewHistory
+
+# Namespace for deriving stable card IDs from non-UUID Anki GUIDs, so that
+# re-importing the same collection maps onto the same cards.
+ANKI_GUID_NAMESPACE = UUID("6f1c3a52-3d0e-4f57-9a43-0b8e2b7a9c11")
+
+# Anki stores all note fields in one column separated by this character
+FIELD_SEPARATOR = "\x1f"
+
+# Anki answer buttons (1=Again, 2=Hard, 3=Good, 4=Easy) mapped onto our scores
+EASE_SCORES = {1: 0.0, 2: 0.5, 3: 1.0, 4: 1.0}
+
+# Anki card types
+CARD_TYPE_NEW = 0
+
+# `due` values below this are day numbers, above it epoch seconds
+DAY_NUMBER_LIMIT = 1_000_000_000
+
+CLOZE_PATTERN = re.compile(r"\{\{c\d+::(.+?)(?:::[^}]*)?\}\}", re.DOTALL)
+BR_PATTERN = re.compile(r"<br\s*/?>", re.IGNORECASE)
+OPTION_PREFIX_PATTERN = re.compile(r"^\s*\d+\.\s*")
+
+# Collection files in order of preference (newer schemas first)
+COLLECTION_NAMES = ("collection.anki21", "collection.anki2")
+
+
+@dataclass
+class ImportSummary:
+    """Outcome of an import run."""
+    imported: list[FlashCard] = field(default_factory=list)
+    duplicates: int = 0
+    skipped: int = 0
+
+
+class AnkiImporter:
+    """Imports notes from Anki .apkg packages into flash cards."""
+
+    def __init__(self, now: Optional[datetime] = None):
+        """Initialize importer.
+
+        Args:
+            now: Time used for cards without scheduling (defaults to datetime.now())
+        """
+        self.now = now or datetime.now()
+
+    def import_cards(
+        self,
+        source: Path,
+        existing: Iterable[FlashCard] = (),
+        tags: Optional[list[str]] = None
+    ) -> ImportSummary:
+        """Read all notes from an Anki package, skipping duplicates.
+
+        Cards are deduplicated against ``existing`` and against each other,
+        first by ID (our exporter writes card UUIDs as Anki GUIDs) and then
+        by content hash.
+
+        Args:
+            source: Path to an .apkg package or a bare collection.anki2 file
+            existing: Cards already in the database
+            tags: Optional extra tags to add to every imported card
+
+        Returns:
+            ImportSummary with the new cards and duplicate/skip counts
+        """
+        seen_ids = set()
+        seen_hashes = set()
+        for card in existing:
+            seen_ids.add(card.id)
+            seen_hashes.add(card.content_hash())
+
+        summary = ImportSummary()
+        for card in self.iter_cards(source):
+            if card is None:
+                summary.skipped += 1
+                continue
+
+            digest = card.content_hash()
+            if card.id in seen_ids or digest in seen_hashes:
+                summary.duplicates += 1
+                continue
+
+            seen_ids.add(card.id)
+            seen_hashes.add(digest)
+            if tags:
+                card.tags = list(dict.fromkeys(card.tags + tags))
+            summary.imported.append(card)
+
+        return summary
+
+    def iter_cards(self, source: Path) -> Iterator[Optional[FlashCard]]:
+        """Stream cards from an Anki package one note at a time.
+
+        Args:
+            source: Path to an .apkg package or a bare collection.anki2 file
+
+        Yields:
+            FlashCard per note, or None for notes that can't be mapped
+        """
+        with self._open_collection(source) as conn:
+            crt, models = self._read_collection_info(conn)
+
+            notes = conn.execute(
+                """
+                SELECT n.guid, n.mid, n.tags, n.flds,
+                       c.id, c.type, c.due, c.ivl, c.factor, c.reps
+                FROM notes n
+                LEFT JOIN cards c ON c.nid = n.id AND c.ord = 0
+                ORDER BY c.id
+                """
+            )
+            reviews = self._iter_reviews(conn)
+            pending = next(reviews, None)
+
+            for guid, mid, tags, flds, cid, ctype, due, ivl, factor, reps in notes:
+                # Both cursors are ordered by card id, so merge-walk them
+                history = []
+                while pending is not None and cid is not None and pending[0] <= cid:
+                    if pending[0] == cid:
+                        history.append(pending[1])
+                    pending = next(reviews, None)
+
+                fields = [self._clean_field(f) for f in flds.split(FIELD_SEPARATOR)]
+                yield self._build_card(
+                    guid=guid,
+                    model=models.get(str(mid)),
+                    fields=fields,
+                    tags=tags.split(),
+                    schedule=(ctype, due, ivl, factor, reps) if cid is not None else None,
+                    history=history,
+                    crt=crt,
+                )
+
+    @contextmanager
+    def _open_collection(self, source: Path) -> Iterator[sqlite3.Connection]:
+        """Open the SQLite collection inside a package.
+
+        The collection is streamed out of the zip into a temporary file,
+        since SQLite can't read from inside an archive.
+        """
+        with tempfile.TemporaryDirectory() as tmp:
+            if zipfile.is_zipfile(source):
+                with zipfile.ZipFile(source) as package:
+                    names = set(package.namelist())
+                    name = next((n for n in COLLECTION_NAMES if n in names), None)
+                    if name is None:
+                        if "collection.anki21b" in names:
+                            raise ValueError(
+                                "Compressed collection.anki21b packages are not supported; "
+                                "re-export from Anki with 'Support older Anki versions' enabled"
+                            )
+                        raise ValueError(f"No Anki collection found in {source}")
+
+                    db_path = Path(tmp) / name
+                    with package.open(name) as src, open(db_path, "wb") as dst:
+                        shutil.copyfileobj(src, dst)
+            else:
+                db_path = source
+
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                yield conn
+            finally:
+                conn.close()
+
+    @staticmethod
+    def _read_collection_info(conn: sqlite3.Connection) -> tuple[datetime, dict]:
+        """Read collection creation time and note models."""
+        crt, models_json = conn.execute("SELECT crt, models FROM col").fetchone()
+        return datetime.fromtimestamp(crt), json.loads(models_json)
+
+    @staticmethod
+    def _iter_reviews(conn: sqlite3.Connection) -> Iterator[tuple[int, ReviewHistory]]:
+        """Stream review log entries ordered by card id, then time."""
+        rows = conn.execute("SELECT cid, id, ease, ivl FROM revlog ORDER BY cid, id")
+        for cid, rid, ease, ivl in rows:
+            yield cid, ReviewHistory(
+                date=datetime.fromtimestamp(rid / 1000),
+                score=EASE_SCORES.get(ease, 0.0),
+                interval_days=AnkiImporter._interval_days(ivl),
+            )
+
+    @staticmethod
+    def _interval_days(ivl: int) -> float:
+        """Convert an Anki interval (days, or negative seconds) to days."""
+        if ivl < 0:
+            return -ivl / 86400
+        return float(ivl)
+
+    @staticmethod
+    def _clean_field(value: str) -> str:
+        """Convert Anki field HTML line breaks and entities to plain text."""
+        return html.unescape(BR_PATTERN.sub("\n", value)).strip()
+
+    def _build_card(
+        self,
+        guid: str,
+        model: Optional[dict],
+        fields: list[str],
+        tags: list[str],
+        schedule: Optional[tuple],
+        history: list[ReviewHistory],
+        crt: datetime,
+    ) -> Optional[FlashCard]:
+        """Map an Anki note onto a FlashCard, or None if it can't be mapped."""
+        if model is None:
+            return None
+
+        field_names = [f["name"] for f in model.get("flds", [])]
+        options = None
+
+        if model.get("type") == 1:  # Cloze model
+            deletions = CLOZE_PATTERN.findall(fields[0])
+            if not deletions:
+                return None
+            card_type = "cloze"
+            question = CLOZE_PATTERN.sub(r"{{\1}}", fields[0])
+            answer = ", ".join(deletions)
+        elif field_names[:3] == ["Question", "Options", "Answer"] and len(fields) >= 3:
+            card_type = "multiple_choice"
+            question, answer = fields[0], fields[2]
+            options = [
+                OPTION_PREFIX_PATTERN.sub("", line)
+                for line in fields[1].splitlines()
+                if line.strip()
+            ]
+        elif len(fields) >= 2:
+            card_type = "qa"
+            question, answer = fields[0], fields[1]
+        else:
+            return None
+
+        if not question or not answer:
+            return None
+
+        try:
+            card_id = UUID(guid)
+        except ValueError:
+            card_id = uuid5(ANKI_GUID_NAMESPACE, guid)
+
+        ease_factor, interval_days, review_count, next_review = self._schedule(schedule, crt)
+        last_reviewed = history[-1].date if history else None
+
+        return FlashCard(
+            id=card_id,
+            type=card_type,
+            question=question,
+            answer=answer,
+            tags=tags,
+            options=options,
+            created_at=self.now,
+            last_reviewed=last_reviewed,
+            next_review=next_review,
+            ease_factor=ease_factor,
+            interval_days=interval_days,
+            review_count=max(review_count, len(history)),
+            review_history=history,
+        )
+
+    def _schedule(
+        self,
+        schedule: Optional[tuple],
+        crt: datetime
+    ) -> tuple[float, float, int, datetime]:
+        """Translate Anki card scheduling into our spaced repetition fields.
+
+        Returns:
+            Tuple of (ease_factor, interval_days, review_count, next_review)
+        """
+        if schedule is None:
+            return 2.5, 0.0, 0, self.now
+
+        ctype, due, ivl, factor, reps = schedule
+        ease_factor = min(3.0, max(1.3, factor / 1000)) if factor else 2.5
+        interval_days = self._interval_days(ivl)
+
+        if ctype == CARD_TYPE_NEW:
+            next_review = self.now
+        elif due < DAY_NUMBER_LIMIT:
+            # Review cards are due on a day number relative to collection creation
+            next_review = crt + timedelta(days=due)
+        else:
+            # Learning cards are due at an epoch timestamp
+            next_review = datetime.fromtimestamp(due)
+
+        return ease_factor, interval_days, reps or 0, next_review
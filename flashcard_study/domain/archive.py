@@ -0,0 +1,77 @@
+"""Cold-tier archive policy.
+
+Mastered cards with long intervals come due rarely, yet every load,
+statistics pass and quiz selection scans them. Such cards are moved to a
+separate archive file that normal loads skip; the main database keeps an
+ArchiveSummary with just enough to schedule and count them.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable
+
+from ..config import MASTERY_LEARNING_THRESHOLD
+from ..data.models import ArchiveSummary, FlashCard
+from .history import review_days, review_totals
+from .tag_index import subtree_counts
+
+# Minimum interval for a mastered card to be archived
+ARCHIVE_MIN_INTERVAL_DAYS = 60.0
+
+
+def is_cold(card: FlashCard, now: datetime) -> bool:
+    """Whether a card belongs in the archive.
+
+    Cards reviewed today stay in the deck so today's counts and an open
+    quiz keep seeing them; they are archived on a later save.
+
+    Args:
+        card: The flash card to check
+        now: Current time
+
+    Returns:
+        True if the card is mastered, has a long interval and is not due
+    """
+    return (
+        card.review_count >= MASTERY_LEARNING_THRESHOLD
+        and card.interval_days >= ARCHIVE_MIN_INTERVAL_DAYS
+        and card.next_review > now
+        and card.last_reviewed is not None
+        and card.last_reviewed.date() < now.date()
+    )
+
+
+def summarize_archive(cards: Iterable[FlashCard]) -> ArchiveSummary:
+    """Compute the aggregates kept in the main database for archived cards.
+
+    Args:
+        cards: Every archived card
+
+    Returns:
+        ArchiveSummary of the cards
+    """
+    summary = ArchiveSummary()
+    due_days = defaultdict(int)
+    tag_counts = defaultdict(int)
+    days = set()
+    tag_lists = []
+
+    for card in cards:
+        summary.count += 1
+        if summary.earliest_next_review is None or card.next_review < summary.earliest_next_review:
+            summary.earliest_next_review = card.next_review
+        due_days[card.next_review.date()] += 1
+        summary.ease_total += card.ease_factor
+        reviews, lapses = review_totals(card)
+        summary.reviews += reviews
+        summary.lapses += lapses
+        days.update(review_days(card))
+        for tag in card.tags:
+            tag_counts[tag] += 1
+        tag_lists.append((card.tags, 1))
+
+    summary.due_days = dict(sorted(due_days.items()))
+    summary.review_days = sorted(days)
+    summary.tag_counts = dict(tag_counts)
+    summary.tag_subtrees = subtree_counts(tag_lists)
+    return summary
@@ -0,0 +1,70 @@
+"""Card-level differences between two versions of a deck."""
+
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from uuid import UUID
+
+from ..data.models import FlashCard
+from .sync import card_digest
+
+
+@dataclass
+class CardDiff:
+    """Cards added, changed and removed between two versions of a deck."""
+    added: list[FlashCard] = field(default_factory=list)
+    updated: list[tuple[FlashCard, FlashCard]] = field(default_factory=list)  # (old, new)
+    removed: list[FlashCard] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.updated or self.removed)
+
+    def changed_ids(self) -> set:
+        """IDs of every card the diff touches."""
+        return (
+            {c.id for c in self.added}
+            | {new.id for _, new in self.updated}
+            | {c.id for c in self.removed}
+        )
+
+
+def diff_cards(
+    old: Iterable[FlashCard],
+    new: Iterable[FlashCard],
+    old_digests: Optional[dict[UUID, str]] = None,
+    new_digests: Optional[dict[UUID, str]] = None
+) -> CardDiff:
+    """Compare two versions of a deck card by card.
+
+    Cards are matched by ID and compared by their digest (see
+    sync.card_digest), which covers everything stored for a card, so
+    review and schedule changes are caught as well as edits to its
+    content. Pass the digests kept per card (see sync.DigestCache) to
+    avoid hashing cards again; cards shared by both versions (the same
+    object) are skipped without hashing.
+
+    Args:
+        old: Cards before the change
+        new: Cards after the change
+        old_digests: Card ID to digest for `old`; missing cards are hashed
+        new_digests: Card ID to digest for `new`; missing cards are hashed
+
+    Returns:
+        CardDiff with added, updated and removed cards
+    """
+    old_digests = old_digests or {}
+    new_digests = new_digests or {}
+    previous = {card.id: card for card in old}
+    diff = CardDiff()
+
+    for card in new:
+        before = previous.pop(card.id, None)
+        if before is None:
+            diff.added.append(card)
+        elif before is not card:
+            old_digest = old_digests.get(card.id) or card_digest(before)
+            new_digest = new_digests.get(card.id) or card_digest(card)
+            if old_digest != new_digest:
+                diff.updated.append((before, card))
+
+    diff.removed = list(previous.values())
+    return diff
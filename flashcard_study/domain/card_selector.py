@@ -1,8 +1,13 @@
 """Card selection logic for quizzes."""
 
+import heapq
 from datetime import datetime
 from typing import Optional
 from ..data.models import FlashCard
+from ..data.repository import FlashCardRepository
+from ..data.schedule_index import ARCHIVED, NEVER, ScheduleIndex, to_micros
+from .query import Term, filter_query
+from .tag_index import filter_cards
 
 
 class CardSelector:
@@ -14,7 +19,8 @@ class CardSelector:
         tags: Optional[list[str]] = None,
         count: int = 10,
         include_all: bool = False,
-        now: Optional[datetime] = None
+        now: Optional[datetime] = None,
+        query: Optional[Term] = None
     ) -> list[FlashCard]:
         """Select cards for quiz based on spaced repetition priority.
 
@@ -25,10 +31,13 @@ class CardSelector:
 
         Args:
             cards: List of all available cards
-            tags: Optional list of tags to filter by (OR logic)
+            tags: Optional list of tags to filter by (OR logic;
+                ``prefix::*`` selects a subtree)
             count: Maximum number of cards to return
             include_all: If True, include cards not yet due
             now: Current time (defaults to datetime.now())
+            query: Optional parsed query cards must also match (see
+                domain.query)
 
         Returns:
             List of selected cards in priority order
@@ -38,7 +47,9 @@ class CardSelector:
 
         # Filter by tags if specified
         if tags:
-            cards = [c for c in cards if any(t in c.tags for t in tags)]
+            cards = filter_cards(cards, tags)
+        if query is not None:
+            cards = filter_query(cards, query, now)
 
         # Separate into categories
         overdue = []
@@ -62,3 +73,101 @@ class CardSelector:
         # Combine and limit
         result = [c for c, _ in overdue] + never_reviewed + [c for c, _ in upcoming]
         return result[:count]
+
+    @staticmethod
+    def select_from_repository(
+        repository: FlashCardRepository,
+        tags: Optional[list[str]] = None,
+        count: int = 10,
+        include_all: bool = False,
+        now: Optional[datetime] = None,
+        query: Optional[Term] = None
+    ) -> list[FlashCard]:
+        """Load the deck and select cards for a quiz.
+
+        Archived cards that have come due are first promoted back into the
+        deck, so they are selected like any other overdue card. Archived
+        cards that are not yet due are never selected, even with
+        include_all. When the deck's schedule index is current and no
+        archived card is due, cards are chosen from the index and only
+        the selected ones are loaded, provided the index can also check
+        the query.
+
+        Args:
+            repository: FlashCardRepository to load from
+            tags: Optional list of tags to filter by (OR logic)
+            count: Maximum number of cards to return
+            include_all: If True, include cards not yet due
+            now: Current time (defaults to datetime.now())
+            query: Optional parsed query cards must also match
+
+        Returns:
+            List of selected cards in priority order (freshly loaded)
+        """
+        if now is None:
+            now = datetime.now()
+
+        index = repository.schedule_index()
+        if index is not None:
+            try:
+                selected = CardSelector._select_from_index(index, tags, count, include_all, now, query)
+            except OSError:
+                selected = None  # Deck saved meanwhile
+            if selected is not None:
+                return selected
+
+        database = repository.load()
+        if database.archive is not None and database.archive.has_due(now):
+            repository.promote_due(now)
+            database = repository.load()
+
+        return CardSelector.select_for_quiz(
+            database.cards, tags=tags, count=count, include_all=include_all, now=now, query=query
+        )
+
+    @staticmethod
+    def _select_from_index(
+        index: ScheduleIndex,
+        tags: Optional[list[str]],
+        count: int,
+        include_all: bool,
+        now: datetime,
+        query: Optional[Term] = None
+    ) -> Optional[list[FlashCard]]:
+        """Select as select_for_quiz() does, scanning only index records.
+
+        Returns:
+            Selected cards, or None if the index can't answer (tags beyond
+            its tag bits, a query with text terms, or archived cards due
+            for promotion)
+        """
+        records = index.records(tags)
+        if records is None:
+            return None
+        if query is not None:
+            test = query.record_test(index, now)
+            if test is None:
+                return None
+            records = filter(test, records)
+
+        now_us = to_micros(now)
+        overdue = []
+        never_reviewed = []
+        upcoming = []
+        for record in records:
+            if record[9] == ARCHIVED:
+                if record[1] <= now_us:
+                    return None
+            elif record[2] == NEVER:
+                never_reviewed.append(record)
+            elif record[1] <= now_us:
+                overdue.append(record)
+            elif include_all:
+                upcoming.append(record)
+
+        # Most overdue first, then soonest due, as in select_for_quiz()
+        selected = heapq.nsmallest(count, overdue, key=lambda r: r[1])
+        selected += never_reviewed[:count - len(selected)]
+        if len(selected) < count:
+            selected += heapq.nsmallest(count - len(selected), upcoming, key=lambda r: r[1])
+        return index.fetch(selected)
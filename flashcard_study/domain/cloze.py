@@ -0,0 +1,100 @@
+"""Parsing of cloze deletion markup (``{{answer}}``).
+
+Cards mark each hidden part of a cloze question with ``{{...}}``; a card
+may contain several deletions, which are all hidden and revealed together.
+The question is parsed once into segments and cached, so the display and
+the exporter share one parser and neither re-runs regexes per render.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+
+OPEN = "{{"
+CLOSE = "}}"
+
+
+class ClozeError(ValueError):
+    """Raised when cloze markup is malformed."""
+
+
+@dataclass(frozen=True)
+class ClozeSegment:
+    """A run of plain text or a single deletion."""
+    text: str
+    is_deletion: bool = False
+
+
+@lru_cache(maxsize=4096)
+def parse_cloze(text: str) -> tuple[ClozeSegment, ...]:
+    """Split cloze text into plain and deletion segments.
+
+    Args:
+        text: Question text containing ``{{...}}`` deletions
+
+    Returns:
+        Tuple of segments in order (cached per text)
+
+    Raises:
+        ClozeError: If a deletion is unclosed, nested, empty, or a ``}}``
+            appears without a matching ``{{``
+    """
+    segments = []
+    pos = 0
+    while True:
+        start = text.find(OPEN, pos)
+        stray = text.find(CLOSE, pos)
+        if stray != -1 and (start == -1 or stray < start):
+            raise ClozeError(f"unmatched '}}}}' at position {stray}")
+        if start == -1:
+            break
+
+        end = text.find(CLOSE, start + len(OPEN))
+        if end == -1:
+            raise ClozeError(f"unclosed '{{{{' at position {start}")
+        nested = text.find(OPEN, start + len(OPEN), end)
+        if nested != -1:
+            raise ClozeError(f"nested '{{{{' at position {nested}")
+
+        answer = text[start + len(OPEN):end]
+        if not answer.strip():
+            raise ClozeError(f"empty deletion at position {start}")
+
+        if start > pos:
+            segments.append(ClozeSegment(text[pos:start]))
+        segments.append(ClozeSegment(answer, is_deletion=True))
+        pos = end + len(CLOSE)
+
+    if pos < len(text):
+        segments.append(ClozeSegment(text[pos:]))
+    if not any(s.is_deletion for s in segments):
+        raise ClozeError("cloze question must contain a {{...}} deletion")
+    return tuple(segments)
+
+
+def deletions(segments: tuple[ClozeSegment, ...]) -> list[str]:
+    """Return the hidden answers of a parsed cloze question.
+
+    Args:
+        segments: Parsed segments
+
+    Returns:
+        Deletion texts in order
+    """
+    return [s.text for s in segments if s.is_deletion]
+
+
+def to_anki(segments: tuple[ClozeSegment, ...]) -> str:
+    """Render parsed segments in Anki's ``{{c1::answer}}`` syntax.
+
+    All deletions share cloze number 1 so they are hidden on the same
+    Anki card, matching how they are quizzed here.
+
+    Args:
+        segments: Parsed segments
+
+    Returns:
+        Anki cloze field text
+    """
+    return "".join(
+        f"{{{{c1::{s.text}}}}}" if s.is_deletion else s.text for s in segments
+    )
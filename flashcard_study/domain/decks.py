@@ -0,0 +1,100 @@
+"""Working across named decks without loading them all."""
+
+import heapq
+import itertools
+from datetime import datetime
+from typing import Iterator, Optional
+
+from ..data.catalog import DeckCatalog, deck_names, summarize_deck
+from ..data.models import DeckInfo, FlashCard
+from ..data.repository import FlashCardRepository
+from .tag_index import TagQuery
+
+
+def refresh_catalog(catalog: Optional[DeckCatalog] = None) -> dict[str, DeckInfo]:
+    """Bring the catalog up to date with the decks on disk.
+
+    Only decks whose file changed since their entry was written (e.g.
+    edited by hand or by an older version) are loaded and recounted.
+
+    Args:
+        catalog: DeckCatalog to refresh (defaults to the standard one)
+
+    Returns:
+        Entry for every existing deck, by name
+    """
+    catalog = catalog or DeckCatalog()
+    entries = catalog.load()
+    current = {}
+    for name in deck_names():
+        repository = FlashCardRepository(deck=name)
+        stat = repository.file_stat()
+        info = entries.get(name)
+        if info is None or info.stat != stat:
+            info = summarize_deck(repository.load(), stat)
+            catalog.record(name, info)
+        current[name] = info
+
+    gone = [name for name in entries if name not in current]
+    if gone:
+        catalog.forget(gone)
+    return current
+
+
+def merge_due(
+    now: Optional[datetime] = None,
+    tags: Optional[list[str]] = None,
+    decks: Optional[list[str]] = None
+) -> Iterator[tuple[str, FlashCard]]:
+    """Yield due cards from every deck, most overdue first.
+
+    Decks are ordered by their earliest due date from the catalog and each
+    is only loaded when the merge reaches that date, so taking the first
+    few cards leaves decks with later due cards, and decks with nothing
+    due, unread. Archived cards that have come due are promoted first.
+
+    Args:
+        now: Current time (defaults to datetime.now())
+        tags: Optional list of tags to filter by (OR logic)
+        decks: Only merge these decks (default: all)
+
+    Yields:
+        (deck name, card) pairs in next_review order
+    """
+    if now is None:
+        now = datetime.now()
+
+    order = itertools.count()  # Tie-breaker; cards and iterators don't compare
+    heap = [
+        (info.earliest_next_review, next(order), name, None, None)
+        for name, info in refresh_catalog().items()
+        if info.has_due(now) and (decks is None or name in decks)
+    ]
+    heapq.heapify(heap)
+
+    while heap:
+        _, _, name, card, rest = heapq.heappop(heap)
+        if card is not None:
+            yield name, card
+        else:
+            rest = iter(_due_cards(name, now, tags))
+        following = next(rest, None)
+        if following is not None:
+            heapq.heappush(heap, (following.next_review, next(order), name, following, rest))
+
+
+def _due_cards(name: str, now: datetime, tags: Optional[list[str]]) -> list[FlashCard]:
+    """Load one deck and return its due cards sorted by next_review."""
+    repository = FlashCardRepository(deck=name)
+    database = repository.load()
+    if database.archive is not None and database.archive.has_due(now):
+        repository.promote_due(now)
+        database = repository.load()
+    query = TagQuery(tags) if tags else None
+    return sorted(
+        (
+            card for card in database.cards
+            if card.next_review <= now and (query is None or query.matches(card.tags))
+        ),
+        key=lambda card: card.next_review
+    )
@@ -0,0 +1,135 @@
+"""Review history compaction.
+
+Cards keep their most recent review entries verbatim; older entries are
+rolled up into a per-card HistorySummary that preserves what statistics
+need: review count, lapses and score total for retention, and the review
+days still in the deck's review streak (see streak_start), so the summary
+does not grow with every day reviewed.
+"""
+
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from ..data.models import DEFAULT_HISTORY_LIMIT, FlashCard, HistorySummary
+
+
+def streak_start(days: Iterable[date], today: date) -> date:
+    """Return the first day of the review streak that can still continue.
+
+    That streak ends today, or yesterday if there were no reviews today
+    yet. Earlier review days can never count towards a streak again.
+
+    Args:
+        days: Review days of the whole deck, archive included
+        today: Current date
+    """
+    days = set(days)
+    day = today if today in days else today - timedelta(days=1)
+    while day - timedelta(days=1) in days:
+        day -= timedelta(days=1)
+    return day
+
+
+def compact_history(
+    card: FlashCard,
+    keep: int = DEFAULT_HISTORY_LIMIT,
+    since: Optional[date] = None
+) -> FlashCard:
+    """Roll all but the last `keep` history entries into the card's summary.
+
+    Args:
+        card: The flash card to compact
+        keep: Number of most recent raw entries to keep
+        since: When given, summary review days before it are dropped
+
+    Returns:
+        New FlashCard, or the same card if it has no more than `keep` entries
+    """
+    keep = max(0, keep)
+    if len(card.review_history) <= keep:
+        return card
+
+    cut = len(card.review_history) - keep
+    rolled = card.review_history[:cut]
+    summary = card.history_summary or HistorySummary()
+
+    days = set(summary.review_days)
+    days.update(entry.date.date() for entry in rolled)
+    if since is not None:
+        days = {day for day in days if day >= since}
+    first = min(entry.date for entry in rolled)
+    last = max(entry.date for entry in rolled)
+
+    summary = HistorySummary(
+        count=summary.count + len(rolled),
+        score_total=summary.score_total + sum(entry.score for entry in rolled),
+        lapses=summary.lapses + sum(1 for entry in rolled if entry.score == 0),
+        first_review=min(summary.first_review, first) if summary.first_review else first,
+        last_review=max(summary.last_review, last) if summary.last_review else last,
+        review_days=sorted(days),
+    )
+    return card.model_copy(update={
+        "review_history": card.review_history[cut:],
+        "history_summary": summary,
+    })
+
+
+def compact_cards(
+    cards: Iterable[FlashCard],
+    keep: int = DEFAULT_HISTORY_LIMIT,
+    today: Optional[date] = None,
+    archived_days: Iterable[date] = ()
+) -> tuple[list[FlashCard], int, int]:
+    """Compact the history of every card that exceeds `keep` entries.
+
+    Args:
+        cards: Cards to compact
+        keep: Number of most recent raw entries to keep per card
+        today: When given, compacted summaries only keep review days from
+            the streak that can still continue (see streak_start)
+        archived_days: Review days of archived cards, which count towards
+            the streak too
+
+    Returns:
+        Tuple of (cards, cards compacted, entries rolled up)
+    """
+    cards = list(cards)
+    since = None
+    if today is not None and any(len(card.review_history) > keep for card in cards):
+        days = set(archived_days)
+        for card in cards:
+            days.update(review_days(card))
+        since = streak_start(days, today)
+
+    result = []
+    compacted = 0
+    rolled = 0
+    for card in cards:
+        new = compact_history(card, keep, since)
+        if new is not card:
+            compacted += 1
+            rolled += len(card.review_history) - len(new.review_history)
+        result.append(new)
+    return result, compacted, rolled
+
+
+def review_days(card: FlashCard) -> set[date]:
+    """Distinct days the card was reviewed, including compacted reviews."""
+    days = {entry.date.date() for entry in card.review_history}
+    if card.history_summary is not None:
+        days.update(card.history_summary.review_days)
+    return days
+
+
+def review_totals(card: FlashCard) -> tuple[int, int]:
+    """Count the card's reviews and lapses, including compacted reviews.
+
+    Returns:
+        Tuple of (reviews, reviews scored 0)
+    """
+    reviews = len(card.review_history)
+    lapses = sum(1 for entry in card.review_history if entry.score == 0)
+    if card.history_summary is not None:
+        reviews += card.history_summary.count
+        lapses += card.history_summary.lapses
+    return reviews, lapses
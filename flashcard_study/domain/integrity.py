@@ -0,0 +1,360 @@
+"""Integrity check and repair of a deck's files (fsck).
+
+FlashCardRepository.load() reads a deck strictly: one malformed card
+fails the whole file, and it then falls back to a backup. This module
+instead reads the database, segment and archive files record by record,
+validating the records of each segment (or chunk of inline records) in
+a process pool. It reports every problem with the file and position of
+the record, and can build a repaired deck from every salvageable card.
+
+Workers send back salvaged cards as JSON rather than pickled models,
+which cost more to pickle than to check; they are only decoded again
+when a repaired deck is actually built.
+
+Problems found:
+    unreadable files and records that aren't valid cards (dropped)
+    duplicate card IDs (the copy with the highest version is kept)
+    impossible schedules and inconsistent review history (see check_card)
+"""
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+from pydantic import TypeAdapter, ValidationError
+
+from ..data.compression import read_bytes
+from ..data.models import FlashCard, FlashCardDatabase
+from ..data.repository import FlashCardRepository
+from ..data.segments import SEGMENT_SIZE, segment_dir, segment_files
+from .spaced_repetition import MAX_EASE, MIN_EASE
+
+# Below this many chunks, records are checked in-process
+PARALLEL_MIN_CHUNKS = 8
+
+_CARDS = TypeAdapter(list[FlashCard])
+
+# Database fields checked as settings; the rest are checked card by card
+# (cards, segments) or recomputed on repair (archive)
+_CARD_FIELDS = ("cards", "segments", "archive")
+
+
+@dataclass
+class Problem:
+    """One problem found by check_repository()."""
+    source: str  # Name of the file holding the record
+    position: Optional[int]  # Index of the record in its file (None: the whole file)
+    message: str
+    repair: str  # What a repair does about it
+    card_id: Optional[str] = None
+
+
+@dataclass
+class _Checked:
+    """Result of checking one segment or chunk of records."""
+    source: str
+    records: int = 0
+    keys: list[tuple[int, bytes, int]] = field(default_factory=list)  # (position, id, version)
+    cards: bytes = b"[]"  # JSON of the salvaged cards, in the order of keys
+    problems: list[Problem] = field(default_factory=list)
+
+
+@dataclass
+class CheckReport:
+    """Outcome of check_repository()."""
+    records: int  # Card records read
+    problems: list[Problem]
+    settings: FlashCardDatabase  # Database settings, without cards
+    # Checked chunks of the database and the archive, with the positions
+    # in each chunk's keys of the copies kept
+    deck: list[tuple[_Checked, list[int]]] = field(repr=False)
+    archive: list[tuple[_Checked, list[int]]] = field(repr=False)
+
+    @property
+    def ok(self) -> bool:
+        return not self.problems
+
+    def repaired(self) -> tuple[FlashCardDatabase, list[FlashCard]]:
+        """Build the repaired deck from every salvageable card.
+
+        Returns:
+            (database with the settings and salvaged cards, salvaged
+            archived cards)
+        """
+        database = self.settings.model_copy(update={"cards": _decode(self.deck)})
+        return database, _decode(self.archive)
+
+
+def _decode(chunks: list[tuple[_Checked, list[int]]]) -> list[FlashCard]:
+    cards = []
+    for checked, kept in chunks:
+        salvaged = _CARDS.validate_json(checked.cards)
+        cards += [salvaged[i] for i in kept]
+    return cards
+
+
+def check_card(card: FlashCard) -> tuple[FlashCard, list[tuple[str, str]]]:
+    """Check a card's schedule and review history for impossible values.
+
+    The history must be in date order, last_reviewed must be the latest
+    review and review_count must cover every recorded review; scores lie
+    in [0, 1]. The ease factor must lie in [MIN_EASE, MAX_EASE], and the
+    next review can't precede the last review, or the card's creation if
+    it was never reviewed (imported cards may be created after their
+    reviews).
+
+    Args:
+        card: Card to check
+
+    Returns:
+        (card with the problems repaired, [(problem, repair), ...])
+    """
+    found = []
+    update = {}
+
+    history = card.review_history
+    if any(later.date < earlier.date for earlier, later in zip(history, history[1:])):
+        history = sorted(history, key=lambda entry: entry.date)
+        found.append(("review history out of date order", "history sorted"))
+    if any(not 0 <= entry.score <= 1 for entry in history):
+        history = [
+            entry.model_copy(update={"score": min(1.0, max(0.0, entry.score))}) for entry in history
+        ]
+        found.append(("review score outside [0, 1]", "scores clamped"))
+    if history is not card.review_history:
+        update["review_history"] = history
+
+    summary = card.history_summary
+    if summary is not None and summary.lapses > summary.count:
+        update["history_summary"] = summary.model_copy(update={"lapses": summary.count})
+        found.append((f"{summary.lapses} lapses in {summary.count} compacted reviews", "lapses capped"))
+
+    recorded = len(history) + (summary.count if summary is not None else 0)
+    if card.review_count < recorded:
+        update["review_count"] = recorded
+        found.append((f"review_count {card.review_count} below {recorded} recorded reviews", f"set to {recorded}"))
+
+    reviews = [entry.date for entry in history]
+    if summary is not None and summary.last_review is not None:
+        reviews.append(summary.last_review)
+    last_reviewed = card.last_reviewed
+    if reviews and last_reviewed != max(reviews):
+        last_reviewed = update["last_reviewed"] = max(reviews)
+        found.append(("last_reviewed isn't the latest review", f"set to {last_reviewed:%Y-%m-%d %H:%M}"))
+
+    if not MIN_EASE <= card.ease_factor <= MAX_EASE:
+        update["ease_factor"] = min(MAX_EASE, max(MIN_EASE, card.ease_factor))
+        found.append((f"ease {card.ease_factor:g} outside [{MIN_EASE}, {MAX_EASE}]", f"set to {update['ease_factor']}"))
+
+    interval = card.interval_days
+    if interval < 0:
+        interval = update["interval_days"] = 0.0
+        found.append((f"negative interval {card.interval_days:g}", "set to 0"))
+
+    if last_reviewed is not None and card.next_review < last_reviewed:
+        update["next_review"] = last_reviewed + timedelta(days=interval)
+        found.append(("next_review before last review", "rescheduled from the last review"))
+    elif last_reviewed is None and card.review_count == 0 and card.next_review < card.created_at:
+        update["next_review"] = card.created_at
+        found.append(("next_review before created_at", "set to created_at"))
+
+    return (card.model_copy(update=update) if update else card), found
+
+
+def check_repository(repository: FlashCardRepository, workers: Optional[int] = None) -> CheckReport:
+    """Check every card of a deck (see CheckReport.repaired() to repair it).
+
+    Reads the files as they are, without falling back to backups. If the
+    database file itself is unreadable, every segment file on disk is
+    checked instead, which may bring back cards deleted since an older
+    backup generation was taken.
+
+    Args:
+        repository: Deck to check
+        workers: Processes to check records with (None = CPU count,
+            1 = in-process)
+
+    Returns:
+        CheckReport
+    """
+    path = repository.file_path
+    problems: list[Problem] = []
+    settings = FlashCardDatabase()
+    tasks = []  # (is_archive, function, args)
+
+    raw = _read_json(path, problems, "rebuilt from segment files") if path.exists() else {"cards": []}
+    if raw is not None and not isinstance(raw, dict):
+        problems.append(Problem(path.name, None, "not a database object", "rebuilt from segment files"))
+        raw = None
+
+    if raw is not None:
+        try:
+            settings = FlashCardDatabase.model_validate(
+                {k: v for k, v in raw.items() if k not in _CARD_FIELDS}
+            )
+        except ValidationError as e:
+            problems.append(Problem(path.name, None, f"invalid settings: {_describe(e)}", "default settings"))
+
+    directory = segment_dir(path)
+    names = raw.get("segments") if raw is not None else None
+    if raw is None or (names is not None and not _is_names(names)):
+        if raw is not None:
+            problems.append(Problem(path.name, None, "invalid segment list", "rebuilt from segment files"))
+        names = sorted(p.name for p in segment_files(directory)) if directory.is_dir() else []
+    if names is not None:
+        tasks += [(False, _check_segment, (directory, name)) for name in names]
+    else:
+        tasks += _record_tasks(False, path.name, raw.get("cards", []), problems)
+
+    if repository.archive_path.exists():
+        archive = _read_json(repository.archive_path, problems, "its cards are lost")
+        if archive is not None:
+            records = archive.get("cards", []) if isinstance(archive, dict) else None
+            tasks += _record_tasks(True, repository.archive_path.name, records, problems)
+
+    results = _run(tasks, workers)
+    for _, checked in results:
+        problems += checked.problems
+
+    # Duplicates are found across chunks, so are reported after them
+    deck = _unique([checked for archive, checked in results if not archive], problems)
+    archived = _unique([checked for archive, checked in results if archive], problems)
+    for card_id, (checked, i) in list(archived.items()):
+        if card_id in deck:
+            problems.append(Problem(
+                checked.source, checked.keys[i][0], "also in the database",
+                "archived copy dropped", str(UUID(bytes=card_id))
+            ))
+            del archived[card_id]
+
+    return CheckReport(
+        records=sum(checked.records for _, checked in results),
+        problems=problems,
+        settings=settings,
+        deck=_kept([checked for archive, checked in results if not archive], deck),
+        archive=_kept([checked for archive, checked in results if archive], archived),
+    )
+
+
+def _read_json(path: Path, problems: list[Problem], repair: str):
+    """Parse a (possibly compressed) JSON file, or report it and return None."""
+    try:
+        return json.loads(read_bytes(path))
+    except Exception as e:
+        problems.append(Problem(path.name, None, f"unreadable: {e}", repair))
+        return None
+
+
+def _is_names(value) -> bool:
+    return isinstance(value, list) and all(isinstance(name, str) for name in value)
+
+
+def _record_tasks(archive: bool, source: str, records, problems: list[Problem]) -> list[tuple]:
+    """Split a file's inline card records into chunks to check."""
+    if not isinstance(records, list):
+        problems.append(Problem(source, None, "cards is not a list", "its cards are lost"))
+        return []
+    return [
+        (archive, _check_records, (source, records[i:i + SEGMENT_SIZE], i))
+        for i in range(0, len(records), SEGMENT_SIZE)
+    ]
+
+
+def _run(tasks: list[tuple], workers: Optional[int]) -> list[tuple[bool, _Checked]]:
+    """Run check tasks, in a process pool if there are enough of them."""
+    if workers == 1 or len(tasks) < PARALLEL_MIN_CHUNKS:
+        return [(archive, function(*args)) for archive, function, args in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [(archive, pool.submit(function, *args)) for archive, function, args in tasks]
+        return [(archive, future.result()) for archive, future in futures]
+
+
+def _check_segment(directory: Path, name: str) -> _Checked:
+    """Read and check one segment file (in a worker process)."""
+    try:
+        records = json.loads(read_bytes(directory / name))
+    except FileNotFoundError:
+        return _Checked(name, problems=[Problem(name, None, "segment file missing", "its cards are lost")])
+    except Exception as e:
+        return _Checked(name, problems=[Problem(name, None, f"unreadable: {e}", "its cards are lost")])
+    if not isinstance(records, list):
+        return _Checked(name, problems=[Problem(name, None, "not a list of cards", "its cards are lost")])
+    return _check_records(name, records)
+
+
+def _check_records(source: str, records: list, offset: int = 0) -> _Checked:
+    """Validate and check card records (in a worker process).
+
+    Args:
+        source: Name of the file holding the records
+        records: Parsed JSON card records
+        offset: Position of the first record in the file
+    """
+    checked = _Checked(source, records=len(records))
+    cards = []
+    for position, record in enumerate(records, offset):
+        try:
+            card = FlashCard.model_validate(record)
+        except ValidationError as e:
+            card_id = record.get("id") if isinstance(record, dict) else None
+            checked.problems.append(Problem(
+                source, position, f"invalid card: {_describe(e)}", "card dropped",
+                card_id if isinstance(card_id, str) else None
+            ))
+            continue
+        card, found = check_card(card)
+        for message, repair in found:
+            checked.problems.append(Problem(source, position, message, repair, str(card.id)))
+        checked.keys.append((position, card.id.bytes, card.version))
+        cards.append(card)
+    checked.cards = _CARDS.dump_json(cards)
+    return checked
+
+
+def _unique(chunks: list[_Checked], problems: list[Problem]) -> dict[bytes, tuple[_Checked, int]]:
+    """Choose one copy of each card ID in some chunks.
+
+    The copy with the highest version wins (the first on a tie); the
+    others are reported.
+
+    Returns:
+        (chunk, index in its keys) of the kept copy, by card ID
+    """
+    kept: dict[bytes, tuple[_Checked, int]] = {}
+    for checked in chunks:
+        for i, (_, card_id, version) in enumerate(checked.keys):
+            other = kept.get(card_id)
+            if other is None:
+                kept[card_id] = (checked, i)
+                continue
+            loser = (checked, i)
+            if version > other[0].keys[other[1]][2]:
+                kept[card_id], loser = loser, other
+            winner, at = kept[card_id]
+            problems.append(Problem(
+                loser[0].source, loser[0].keys[loser[1]][0],
+                f"duplicate id (kept the copy at {winner.source} #{winner.keys[at][0]})",
+                "copy dropped", str(UUID(bytes=card_id))
+            ))
+    return kept
+
+
+def _kept(chunks: list[_Checked], kept: dict[bytes, tuple[_Checked, int]]) -> list[tuple[_Checked, list[int]]]:
+    """Pair each chunk with the indexes of its kept copies."""
+    indexes: dict[int, list[int]] = {id(checked): [] for checked in chunks}
+    for checked, i in kept.values():
+        indexes[id(checked)].append(i)
+    return [(checked, sorted(indexes[id(checked)])) for checked in chunks]
+
+
+def _describe(error: ValidationError) -> str:
+    """Summarize a validation error on one line."""
+    parts = []
+    for item in error.errors():
+        loc = ".".join(str(p) for p in item["loc"])
+        parts.append(f"{loc}: {item['msg']}" if loc else item["msg"])
+    return "; ".join(parts)
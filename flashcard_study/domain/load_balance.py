@@ -0,0 +1,226 @@
+"""Load balancing of review dates.
+
+SM-2 gives every card reviewed in a session with the same score and
+interval the same next review day, so a bulk import turns into a spike
+of reviews that echoes through later sessions. When a deck enables
+load balancing, each new due date may move a few days (its fuzz window,
+which grows with the interval) to the least-loaded day in the window,
+preferring the day closest to the one SM-2 chose.
+
+Due counts per day are kept in a DueHistogram, built once from the deck
+(or its schedule index) and updated as reviews are applied, so placing
+a review takes O(log days) rather than a scan of the deck.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from ..data.models import FlashCard
+from ..data.repository import FlashCardRepository
+from ..data.schedule_index import from_micros
+
+# Fuzz window (days either side) is this fraction of the interval...
+FUZZ_FRACTION = 0.1
+# ...but at least one day, and at most this many
+MAX_FUZZ_DAYS = 7
+# Intervals shorter than this are never moved
+MIN_FUZZ_INTERVAL = 2.0
+
+# Days after the histogram's start that are tracked; reviews due later
+# are neither counted nor moved
+HORIZON_DAYS = 4096
+
+
+def fuzz_days(interval_days: float) -> int:
+    """How many days either side of its due day a review may move."""
+    if interval_days < MIN_FUZZ_INTERVAL:
+        return 0
+    return min(MAX_FUZZ_DAYS, max(1, round(interval_days * FUZZ_FRACTION)))
+
+
+class DueHistogram:
+    """Cards due per day, with O(log days) updates and least-loaded queries.
+
+    Counts live in the leaves of a segment tree over HORIZON_DAYS days
+    from `start`; each inner node holds the minimum of its children.
+    Cards due before `start` count towards `start`.
+    """
+
+    def __init__(self, start: date, days: Iterable[date] = ()):
+        """Initialize histogram.
+
+        Args:
+            start: First day tracked (normally today)
+            days: Due day of every card
+        """
+        self.start = start
+        self._size = HORIZON_DAYS
+        tree = [0] * (2 * self._size)
+        for day in days:
+            i = self._index(day)
+            if i is not None:
+                tree[self._size + i] += 1
+        for node in range(self._size - 1, 0, -1):
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+        self._tree = tree
+
+    def _index(self, day: date) -> Optional[int]:
+        i = max(0, (day - self.start).days)
+        return i if i < self._size else None
+
+    def count(self, day: date) -> int:
+        """Cards due on a day."""
+        i = self._index(day)
+        return 0 if i is None else self._tree[self._size + i]
+
+    def add(self, day: date, n: int = 1) -> None:
+        """Count `n` more cards due on a day (fewer if negative, never below 0)."""
+        i = self._index(day)
+        if i is None:
+            return
+        node = self._size + i
+        tree = self._tree
+        tree[node] = max(0, tree[node] + n)
+        node //= 2
+        while node:
+            tree[node] = min(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+
+    def remove(self, day: date) -> None:
+        """Count one card fewer due on a day."""
+        self.add(day, -1)
+
+    def least_loaded(self, first: date, last: date, near: date) -> date:
+        """The day in [first, last] with the fewest cards due.
+
+        Ties go to the day closest to `near` (the earlier one if equally
+        close). Days beyond the horizon are never chosen. A window that
+        starts before the histogram does isn't tracked day by day (earlier
+        cards count towards `start`), so `near` is returned unchanged.
+
+        Args:
+            first: First day of the window
+            last: Last day of the window (inclusive)
+            near: Preferred day, within the window
+        """
+        if first < self.start:
+            return near
+        lo, hi, mid = self._index(first), self._index(last), self._index(near)
+        if lo is None or mid is None:
+            return near
+        if hi is None:
+            hi = self._size - 1
+        least = self._min(lo, hi)
+        before = self._find(1, 0, self._size - 1, lo, mid, least, last=True)
+        after = self._find(1, 0, self._size - 1, mid, hi, least, last=False)
+        candidates = [i for i in (before, after) if i is not None]
+        best = min(candidates, key=lambda i: (abs(i - mid), i))
+        return self.start + timedelta(days=best)
+
+    def _min(self, lo: int, hi: int) -> int:
+        """Minimum count over leaves lo..hi."""
+        tree = self._tree
+        least = tree[self._size + lo]
+        lo += self._size
+        hi += self._size + 1
+        while lo < hi:
+            if lo & 1:
+                least = min(least, tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                least = min(least, tree[hi])
+            lo //= 2
+            hi //= 2
+        return least
+
+    def _find(self, node: int, node_lo: int, node_hi: int, lo: int, hi: int, value: int, last: bool) -> Optional[int]:
+        """First (or last) leaf in lo..hi whose count is at most `value`."""
+        if node_hi < lo or hi < node_lo or self._tree[node] > value:
+            return None
+        if node_lo == node_hi:
+            return node_lo
+        middle = (node_lo + node_hi) // 2
+        halves = [(2 * node, node_lo, middle), (2 * node + 1, middle + 1, node_hi)]
+        for child, child_lo, child_hi in reversed(halves) if last else halves:
+            found = self._find(child, child_lo, child_hi, lo, hi, value, last)
+            if found is not None:
+                return found
+        return None
+
+
+class LoadBalancer:
+    """Moves new due dates to lightly loaded days (see module docstring)."""
+
+    def __init__(self, histogram: DueHistogram):
+        """Initialize balancer.
+
+        Args:
+            histogram: Due days of every card in the deck
+        """
+        self.histogram = histogram
+
+    @classmethod
+    def from_cards(cls, cards: Iterable[FlashCard], now: Optional[datetime] = None) -> "LoadBalancer":
+        """Build a balancer from every card of a deck, archived ones included."""
+        if now is None:
+            now = datetime.now()
+        return cls(DueHistogram(now.date(), (card.next_review.date() for card in cards)))
+
+    @classmethod
+    def for_repository(
+        cls,
+        repository: FlashCardRepository,
+        now: Optional[datetime] = None
+    ) -> Optional["LoadBalancer"]:
+        """Build a balancer for a deck, if the deck has load balancing on.
+
+        Due days are read from the schedule index when it is current, so
+        no card has to be loaded.
+
+        Returns:
+            LoadBalancer, or None if the deck doesn't balance its reviews
+        """
+        if now is None:
+            now = datetime.now()
+        if not repository.settings().load_balance:
+            return None
+        index = repository.schedule_index()
+        if index is None:
+            return cls.from_cards(repository.all_cards(repository.load()), now)
+        days = (from_micros(record[1]).date() for record in index.records())
+        return cls(DueHistogram(now.date(), days))
+
+    def place(
+        self,
+        previous: datetime,
+        due: datetime,
+        interval_days: float,
+        review_time: datetime
+    ) -> tuple[datetime, float]:
+        """Choose the due date of a review and count it in the histogram.
+
+        Args:
+            previous: The card's due date before the review
+            due: Due date chosen by SM-2
+            interval_days: Interval chosen by SM-2
+            review_time: When the review occurred
+
+        Returns:
+            (due date, interval days), moved by whole days to the least
+            loaded day of the fuzz window, but never to the review's own
+            day or earlier. Reviews whose window starts before the
+            histogram (e.g. reviews recorded with a past timestamp) are
+            not moved.
+        """
+        self.histogram.remove(previous.date())
+        fuzz = fuzz_days(interval_days)
+        if fuzz:
+            target = due.date()
+            first = max(target - timedelta(days=fuzz), review_time.date() + timedelta(days=1))
+            day = self.histogram.least_loaded(first, target + timedelta(days=fuzz), target)
+            shift = (day - target).days
+            due += timedelta(days=shift)
+            interval_days += shift
+        self.histogram.add(due.date())
+        return due, interval_days
@@ -0,0 +1,553 @@
+"""Card query language.
+
+A query combines terms with AND, OR, NOT and parentheses; adjacent
+terms are ANDed. Keywords are case-insensitive.
+
+    tag:python          Cards tagged python (tag:python::* for the subtree)
+    type:cloze          Card type (qa, cloze, multiple_choice)
+    is:new / is:due     Never reviewed / due now
+    ease<2.0            Ease factor; also <=, >, >=, =, !=
+    interval>=30        Interval in days
+    reviews>10          Number of reviews
+    due<7d              Next review within 7 days (h, d or w; d if omitted)
+    text:heap, heap     Question, answer or tags has a word starting with heap
+
+Example: tag:python AND NOT tag:legacy AND ease<2.0 AND due<7d
+
+Queries are planned before they run. Over a deck on disk, every term
+except text can be checked against the schedule index, so only the
+segments holding matching cards are loaded; the term matching the
+fewest records in a sample is tested first and the others only on the
+records it passes. Over cards in memory, the
+most selective term that a TagIndex or SearchIndex can answer picks the
+candidates, and the remaining terms are checked on those cards only.
+QueryPlan.explain() describes the chosen plan.
+"""
+
+import operator
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from ..data.models import FlashCard
+from ..data.repository import FlashCardRepository
+from ..data.schedule_index import ARCHIVED, CARD_TYPES, NEVER, ScheduleIndex, to_micros
+from .search import SearchIndex, tokenize
+from .tag_index import TagIndex, TagQuery
+
+
+class QueryError(ValueError):
+    """Raised when a query can't be parsed."""
+
+
+_OPERATORS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt,
+    ">=": operator.ge, "=": operator.eq, "!=": operator.ne,
+}
+
+# Comparable field -> FlashCard attribute
+_FIELDS = {
+    "ease": "ease_factor",
+    "interval": "interval_days",
+    "reviews": "review_count",
+    "due": "next_review",
+}
+
+# Positions of fields in a schedule index record
+_RECORD_FIELDS = {"ease_factor": 3, "interval_days": 4, "review_count": 5}
+
+_UNITS = {"h": timedelta(hours=1), "d": timedelta(days=1), "w": timedelta(weeks=1)}
+
+# Schedule index records per file sampled to estimate how selective a term is
+SELECTIVITY_SAMPLE = 256
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<paren>[()])
+      | (?P<field>[A-Za-z_]+)\s*(?P<op><=|>=|!=|<|>|=)\s*(?P<number>-?\d+(?:\.\d+)?)(?P<unit>[A-Za-z]?)
+      | (?P<word>(?:[^\s()"]+|"[^"]*")+)
+    )""", re.VERBOSE)
+
+
+# Terms
+
+class Term:
+    """A query node. Subclasses are immutable dataclasses."""
+
+    def matches(self, card: FlashCard, now: datetime) -> bool:
+        """Whether a card satisfies the term."""
+        raise NotImplementedError
+
+    def record_test(self, index: ScheduleIndex, now: datetime) -> Optional[Callable[[tuple], bool]]:
+        """Return a test of schedule index records, or None if the index can't answer."""
+        return None
+
+
+@dataclass(frozen=True)
+class TagTerm(Term):
+    tag: str  # May end in ::* for a subtree
+
+    def matches(self, card, now):
+        return TagQuery([self.tag]).matches(card.tags)
+
+    def record_test(self, index, now):
+        masks = index.tag_masks([self.tag])
+        if masks is None:
+            return None
+        deck_mask, archive_mask = masks
+        return lambda r: bool(r[8] & (archive_mask if r[9] == ARCHIVED else deck_mask))
+
+    def __str__(self):
+        return f"tag:{self.tag}"
+
+
+@dataclass(frozen=True)
+class TypeTerm(Term):
+    type: str
+
+    def matches(self, card, now):
+        return card.type == self.type
+
+    def record_test(self, index, now):
+        code = CARD_TYPES.index(self.type)
+        return lambda r: r[10] == code
+
+    def __str__(self):
+        return f"type:{self.type}"
+
+
+@dataclass(frozen=True)
+class StateTerm(Term):
+    state: str  # "new" or "due"
+
+    def matches(self, card, now):
+        if self.state == "new":
+            return card.last_reviewed is None
+        return card.next_review <= now
+
+    def record_test(self, index, now):
+        if self.state == "new":
+            return lambda r: r[2] == NEVER
+        now_us = to_micros(now)
+        return lambda r: r[1] <= now_us
+
+    def __str__(self):
+        return f"is:{self.state}"
+
+
+@dataclass(frozen=True)
+class CompareTerm(Term):
+    field: str  # FlashCard attribute
+    op: str
+    value: float  # Days from now for next_review
+
+    def _compare(self) -> Callable:
+        return _OPERATORS[self.op]
+
+    def matches(self, card, now):
+        if self.field == "next_review":
+            return self._compare()(card.next_review, now + timedelta(days=self.value))
+        return self._compare()(getattr(card, self.field), self.value)
+
+    def record_test(self, index, now):
+        compare = self._compare()
+        if self.field == "next_review":
+            limit = to_micros(now + timedelta(days=self.value))
+            return lambda r: compare(r[1], limit)
+        position = _RECORD_FIELDS[self.field]
+        value = self.value
+        return lambda r: compare(r[position], value)
+
+    def __str__(self):
+        name = next(k for k, v in _FIELDS.items() if v == self.field)
+        value = f"{self.value:g}d" if self.field == "next_review" else f"{self.value:g}"
+        return f"{name}{self.op}{value}"
+
+
+@dataclass(frozen=True)
+class TextTerm(Term):
+    words: tuple[str, ...]  # Each must start a word of the question, answer or tags
+
+    def matches(self, card, now):
+        tokens = tokenize(" ".join([card.question, card.answer, *card.tags]))
+        return all(any(t.startswith(w) for t in tokens) for w in self.words)
+
+    def __str__(self):
+        return f'text:"{" ".join(self.words)}"' if len(self.words) > 1 else f"text:{self.words[0]}"
+
+
+@dataclass(frozen=True)
+class Not(Term):
+    term: Term
+
+    def matches(self, card, now):
+        return not self.term.matches(card, now)
+
+    def record_test(self, index, now):
+        test = self.term.record_test(index, now)
+        return None if test is None else (lambda r: not test(r))
+
+    def __str__(self):
+        return f"NOT {_wrap(self.term)}"
+
+
+@dataclass(frozen=True)
+class And(Term):
+    terms: tuple[Term, ...]
+
+    def matches(self, card, now):
+        return all(t.matches(card, now) for t in self.terms)
+
+    def record_test(self, index, now):
+        tests = [t.record_test(index, now) for t in self.terms]
+        if any(test is None for test in tests):
+            return None
+        return lambda r: all(test(r) for test in tests)
+
+    def __str__(self):
+        return " AND ".join(_wrap(t) for t in self.terms)
+
+
+@dataclass(frozen=True)
+class Or(Term):
+    terms: tuple[Term, ...]
+
+    def matches(self, card, now):
+        return any(t.matches(card, now) for t in self.terms)
+
+    def record_test(self, index, now):
+        tests = [t.record_test(index, now) for t in self.terms]
+        if any(test is None for test in tests):
+            return None
+        return lambda r: any(test(r) for test in tests)
+
+    def __str__(self):
+        return " OR ".join(_wrap(t) for t in self.terms)
+
+
+def _wrap(term: Term) -> str:
+    return f"({term})" if isinstance(term, (And, Or)) else str(term)
+
+
+# Parsing
+
+def parse_query(text: str) -> Term:
+    """Parse a query.
+
+    Args:
+        text: Query text (see the module docstring for the syntax)
+
+    Returns:
+        The query's root term
+
+    Raises:
+        QueryError: If the query is empty or malformed
+    """
+    tokens = _tokenize(text)
+    if not tokens:
+        raise QueryError("Empty query")
+    parser = _Parser(tokens)
+    term = parser.parse_or()
+    if parser.peek() is not None:
+        raise QueryError(f"Unexpected {parser.peek()[1]!r}")
+    return term
+
+
+def _tokenize(text: str) -> list[tuple[str, object]]:
+    """Split a query into (kind, value) tokens."""
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise QueryError(f"Can't parse query at {text[position:].strip()!r}")
+        position = match.end()
+        if match["paren"]:
+            tokens.append((match["paren"], match["paren"]))
+        elif match["field"]:
+            tokens.append(("term", _compare_term(match)))
+        else:
+            word = match["word"]
+            if word.upper() in ("AND", "OR", "NOT"):
+                tokens.append((word.upper(), word))
+            else:
+                tokens.append(("term", _word_term(word)))
+    return tokens
+
+
+def _compare_term(match: re.Match) -> Term:
+    name = match["field"].lower()
+    field = _FIELDS.get(name)
+    if field is None:
+        raise QueryError(f"Unknown field {name!r} (use {', '.join(_FIELDS)})")
+    value = float(match["number"])
+    unit = match["unit"].lower()
+    if field == "next_review":
+        if unit and unit not in _UNITS:
+            raise QueryError(f"Unknown unit {unit!r} in {match.group().strip()!r} (use h, d or w)")
+        value = value * (_UNITS[unit or "d"] / timedelta(days=1))
+    elif unit:
+        raise QueryError(f"{name} takes a plain number, got {match.group().strip()!r}")
+    return CompareTerm(field, match["op"], value)
+
+
+def _word_term(word: str) -> Term:
+    if any(c in word for c in "<>="):
+        raise QueryError(f"Can't parse comparison {word!r} (e.g. ease<2.0, due<7d)")
+    key, sep, value = word.partition(":")
+    key = key.lower()
+    if not sep or key not in ("tag", "type", "is", "text"):
+        return _text_term(word)
+    value = value.strip('"')
+    if not value:
+        raise QueryError(f"{key}: needs a value")
+    if key == "tag":
+        return TagTerm(value)
+    if key == "type":
+        if value not in CARD_TYPES:
+            raise QueryError(f"Unknown card type {value!r} (use {', '.join(CARD_TYPES)})")
+        return TypeTerm(value)
+    if key == "is":
+        if value not in ("new", "due"):
+            raise QueryError(f"Unknown state is:{value} (use is:new or is:due)")
+        return StateTerm(value)
+    return _text_term(value)
+
+
+def _text_term(text: str) -> Term:
+    words = tuple(tokenize(text.strip('"')))
+    if not words:
+        raise QueryError(f"No words to search for in {text!r}")
+    return TextTerm(words)
+
+
+class _Parser:
+    """Recursive descent over tokens: OR binds loosest, then AND, then NOT."""
+
+    def __init__(self, tokens: list[tuple[str, object]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self) -> Optional[tuple[str, object]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> tuple[str, object]:
+        token = self.peek()
+        if token is None:
+            raise QueryError("Query ends unexpectedly")
+        self.position += 1
+        return token
+
+    def parse_or(self) -> Term:
+        terms = [self.parse_and()]
+        while self.peek() and self.peek()[0] == "OR":
+            self.take()
+            terms.append(self.parse_and())
+        return terms[0] if len(terms) == 1 else Or(tuple(terms))
+
+    def parse_and(self) -> Term:
+        terms = [self.parse_not()]
+        while self.peek() and self.peek()[0] not in ("OR", ")"):
+            if self.peek()[0] == "AND":
+                self.take()
+            terms.append(self.parse_not())
+        return terms[0] if len(terms) == 1 else And(tuple(terms))
+
+    def parse_not(self) -> Term:
+        if self.peek() and self.peek()[0] == "NOT":
+            self.take()
+            return Not(self.parse_not())
+        kind, value = self.take()
+        if kind == "term":
+            return value
+        if kind == "(":
+            term = self.parse_or()
+            if self.take()[0] != ")":
+                raise QueryError("Missing ')'")
+            return term
+        raise QueryError(f"Unexpected {value!r}")
+
+
+# Planning
+
+@dataclass
+class QueryPlan:
+    """How a query will run, and a way to run it."""
+    query: Term
+    steps: list[str]
+    run: Callable[[], list[FlashCard]]
+
+    def explain(self) -> str:
+        """Describe the plan, one step per line."""
+        return "\n".join(f"{i}. {step}" for i, step in enumerate(self.steps, 1))
+
+
+def plan_cards(
+    query: Term,
+    cards: list[FlashCard],
+    now: Optional[datetime] = None,
+    tag_index: Optional[TagIndex] = None,
+    search_index: Optional[SearchIndex] = None
+) -> QueryPlan:
+    """Plan a query over cards in memory.
+
+    If the query is a term or an AND of terms, the term the given indexes
+    can answer with the fewest cards picks the candidates and the other
+    terms are checked on those cards only. An OR whose every branch is
+    answerable by an index is answered as the union. Anything else scans
+    every card.
+
+    Args:
+        query: Parsed query
+        cards: Cards to query
+        now: Current time (defaults to datetime.now())
+        tag_index: TagIndex over `cards`, if one is at hand
+        search_index: SearchIndex over `cards`, if one is at hand
+
+    Returns:
+        QueryPlan whose run() returns matching cards in their given order
+    """
+    if now is None:
+        now = datetime.now()
+    lookup = _IndexLookup(tag_index, search_index)
+
+    terms = list(query.terms) if isinstance(query, And) else [query]
+    candidates = [(ids, source, term) for term in terms for ids, source in [lookup(term)] if ids is not None]
+    if not candidates:
+        steps = [f"Scan {len(cards)} cards for {query}"]
+        return QueryPlan(query, steps, lambda: [c for c in cards if query.matches(c, now)])
+
+    ids, source, driver = min(candidates, key=lambda c: len(c[0]))
+    rest = [term for term in terms if term is not driver]
+    steps = [f"Look up {driver} in the {source}: {len(ids)} of {len(cards)} cards"]
+    for term in rest:
+        steps.append(f"Check {term} on those cards")
+
+    def run() -> list[FlashCard]:
+        return [
+            card for card in cards
+            if card.id in ids and all(term.matches(card, now) for term in rest)
+        ]
+    return QueryPlan(query, steps, run)
+
+
+class _IndexLookup:
+    """Answers terms from in-memory indexes, returning matching card IDs."""
+
+    def __init__(self, tag_index: Optional[TagIndex], search_index: Optional[SearchIndex]):
+        self.tag_index = tag_index
+        self.search_index = search_index
+
+    def __call__(self, term: Term) -> tuple[Optional[set[UUID]], str]:
+        if isinstance(term, TagTerm) and self.tag_index is not None:
+            return {card.id for card in self.tag_index.cards_for([term.tag])}, "tag index"
+        if isinstance(term, TextTerm) and self.search_index is not None:
+            results = self.search_index.search(" ".join(term.words), limit=0)
+            return {card_id for card_id, _ in results}, "search index"
+        if isinstance(term, Or):
+            found = set()
+            sources = []
+            for branch in term.terms:
+                ids, source = self(branch)
+                if ids is None:
+                    return None, ""
+                found |= ids
+                sources.append(source)
+            return found, " and ".join(dict.fromkeys(sources))
+        return None, ""
+
+
+def plan_repository(
+    query: Term,
+    repository: FlashCardRepository,
+    now: Optional[datetime] = None,
+    include_archived: bool = True
+) -> QueryPlan:
+    """Plan a query over a deck on disk.
+
+    When the deck's schedule index is current, every part of the query it
+    can answer (all but text terms) is checked against its records
+    without loading any card. Those terms are ordered by how many
+    records of a sample they match: the most selective one, typically a
+    tag or a due range, is tested on every record and the rest only on
+    the records it passes. Only the segments holding matching cards are
+    then loaded, and any text terms are checked on those cards.
+    Otherwise the deck is loaded and the query scans every card; so does
+    run() if a save removed the segments since the plan was made.
+
+    Args:
+        query: Parsed query
+        repository: Deck to query
+        now: Current time (defaults to datetime.now())
+        include_archived: Also match cards in the cold-tier archive
+
+    Returns:
+        QueryPlan whose run() returns matching cards
+    """
+    if now is None:
+        now = datetime.now()
+
+    index = repository.schedule_index()
+    terms = list(query.terms) if isinstance(query, And) else [query]
+    tests = [] if index is None else [(term, term.record_test(index, now)) for term in terms]
+    indexed = [(term, test) for term, test in tests if test is not None]
+
+    def load() -> list[FlashCard]:
+        database = repository.load()
+        cards = repository.all_cards(database) if include_archived else database.cards
+        return [card for card in cards if query.matches(card, now)]
+
+    if not indexed:
+        reason = "no schedule index" if index is None else "no term can be checked in the schedule index"
+        return QueryPlan(query, [f"Load the deck ({reason})", f"Scan every card for {query}"], load)
+
+    sample = [r for r in index.sample(SELECTIVITY_SAMPLE) if include_archived or r[9] != ARCHIVED]
+    indexed.sort(key=lambda pair: sum(1 for r in sample if pair[1](r)))
+
+    # Scanning records is cheap, so do it now and explain with real counts
+    (driver_term, driver), filters = indexed[0], [test for _, test in indexed[1:]]
+    total = candidates = 0
+    records = []
+    for record in index.records():
+        if include_archived or record[9] != ARCHIVED:
+            total += 1
+            if driver(record):
+                candidates += 1
+                if all(test(record) for test in filters):
+                    records.append(record)
+    needed, segments = index.segments_for(records)
+    archived = sum(1 for r in records if r[9] == ARCHIVED)
+
+    rest = [term for term in terms if all(term is not t for t, _ in indexed)]
+    steps = [f"Scan the schedule index for {driver_term}: {candidates} of {total} cards"]
+    if filters:
+        checked = [term for term, _ in indexed[1:]]
+        steps.append(
+            f"Check {checked[0] if len(checked) == 1 else And(tuple(checked))} on those records: "
+            f"{len(records)} cards"
+        )
+    loading = f"Load {needed} of {segments} segments"
+    steps.append(loading + (f" and the archive ({archived} archived cards)" if archived else ""))
+    for term in rest:
+        steps.append(f"Check {term} on those cards")
+
+    def run() -> list[FlashCard]:
+        try:
+            cards = index.fetch(records)
+        except OSError:
+            # Saved since the plan was made: a segment may have been collected
+            return load()
+        return [card for card in cards if all(term.matches(card, now) for term in rest)]
+    return QueryPlan(query, steps, run)
+
+
+def filter_query(cards: Iterable[FlashCard], query: Optional[Term], now: Optional[datetime] = None) -> list[FlashCard]:
+    """Return the cards matching a query (all cards if there is none)."""
+    if query is None:
+        return list(cards)
+    if now is None:
+        now = datetime.now()
+    return [card for card in cards if query.matches(card, now)]
@@ -0,0 +1,158 @@
+"""Full-text search over card questions, answers and tags."""
+
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Iterable
+from uuid import UUID
+
+from ..data.models import FlashCard
+
+# Relative weight of a token occurrence in each field
+FIELD_WEIGHTS = {"question": 2.0, "tags": 1.5, "answer": 1.0}
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens in order of appearance
+    """
+    return _TOKEN.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted index with prefix matching and TF-IDF ranking.
+
+    Postings map each token to the weighted term frequency per card. A
+    sorted vocabulary lets prefix queries find matching tokens with a
+    binary search instead of scanning every token. Cards are numbered
+    internally so postings are keyed by int rather than UUID, which is
+    much cheaper to hash.
+    """
+
+    def __init__(self, cards: Iterable[FlashCard] = ()):
+        """Initialize index from cards.
+
+        Args:
+            cards: Cards to index
+        """
+        self._postings: dict[str, dict[int, float]] = defaultdict(dict)
+        self._card_tokens: dict[int, list[str]] = {}
+        self._doc_ids: dict[UUID, int] = {}
+        self._card_ids: list[UUID] = []
+        self._vocabulary: list[str] = []
+        for card in cards:
+            self.add(card)
+
+    def __len__(self) -> int:
+        return len(self._card_tokens)
+
+    def add(self, card: FlashCard) -> None:
+        """Index a card, replacing any previous version of it.
+
+        Args:
+            card: FlashCard to index
+        """
+        self.remove(card.id)
+        doc = self._doc_ids.get(card.id)
+        if doc is None:
+            doc = self._doc_ids[card.id] = len(self._card_ids)
+            self._card_ids.append(card.id)
+
+        weights: dict[str, float] = defaultdict(float)
+        for field, weight in FIELD_WEIGHTS.items():
+            text = " ".join(card.tags) if field == "tags" else getattr(card, field)
+            for token in tokenize(text):
+                weights[token] += weight
+
+        for token, weight in weights.items():
+            postings = self._postings[token]
+            if not postings:
+                insort(self._vocabulary, token)
+            postings[doc] = weight
+        self._card_tokens[doc] = list(weights)
+
+    def update(self, card: FlashCard) -> None:
+        """Re-index an edited card.
+
+        Args:
+            card: FlashCard with updated data
+        """
+        self.add(card)
+
+    def remove(self, card_id: UUID) -> None:
+        """Remove a card from the index if present.
+
+        Args:
+            card_id: UUID of the card to remove
+        """
+        doc = self._doc_ids.get(card_id)
+        for token in self._card_tokens.pop(doc, ()):
+            postings = self._postings[token]
+            del postings[doc]
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect_left(self._vocabulary, token)]
+
+    def search(self, query: str, limit: int = 50) -> list[tuple[UUID, float]]:
+        """Find cards matching every query term, best matches first.
+
+        Each term matches tokens that start with it, so partially typed
+        words still find results. Exact token matches score higher than
+        prefix matches.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results (0 = unlimited)
+
+        Returns:
+            List of (card_id, score), highest score first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+
+        total = len(self._card_tokens)
+        term_scores = []
+        for term in terms:
+            scores: dict[int, float] = defaultdict(float)
+            for token in self._expand(term):
+                postings = self._postings[token]
+                factor = math.log(1 + total / len(postings)) * (1.0 if token == term else 0.5)
+                for doc, weight in postings.items():
+                    scores[doc] += weight * factor
+            if not scores:
+                return []
+            term_scores.append(scores)
+
+        # AND across terms, starting from the most selective one
+        term_scores.sort(key=len)
+        results = term_scores[0]
+        for scores in term_scores[1:]:
+            results = {
+                doc: score + scores[doc]
+                for doc, score in results.items()
+                if doc in scores
+            }
+            if not results:
+                return []
+
+        if limit:
+            ranked = heapq.nlargest(limit, results.items(), key=lambda r: r[1])
+        else:
+            ranked = sorted(results.items(), key=lambda r: r[1], reverse=True)
+        return [(self._card_ids[doc], score) for doc, score in ranked]
+
+    def _expand(self, prefix: str) -> list[str]:
+        """Return all indexed tokens starting with prefix."""
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + "\U0010ffff", start)
+        return self._vocabulary[start:end]
@@ -0,0 +1,294 @@
+"""Near-duplicate card detection with MinHash and locality-sensitive hashing."""
+
+import base64
+import json
+import re
+import zlib
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+from uuid import UUID
+
+from ..data.models import FlashCard
+
+# Signature layout: NUM_BANDS bands of ROWS_PER_BAND hashes each. Two cards
+# become LSH candidates when any band matches exactly, which happens with
+# ~50% probability at Jaccard similarity (1/NUM_BANDS) ** (1/ROWS_PER_BAND).
+NUM_PERM = 64
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+
+SHINGLE_SIZE = 2  # words per shingle
+DEFAULT_THRESHOLD = 0.7
+
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_EMPTY = _MASK64
+_NON_WORD = re.compile(r"\W+")
+
+
+def shingles(card: FlashCard) -> set[int]:
+    """Hash the word shingles of a card's question and answer.
+
+    Args:
+        card: FlashCard to shingle
+
+    Returns:
+        Set of 64-bit shingle hashes
+    """
+    words = _NON_WORD.sub(" ", f"{card.question} {card.answer}".lower()).split()
+    if len(words) < SHINGLE_SIZE:
+        grams = {" ".join(words)}
+    else:
+        grams = {
+            " ".join(words[i:i + SHINGLE_SIZE])
+            for i in range(len(words) - SHINGLE_SIZE + 1)
+        }
+    # Spread the 32-bit CRC over 64 bits so bin and value bits are independent
+    return {(zlib.crc32(g.encode("utf-8")) * _GOLDEN) & _MASK64 for g in grams}
+
+
+def signature(card: FlashCard) -> array:
+    """Compute the MinHash signature of a card.
+
+    Uses one-permutation hashing: each shingle hash is assigned to one of
+    NUM_PERM bins and only the minimum per bin is kept, so signing is
+    linear in the number of shingles rather than shingles x permutations.
+    Empty bins are filled by rotation from the next non-empty bin.
+
+    Args:
+        card: FlashCard to sign
+
+    Returns:
+        Array of NUM_PERM unsigned 64-bit minimum hashes
+    """
+    bins = [_EMPTY] * NUM_PERM
+    for h in shingles(card):
+        b = h % NUM_PERM
+        v = h // NUM_PERM
+        if v < bins[b]:
+            bins[b] = v
+
+    filled = {i for i, v in enumerate(bins) if v != _EMPTY}
+    if len(filled) < NUM_PERM:
+        for i in range(NUM_PERM):
+            if bins[i] != _EMPTY:
+                continue
+            for step in range(1, NUM_PERM):
+                j = (i + step) % NUM_PERM
+                if j in filled:
+                    # Offset by distance so borrowed values don't collide
+                    # with genuine values in bin i
+                    bins[i] = (bins[j] + step * _GOLDEN) & _MASK64
+                    break
+    return array("Q", bins)
+
+
+def _sign_chunk(cards: list[FlashCard]) -> list[tuple[UUID, str, bytes]]:
+    """Sign a chunk of cards in a worker process."""
+    return [(c.id, c.content_hash(), signature(c).tobytes()) for c in cards]
+
+
+class SimilarityIndex:
+    """MinHash/LSH index for finding near-duplicate cards in sublinear time.
+
+    Signatures are cached in a sidecar file keyed by card ID and content
+    hash, so reopening the index only re-signs cards that were added or
+    edited since the last time it was saved.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD):
+        """Initialize an empty index.
+
+        Args:
+            threshold: Minimum estimated Jaccard similarity to report
+        """
+        self.threshold = threshold
+        self._signatures: dict[UUID, array] = {}
+        self._hashes: dict[UUID, str] = {}
+        self._buckets: dict[tuple[int, bytes], list[UUID]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def add(self, card: FlashCard, sig: Optional[array] = None) -> None:
+        """Index a card, replacing any previous version of it.
+
+        Args:
+            card: FlashCard to index
+            sig: Precomputed signature (computed if omitted)
+        """
+        digest = card.content_hash()
+        if self._hashes.get(card.id) == digest:
+            return
+        self.remove(card.id)
+        self._insert(card.id, digest, sig if sig is not None else signature(card))
+
+    def remove(self, card_id: UUID) -> None:
+        """Remove a card from the index if present.
+
+        Args:
+            card_id: UUID of the card to remove
+        """
+        sig = self._signatures.pop(card_id, None)
+        if sig is None:
+            return
+        del self._hashes[card_id]
+        for key in self._band_keys(sig):
+            bucket = self._buckets[key]
+            bucket.remove(card_id)
+            if not bucket:
+                del self._buckets[key]
+
+    def query(self, card: FlashCard) -> list[tuple[UUID, float]]:
+        """Find indexed cards that are near-duplicates of a card.
+
+        Args:
+            card: FlashCard to check (need not be indexed)
+
+        Returns:
+            List of (card_id, estimated similarity), most similar first
+        """
+        sig = self._signatures.get(card.id)
+        if sig is None or self._hashes.get(card.id) != card.content_hash():
+            sig = signature(card)
+        return self._matches(card.id, sig)
+
+    def clusters(self) -> list[list[UUID]]:
+        """Group all indexed cards into near-duplicate clusters.
+
+        Walks the LSH buckets rather than querying every card, comparing
+        bucket members against a representative and skipping pairs that
+        are already known to be in the same cluster.
+
+        Returns:
+            Clusters of two or more card IDs, largest first
+        """
+        parent: dict[UUID, UUID] = {}
+
+        def find(x: UUID) -> UUID:
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        for members in self._buckets.values():
+            pending = members
+            while len(pending) > 1:
+                rep, rest = pending[0], pending[1:]
+                rep_sig = self._signatures[rep]
+                pending = []
+                for other in rest:
+                    if find(other) == find(rep):
+                        continue
+                    if self._similarity(rep_sig, self._signatures[other]) >= self.threshold:
+                        parent[find(other)] = find(rep)
+                    else:
+                        pending.append(other)
+
+        groups: dict[UUID, list[UUID]] = defaultdict(list)
+        for card_id in list(parent):
+            groups[find(card_id)].append(card_id)
+
+        return sorted(
+            (g for g in groups.values() if len(g) > 1), key=len, reverse=True
+        )
+
+    def sync(self, cards: Iterable[FlashCard], workers: Optional[int] = 1) -> None:
+        """Bring the index in line with a deck, re-signing only changed cards.
+
+        Args:
+            cards: Current cards
+            workers: Processes to sign with (None = CPU count, 1 = in-process)
+        """
+        cards = list(cards)
+        current = {c.id for c in cards}
+        for card_id in [cid for cid in self._signatures if cid not in current]:
+            self.remove(card_id)
+
+        stale = [c for c in cards if self._hashes.get(c.id) != c.content_hash()]
+        if workers == 1 or len(stale) < 1000:
+            for card in stale:
+                self.add(card)
+            return
+
+        chunk_size = max(1, len(stale) // ((workers or 8) * 4))
+        chunks = [stale[i:i + chunk_size] for i in range(0, len(stale), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for results in pool.map(_sign_chunk, chunks):
+                for card_id, digest, raw in results:
+                    self.remove(card_id)
+                    self._insert(card_id, digest, array("Q", raw))
+
+    def save(self, path: Path) -> None:
+        """Write signatures to a sidecar cache file.
+
+        Args:
+            path: Cache file path
+        """
+        data = {
+            str(card_id): [self._hashes[card_id], base64.b64encode(sig.tobytes()).decode()]
+            for card_id, sig in self._signatures.items()
+        }
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"num_perm": NUM_PERM, "signatures": data}, f)
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, threshold: float = DEFAULT_THRESHOLD) -> "SimilarityIndex":
+        """Read signatures from a sidecar cache file.
+
+        A missing, unreadable or incompatible cache yields an empty index.
+
+        Args:
+            path: Cache file path
+            threshold: Minimum estimated Jaccard similarity to report
+        """
+        index = cls(threshold)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return index
+
+        if data.get("num_perm") != NUM_PERM:
+            return index
+
+        for card_id, (digest, encoded) in data.get("signatures", {}).items():
+            index._insert(UUID(card_id), digest, array("Q", base64.b64decode(encoded)))
+        return index
+
+    def _insert(self, card_id: UUID, digest: str, sig: array) -> None:
+        self._signatures[card_id] = sig
+        self._hashes[card_id] = digest
+        for key in self._band_keys(sig):
+            self._buckets[key].append(card_id)
+
+    def _matches(self, card_id: UUID, sig: array) -> list[tuple[UUID, float]]:
+        candidates = set()
+        for key in self._band_keys(sig):
+            candidates.update(self._buckets.get(key, ()))
+        candidates.discard(card_id)
+
+        matches = []
+        for other in candidates:
+            similarity = self._similarity(sig, self._signatures[other])
+            if similarity >= self.threshold:
+                matches.append((other, similarity))
+        matches.sort(key=lambda m: m[1], reverse=True)
+        return matches
+
+    @staticmethod
+    def _similarity(sig_a: array, sig_b: array) -> float:
+        """Estimate Jaccard similarity from two signatures."""
+        return sum(x == y for x, y in zip(sig_a, sig_b)) / NUM_PERM
+
+    @staticmethod
+    def _band_keys(sig: array) -> list[tuple[int, bytes]]:
+        raw = sig.tobytes()
+        width = ROWS_PER_BAND * sig.itemsize
+        return [(band, raw[band * width:(band + 1) * width]) for band in range(NUM_BANDS)]
@@ -4,7 +4,14 @@ This module implements the exact algorithm specified in the /quiz command.
 """
 
 from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from uuid import UUID
 from ..data.models import FlashCard, ReviewHistory
+from .load_balance import LoadBalancer
+
+# Bounds of the ease factor
+MIN_EASE = 1.3
+MAX_EASE = 3.0
 
 
 def calculate_next_review(
@@ -32,16 +39,16 @@ def calculate_next_review(
 
     if score == 0:
         interval_days = 1
-        ease_factor = max(1.3, ease_factor - 0.2)
+        ease_factor = max(MIN_EASE, ease_factor - 0.2)
     elif score < 1:
         interval_days = max(1, interval_days * score * ease_factor)
-        ease_factor = max(1.3, ease_factor - 0.1)
+        ease_factor = max(MIN_EASE, ease_factor - 0.1)
     else:  # score == 1
         if interval_days == 0:
             interval_days = 1
         else:
             interval_days = interval_days * ease_factor
-        ease_factor = min(3.0, ease_factor + 0.1)
+        ease_factor = min(MAX_EASE, ease_factor + 0.1)
 
     next_review = review_time + timedelta(days=interval_days)
     return interval_days, ease_factor, next_review
@@ -50,21 +57,49 @@ def calculate_next_review(
 def apply_review(
     card: FlashCard,
     score: float,
-    review_time: datetime
+    review_time: datetime,
+    balancer: Optional[LoadBalancer] = None
 ) -> FlashCard:
     """Create updated card after review (immutable pattern).
 
+    The new card gets a copy of the history with the review appended.
+    The copy stays small because saves compact every card's history to
+    the database's history_limit (on by default, see domain.history), so
+    a card holds at most that many entries plus the reviews since it
+    was last saved.
+
     Args:
         card: The flash card being reviewed
         score: Score from 0 to 1
         review_time: When the review occurred
+        balancer: Optional LoadBalancer that may move the next review
+            to a lightly loaded day nearby
 
     Returns:
         New FlashCard instance with updated spaced repetition metadata
     """
+    return _review(card, score, review_time, balancer, list(card.review_history))
+
+
+def _review(
+    card: FlashCard,
+    score: float,
+    review_time: datetime,
+    balancer: Optional[LoadBalancer],
+    history: list[ReviewHistory]
+) -> FlashCard:
+    """Review a card, appending the entry to `history` in place.
+
+    `history` becomes the new card's history, so it must be a list the
+    caller owns (not one shared with a card anyone else holds).
+    """
     interval_days, ease_factor, next_review = calculate_next_review(
         card, score, review_time
     )
+    if balancer is not None:
+        next_review, interval_days = balancer.place(
+            card.next_review, next_review, interval_days, review_time
+        )
 
     history_entry = ReviewHistory(
         date=review_time,
@@ -72,11 +107,52 @@ def apply_review(
         interval_days=interval_days
     )
 
+    history.append(history_entry)
+
     return card.model_copy(update={
         "last_reviewed": review_time,
         "next_review": next_review,
         "ease_factor": ease_factor,
         "interval_days": interval_days,
         "review_count": card.review_count + 1,
-        "review_history": card.review_history + [history_entry]
+        "review_history": history,
+        "version": card.version + 1
     })
+
+
+def apply_reviews(
+    cards: list[FlashCard],
+    reviews: Iterable[tuple[UUID, float, datetime]],
+    balancer: Optional[LoadBalancer] = None
+) -> tuple[list[FlashCard], int, list[UUID]]:
+    """Apply a batch of reviews in timestamp order, entirely in memory.
+
+    The input cards are left untouched: each reviewed card's history is
+    copied once, then appended to for every review it gets in the batch.
+
+    Args:
+        cards: All cards in the database
+        reviews: (card_id, score, review_time) records in any order
+        balancer: Optional LoadBalancer over the deck's due dates
+
+    Returns:
+        Tuple of (updated card list, reviews applied, unknown card IDs)
+    """
+    positions = {card.id: i for i, card in enumerate(cards)}
+    updated = list(cards)
+    applied = 0
+    unknown = []
+    histories: dict[int, list[ReviewHistory]] = {}
+
+    for card_id, score, review_time in sorted(reviews, key=lambda r: r[2]):
+        i = positions.get(card_id)
+        if i is None:
+            unknown.append(card_id)
+            continue
+        history = histories.get(i)
+        if history is None:
+            history = histories[i] = list(updated[i].review_history)
+        updated[i] = _review(updated[i], score, review_time, balancer, history)
+        applied += 1
+
+    return updated, applied, unknown
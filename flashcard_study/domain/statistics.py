@@ -1,9 +1,14 @@
 """Statistics calculation for flash cards."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from collections import defaultdict
-from ..data.models import FlashCard
+from typing import Optional
+from ..config import MASTERY_LEARNING_THRESHOLD
+from ..data.models import ArchiveSummary, FlashCard
+from ..data.schedule_index import ARCHIVED, NEVER, ScheduleIndex, to_micros
+from .history import review_days, review_totals
+from .tag_index import SUBTREE_SUFFIX, parent_counts, subtree_counts
 
 
 @dataclass
@@ -17,23 +22,39 @@ class Statistics:
     average_ease_factor: float
     mastery_distribution: dict[str, int]  # "new", "learning", "mastered"
     tag_distribution: dict[str, int]
+    retention_rate: float  # Share of all reviews not scored 0
+    # Cards with any tag in the subtree, for tags that have child tags
+    tag_subtrees: dict[str, int] = field(default_factory=dict)
+
+    def tag_count(self, query: str) -> int:
+        """Cards with a tag, or with any tag in a ``prefix::*`` subtree."""
+        if query.endswith(SUBTREE_SUFFIX):
+            prefix = query[:-len(SUBTREE_SUFFIX)]
+            return self.tag_subtrees.get(prefix, self.tag_distribution.get(prefix, 0))
+        return self.tag_distribution.get(query, 0)
 
 
 class StatisticsCalculator:
     """Calculates statistics from flash card data."""
 
     @staticmethod
-    def calculate(cards: list[FlashCard], now: datetime) -> Statistics:
+    def calculate(
+        cards: list[FlashCard],
+        now: datetime,
+        archive: Optional[ArchiveSummary] = None
+    ) -> Statistics:
         """Calculate comprehensive statistics.
 
         Args:
             cards: List of all flash cards
             now: Current time
+            archive: Aggregates of archived cards to merge in
 
         Returns:
             Statistics object with all calculated metrics
         """
-        total = len(cards)
+        archive = archive or ArchiveSummary()
+        total = len(cards) + archive.count
 
         if total == 0:
             return Statistics(
@@ -44,7 +65,8 @@ class StatisticsCalculator:
                 review_streak_days=0,
                 average_ease_factor=2.5,
                 mastery_distribution={"new": 0, "learning": 0, "mastered": 0},
-                tag_distribution={}
+                tag_distribution={},
+                retention_rate=0.0
             )
 
         today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -53,6 +75,9 @@ class StatisticsCalculator:
         # Count cards by due date
         due_today = sum(1 for c in cards if c.next_review <= now)
         due_week = sum(1 for c in cards if c.next_review <= week_end)
+        # Archived cards are counted by due day
+        due_today += archive.due_before(today_start.date() + timedelta(days=1))
+        due_week += archive.due_before(week_end.date())
 
         # Count cards reviewed today
         reviewed_today = sum(
@@ -61,26 +86,37 @@ class StatisticsCalculator:
         )
 
         # Mastery distribution
-        mastery = {"new": 0, "learning": 0, "mastered": 0}
+        mastery = {"new": 0, "learning": 0, "mastered": archive.count}
         for card in cards:
             if card.review_count == 0:
                 mastery["new"] += 1
-            elif card.review_count < 10:
+            elif card.review_count < MASTERY_LEARNING_THRESHOLD:
                 mastery["learning"] += 1
             else:
                 mastery["mastered"] += 1
 
-        # Tag distribution
-        tag_counts = defaultdict(int)
+        # Tag distribution, rolled up to parent tags
+        tag_counts = defaultdict(int, archive.tag_counts)
         for card in cards:
             for tag in card.tags:
                 tag_counts[tag] += 1
+        subtrees = defaultdict(int, _archive_subtrees(archive))
+        for prefix, n in subtree_counts((card.tags, 1) for card in cards).items():
+            subtrees[prefix] += n
 
         # Average ease factor
-        avg_ease = sum(c.ease_factor for c in cards) / total
+        avg_ease = (sum(c.ease_factor for c in cards) + archive.ease_total) / total
 
         # Streak calculation
-        streak = StatisticsCalculator._calculate_streak(cards, now)
+        streak = StatisticsCalculator._calculate_streak(cards, now, archive)
+
+        # Retention across raw and compacted history
+        reviews, lapses = archive.reviews, archive.lapses
+        for card in cards:
+            card_reviews, card_lapses = review_totals(card)
+            reviews += card_reviews
+            lapses += card_lapses
+        retention = (reviews - lapses) / reviews if reviews else 0.0
 
         return Statistics(
             total_cards=total,
@@ -90,29 +126,104 @@ class StatisticsCalculator:
             review_streak_days=streak,
             average_ease_factor=avg_ease,
             mastery_distribution=mastery,
-            tag_distribution=dict(tag_counts)
+            tag_distribution=dict(tag_counts),
+            retention_rate=retention,
+            tag_subtrees=parent_counts(subtrees)
         )
 
     @staticmethod
-    def _calculate_streak(cards: list[FlashCard], now: datetime) -> int:
+    def calculate_from_index(index: ScheduleIndex, now: datetime) -> Optional[Statistics]:
+        """Calculate the same statistics as calculate() from the schedule index.
+
+        Only the fixed-width index records are scanned; no card is loaded.
+
+        Args:
+            index: The deck's ScheduleIndex
+            now: Current time
+
+        Returns:
+            Statistics object, or None if the index can't count every tag
+        """
+        if not index.complete_tags:
+            return None
+
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        week_end = today_start + timedelta(days=7)
+        now_us = to_micros(now)
+        today_us = to_micros(today_start)
+        week_end_us = to_micros(week_end)
+        # Archived cards are counted by due day, as in calculate()
+        tomorrow_us = to_micros(today_start + timedelta(days=1))
+
+        total = due_today = due_week = reviewed_today = 0
+        ease_total = 0.0
+        reviews = lapses = 0
+        mastery = {"new": 0, "learning": 0, "mastered": 0}
+        for (_, next_review, last_reviewed, ease, _, review_count,
+             card_reviews, card_lapses, _, segment, _) in index.records():
+            total += 1
+            if segment == ARCHIVED:
+                due_today += next_review < tomorrow_us
+                due_week += next_review < week_end_us
+                mastery["mastered"] += 1
+            else:
+                due_today += next_review <= now_us
+                due_week += next_review <= week_end_us
+                reviewed_today += last_reviewed != NEVER and last_reviewed >= today_us
+                if review_count == 0:
+                    mastery["new"] += 1
+                elif review_count < MASTERY_LEARNING_THRESHOLD:
+                    mastery["learning"] += 1
+                else:
+                    mastery["mastered"] += 1
+            ease_total += ease
+            reviews += card_reviews
+            lapses += card_lapses
+
+        if total == 0:
+            return StatisticsCalculator.calculate([], now)
+
+        tag_counts, subtrees = index.count_tags()
+        review_dates = index.review_days()
+        streak = 0
+        current_date = now.date()
+        while current_date in review_dates:
+            streak += 1
+            current_date -= timedelta(days=1)
+
+        return Statistics(
+            total_cards=total,
+            cards_due_today=due_today,
+            cards_due_this_week=due_week,
+            cards_reviewed_today=reviewed_today,
+            review_streak_days=streak,
+            average_ease_factor=ease_total / total,
+            mastery_distribution=mastery,
+            tag_distribution=tag_counts,
+            retention_rate=(reviews - lapses) / reviews if reviews else 0.0,
+            tag_subtrees=parent_counts(subtrees)
+        )
+
+    @staticmethod
+    def _calculate_streak(
+        cards: list[FlashCard],
+        now: datetime,
+        archive: Optional[ArchiveSummary] = None
+    ) -> int:
         """Calculate consecutive days with reviews.
 
         Args:
             cards: List of all flash cards
             now: Current time
+            archive: Aggregates of archived cards
 
         Returns:
             Number of consecutive days with at least one review
         """
-        if not cards:
-            return 0
-
-        # Get all review dates
-        review_dates = set()
+        # Get all review dates, including compacted history and the archive
+        review_dates = set(archive.review_days) if archive else set()
         for card in cards:
-            for history in card.review_history:
-                review_date = history.date.date()
-                review_dates.add(review_date)
+            review_dates.update(review_days(card))
 
         if not review_dates:
             return 0
@@ -126,3 +237,94 @@ class StatisticsCalculator:
             current_date -= timedelta(days=1)
 
         return streak
+
+
+def _archive_subtrees(archive: ArchiveSummary) -> dict[str, int]:
+    """Subtree counts of archived cards.
+
+    Archives summarized before subtree counts were kept only have per-tag
+    counts; those are rolled up as if each card had a single tag.
+    """
+    if archive.tag_subtrees or not archive.tag_counts:
+        return archive.tag_subtrees
+    return subtree_counts(([tag], n) for tag, n in archive.tag_counts.items())
+
+
+class DashboardCounters:
+    """Dashboard counts that can be kept current card by card.
+
+    Built once from the deck, then adjusted with remove()/add() as cards
+    change, so a few changed cards don't require recounting every card.
+    Due and reviewed-today counts are relative to the time the counters
+    were built. Archived cards are counted from their summary, which is
+    replaced as a whole.
+    """
+
+    def __init__(
+        self,
+        cards: list[FlashCard],
+        now: datetime,
+        archive: Optional[ArchiveSummary] = None
+    ):
+        """Count cards.
+
+        Args:
+            cards: List of all flash cards
+            now: Current time
+            archive: Aggregates of archived cards
+        """
+        self.now = now
+        self.today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        self.set_archive(archive)
+        self._total = 0
+        self._due_today = 0
+        # Archived cards are never reviewed today (see is_cold)
+        self.reviewed_today = 0
+        # Number of cards reviewed on each day, for the streak
+        self._review_days: dict = defaultdict(int)
+        for card in cards:
+            self.add(card)
+
+    def set_archive(self, archive: Optional[ArchiveSummary]) -> None:
+        """Replace the archived cards' aggregates."""
+        self.archive = archive or ArchiveSummary()
+
+    @property
+    def total(self) -> int:
+        """Cards in the deck and the archive."""
+        return self._total + self.archive.count
+
+    @property
+    def due_today(self) -> int:
+        """Cards due now, including archived cards due today or earlier."""
+        return self._due_today + self.archive.due_before(self.today_start.date() + timedelta(days=1))
+
+    def add(self, card: FlashCard) -> None:
+        """Count a new or updated card."""
+        self._count(card, 1)
+
+    def remove(self, card: FlashCard) -> None:
+        """Stop counting a removed card, or the old version of an updated one."""
+        self._count(card, -1)
+
+    def _count(self, card: FlashCard, sign: int) -> None:
+        self._total += sign
+        if card.next_review <= self.now:
+            self._due_today += sign
+        if card.last_reviewed and card.last_reviewed >= self.today_start:
+            self.reviewed_today += sign
+        for day in review_days(card):
+            self._review_days[day] += sign
+            if not self._review_days[day]:
+                del self._review_days[day]
+
+    @property
+    def streak(self) -> int:
+        """Consecutive days with reviews, counting back from today."""
+        archived_days = set(self.archive.review_days)
+        streak = 0
+        current_date = self.now.date()
+        while current_date in self._review_days or current_date in archived_days:
+            streak += 1
+            current_date -= timedelta(days=1)
+        return streak
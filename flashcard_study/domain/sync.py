@@ -0,0 +1,314 @@
+"""Two-way sync of cards between two copies of a deck.
+
+Both sides build a Merkle tree of card hashes, bucketed by the leading
+hex digits of the card ID. Comparing the trees top-down only descends
+into subtrees whose hashes differ, so the differing cards are found in
+O(changes · log n) comparisons. Building a tree hashes every card, so
+the leaf hashes are cached per source file (see DigestCache): cards in a
+file unchanged since the last sync are not serialized and hashed again.
+Each differing card is then resolved on its own: a side that already has
+everything the other has wins outright, otherwise the two versions are
+merged.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+from uuid import UUID
+
+from ..data.models import FlashCard, ReviewHistory
+from .spaced_repetition import apply_review
+
+# Hex digits of the card ID per tree level; 16**3 leaf buckets
+MERKLE_DEPTH = 3
+
+_HEX = "0123456789abcdef"
+
+
+def card_digest(card: FlashCard) -> str:
+    """Hash everything stored for a card."""
+    return hashlib.sha1(card.model_dump_json().encode("utf-8")).hexdigest()
+
+
+class DigestCache:
+    """Card digests cached by the file the cards were read from.
+
+    Sources are keyed as in FlashCardRepository.card_sources(), by a key
+    that changes whenever the file does, so cached digests never go stale.
+    Sources not used since the cache was loaded are dropped on save.
+    """
+
+    def __init__(self):
+        self._sources: dict[str, dict[str, str]] = {}
+        self._used: set[str] = set()
+
+    def digests(self, source: str, cards: Iterable[FlashCard]) -> dict[UUID, str]:
+        """Return the digest of each card, hashing only uncached ones.
+
+        Args:
+            source: Key of the file the cards were read from
+            cards: Cards as read from that file
+
+        Returns:
+            Card ID to digest (see card_digest)
+        """
+        self._used.add(source)
+        cached = self._sources.setdefault(source, {})
+        digests = {}
+        for card in cards:
+            digest = cached.get(card.id.hex)
+            if digest is None:
+                digest = cached[card.id.hex] = card_digest(card)
+            digests[card.id] = digest
+        return digests
+
+    def prune(self) -> None:
+        """Drop sources not used since the cache was loaded or last pruned."""
+        self._sources = {source: self._sources[source] for source in self._used}
+        self._used = set()
+
+    def save(self, path: Path) -> None:
+        """Write the sources used since loading to a sidecar cache file.
+
+        Args:
+            path: Cache file path
+        """
+        data = {source: self._sources[source] for source in self._used}
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump({"sources": data}, f)
+        temp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "DigestCache":
+        """Read a sidecar cache file; a missing or unreadable one yields an empty cache.
+
+        Args:
+            path: Cache file path
+        """
+        cache = cls()
+        try:
+            with open(path, "r") as f:
+                sources = json.load(f).get("sources")
+        except (OSError, ValueError, AttributeError):
+            return cache
+        if isinstance(sources, dict):
+            cache._sources = sources
+        return cache
+
+
+class MerkleTree:
+    """Hash tree over a set of cards, keyed by card ID prefix."""
+
+    def __init__(
+        self,
+        cards: Iterable[FlashCard],
+        depth: int = MERKLE_DEPTH,
+        digests: Optional[dict[UUID, str]] = None
+    ):
+        """Hash the cards and every tree node.
+
+        Args:
+            cards: Cards to cover
+            depth: Number of ID hex digits used to bucket cards
+            digests: Precomputed card digests (see DigestCache); cards
+                missing from it are hashed
+        """
+        self.depth = depth
+        digests = digests or {}
+        self._leaves: dict[str, dict[UUID, str]] = {}
+        for card in cards:
+            bucket = card.id.hex[:depth]
+            digest = digests.get(card.id) or card_digest(card)
+            self._leaves.setdefault(bucket, {})[card.id] = digest
+
+        self._nodes: dict[str, str] = {}
+        for bucket, leaf in self._leaves.items():
+            self._nodes[bucket] = _hash(f"{i}:{d}" for i, d in sorted(leaf.items()))
+        for level in range(depth - 1, -1, -1):
+            parents = {bucket[:level] for bucket in self._nodes if len(bucket) == level + 1}
+            for prefix in parents:
+                self._nodes[prefix] = _hash(
+                    f"{c}:{self._nodes[prefix + c]}" for c in _HEX if prefix + c in self._nodes
+                )
+
+    @property
+    def root(self) -> str:
+        """Hash of the whole tree ("" when empty)."""
+        return self._nodes.get("", "")
+
+    def diff(self, other: "MerkleTree") -> set[UUID]:
+        """Return IDs of cards that are missing or different in `other`.
+
+        Args:
+            other: Tree of the other side, built with the same depth
+
+        Returns:
+            IDs of cards present on only one side or hashed differently
+        """
+        changed = set()
+        pending = [""]
+        while pending:
+            prefix = pending.pop()
+            if self._nodes.get(prefix) == other._nodes.get(prefix):
+                continue
+            if len(prefix) < self.depth:
+                pending.extend(prefix + c for c in _HEX)
+                continue
+            mine = self._leaves.get(prefix, {})
+            theirs = other._leaves.get(prefix, {})
+            changed.update(i for i in mine.keys() | theirs.keys() if mine.get(i) != theirs.get(i))
+        return changed
+
+
+def _hash(parts: Iterable[str]) -> str:
+    return hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()
+
+
+def merge_card(local: FlashCard, remote: FlashCard) -> FlashCard:
+    """Merge two versions of the same card.
+
+    If one version has every review of the other and is at least as new,
+    it is returned unchanged. Otherwise the review histories are combined
+    without duplicates, the content comes from the version with the higher
+    version counter, and the schedule is recomputed by replaying the
+    reviews with calculate_next_review. Compacted history can't be
+    replayed, so when either side has some, the side reviewed least
+    recently is kept and only the other side's extra reviews are replayed
+    on top of it.
+
+    Edits are expected to bump the version counter, as reviews do. When
+    both sides have the same version but different content, both were
+    edited independently: one content is picked by comparing the two, so
+    either side merging gets the same result, and the version is bumped so
+    that the result replaces both.
+
+    Args:
+        local: This side's card
+        remote: The other side's card
+
+    Returns:
+        The merged card (`local` or `remote` itself when one wins outright)
+    """
+    local_keys = {_review_key(e) for e in local.review_history}
+    remote_keys = {_review_key(e) for e in remote.review_history}
+    if local.version == remote.version and _content_key(local) != _content_key(remote):
+        content = max(local, remote, key=_content_key)
+        if local_keys == remote_keys:
+            return content.model_copy(update={"version": content.version + 1})
+    else:
+        if remote_keys <= local_keys and local.version >= remote.version:
+            return local
+        if local_keys <= remote_keys and remote.version >= local.version:
+            return remote
+        content = local if local.version >= remote.version else remote
+
+    history = _merge_histories(local.review_history, remote.review_history)
+
+    if local.history_summary is None and remote.history_summary is None:
+        # Replay everything from a never-reviewed card
+        card = content.model_copy(update={
+            "last_reviewed": None,
+            "next_review": content.created_at,
+            "ease_factor": 2.5,
+            "interval_days": 0.0,
+            "review_count": 0,
+            "review_history": [],
+        })
+        replay = history
+    else:
+        base = min(local, remote, key=lambda c: c.last_reviewed or datetime.min)
+        base_keys = local_keys if base is local else remote_keys
+        card = base.model_copy(update={
+            "type": content.type,
+            "question": content.question,
+            "answer": content.answer,
+            "tags": content.tags,
+            "options": content.options,
+            "review_history": list(base.review_history),
+        })
+        replay = [e for e in history if _review_key(e) not in base_keys]
+
+    for entry in replay:
+        card = apply_review(card, entry.score, entry.date)
+
+    card.review_history.sort(key=lambda e: e.date)
+    return card.model_copy(update={"version": max(local.version, remote.version) + 1})
+
+
+def _review_key(entry: ReviewHistory) -> tuple[datetime, float]:
+    return entry.date, entry.score
+
+
+def _content_key(card: FlashCard) -> tuple[str, list[str], list[str]]:
+    return card.content_hash(), card.tags, card.options or []
+
+
+def _merge_histories(
+    first: list[ReviewHistory],
+    second: list[ReviewHistory]
+) -> list[ReviewHistory]:
+    """Union of two review histories in date order, without duplicates."""
+    merged = {_review_key(e): e for e in second}
+    merged.update((_review_key(e), e) for e in first)
+    return sorted(merged.values(), key=lambda e: e.date)
+
+
+@dataclass
+class SyncPlan:
+    """Cards each side must take to match the other after a sync."""
+    to_local: dict[UUID, FlashCard] = field(default_factory=dict)
+    to_remote: dict[UUID, FlashCard] = field(default_factory=dict)
+    pulled: int = 0  # Taken from remote as is
+    pushed: int = 0  # Taken from local as is
+    merged: int = 0  # Changed on both sides and merged
+
+
+def plan_sync(
+    local: list[FlashCard],
+    remote: list[FlashCard],
+    local_digests: Optional[dict[UUID, str]] = None,
+    remote_digests: Optional[dict[UUID, str]] = None
+) -> SyncPlan:
+    """Work out what each side needs to end up with the same cards.
+
+    Cards present on only one side are copied to the other, so deleting a
+    card on one machine does not delete it on the other.
+
+    Args:
+        local: Every card on this side
+        remote: Every card on the other side
+        local_digests: Precomputed digests of local cards, if any
+        remote_digests: Precomputed digests of remote cards, if any
+
+    Returns:
+        SyncPlan with the cards to write to each side
+    """
+    plan = SyncPlan()
+    local_tree = MerkleTree(local, digests=local_digests)
+    changed = local_tree.diff(MerkleTree(remote, digests=remote_digests))
+    if not changed:
+        return plan
+
+    local_by_id = {card.id: card for card in local if card.id in changed}
+    remote_by_id = {card.id: card for card in remote if card.id in changed}
+    for card_id in changed:
+        mine: Optional[FlashCard] = local_by_id.get(card_id)
+        theirs: Optional[FlashCard] = remote_by_id.get(card_id)
+        merged = mine if theirs is None else theirs if mine is None else merge_card(mine, theirs)
+
+        if merged is not mine:
+            plan.to_local[card_id] = merged
+        if merged is not theirs:
+            plan.to_remote[card_id] = merged
+
+        if merged is mine:
+            plan.pushed += 1
+        elif merged is theirs:
+            plan.pulled += 1
+        else:
+            plan.merged += 1
+    return plan
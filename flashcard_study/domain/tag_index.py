@@ -0,0 +1,247 @@
+"""Tag index for partitioning cards by tag.
+
+Tags form a hierarchy through ``::`` separators (``python::asyncio`` is
+a child of ``python``). Wherever a list of tags is accepted as a filter,
+an entry ending in ``::*`` selects a whole subtree: ``python::*``
+matches ``python`` itself and every tag below it.
+"""
+
+from collections import defaultdict
+from typing import Iterable, Iterator, Optional
+
+from ..data.models import FlashCard
+
+TAG_SEPARATOR = "::"
+SUBTREE_SUFFIX = TAG_SEPARATOR + "*"
+
+
+def tag_prefixes(tag: str) -> Iterator[str]:
+    """Yield a tag's ancestors from the root down, then the tag itself."""
+    end = tag.find(TAG_SEPARATOR)
+    while end != -1:
+        yield tag[:end]
+        end = tag.find(TAG_SEPARATOR, end + len(TAG_SEPARATOR))
+    yield tag
+
+
+class TagQuery:
+    """Tag filter of exact tags and ``::*`` subtrees, matched in OR logic.
+
+    Matching a card costs one set lookup per tag and ancestor, however
+    many distinct tags the deck has.
+    """
+
+    def __init__(self, tags: Iterable[str]):
+        """Compile a filter.
+
+        Args:
+            tags: Exact tags and ``prefix::*`` subtree patterns
+        """
+        self.exact: set[str] = set()
+        self.subtrees: set[str] = set()
+        for tag in tags:
+            if tag.endswith(SUBTREE_SUFFIX):
+                self.subtrees.add(tag[:-len(SUBTREE_SUFFIX)])
+            else:
+                self.exact.add(tag)
+
+    def matches(self, tags: Iterable[str]) -> bool:
+        """Whether any of a card's tags is selected by the filter."""
+        for tag in tags:
+            if tag in self.exact:
+                return True
+            if self.subtrees and any(p in self.subtrees for p in tag_prefixes(tag)):
+                return True
+        return False
+
+
+def filter_cards(cards: Iterable[FlashCard], tags: Optional[list[str]]) -> list[FlashCard]:
+    """Return the cards matching a tag filter (all cards if there is none).
+
+    Args:
+        cards: Cards to filter
+        tags: Exact tags and ``prefix::*`` subtrees (OR logic)
+
+    Returns:
+        Matching cards in their original order
+    """
+    if not tags:
+        return list(cards)
+    query = TagQuery(tags)
+    return [card for card in cards if query.matches(card.tags)]
+
+
+class TagTrie:
+    """Prefix tree of tag components, for expanding subtree patterns."""
+
+    def __init__(self, tags: Iterable[str] = ()):
+        """Initialize trie.
+
+        Args:
+            tags: Tags to insert
+        """
+        # Each node maps a component to its child node; "" marks a tag
+        self._root: dict = {}
+        for tag in tags:
+            self.add(tag)
+
+    def add(self, tag: str) -> None:
+        """Insert a tag."""
+        node = self._root
+        for part in tag.split(TAG_SEPARATOR):
+            node = node.setdefault(part, {})
+        node[""] = tag
+
+    def _node(self, tag: str) -> Optional[dict]:
+        node = self._root
+        for part in tag.split(TAG_SEPARATOR):
+            node = node.get(part)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, tag: str) -> bool:
+        node = self._node(tag)
+        return node is not None and "" in node
+
+    def subtree(self, prefix: str) -> list[str]:
+        """Return the tags at or below `prefix`, in depth-first order."""
+        node = self._node(prefix)
+        if node is None:
+            return []
+        found = []
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            for part, child in node.items():
+                if part == "":
+                    found.append(child)
+                else:
+                    pending.append(child)
+        return found
+
+    def expand(self, tags: Iterable[str]) -> list[str]:
+        """Replace subtree patterns with the tags they match.
+
+        Args:
+            tags: Exact tags and ``prefix::*`` subtree patterns
+
+        Returns:
+            Matching tags present in the trie, without duplicates
+        """
+        expanded: dict[str, None] = {}
+        for tag in tags:
+            if tag.endswith(SUBTREE_SUFFIX):
+                expanded.update(dict.fromkeys(self.subtree(tag[:-len(SUBTREE_SUFFIX)])))
+            elif tag in self:
+                expanded[tag] = None
+        return list(expanded)
+
+
+def subtree_counts(tag_lists: Iterable[tuple[Iterable[str], int]]) -> dict[str, int]:
+    """Count cards per tag and per ancestor tag in one pass.
+
+    A card counts once towards each subtree it has any tag in, so a card
+    tagged both ``python`` and ``python::asyncio`` adds 1 to ``python``.
+
+    Args:
+        tag_lists: (tags, number of cards) pairs, e.g. (card.tags, 1)
+
+    Returns:
+        Cards per tag prefix, for every prefix of every tag
+    """
+    counts: dict[str, int] = defaultdict(int)
+    for tags, n in tag_lists:
+        prefixes = {p for tag in tags for p in tag_prefixes(tag)}
+        for prefix in prefixes:
+            counts[prefix] += n
+    return dict(counts)
+
+
+def parent_counts(counts: dict[str, int]) -> dict[str, int]:
+    """Keep only the entries of subtree_counts() for tags with children."""
+    parents = {p for tag in counts for p in list(tag_prefixes(tag))[:-1]}
+    return {tag: n for tag, n in counts.items() if tag in parents}
+
+
+class TagIndex:
+    """Inverted index from tag to the cards carrying it.
+
+    Built in a single pass over the deck so that repeated per-tag lookups
+    don't rescan every card.
+    """
+
+    def __init__(self, cards: Iterable[FlashCard] = ()):
+        """Initialize index from cards.
+
+        Args:
+            cards: Cards to index
+        """
+        self._cards: dict[str, list[FlashCard]] = defaultdict(list)
+        self._trie = TagTrie()
+        for card in cards:
+            self.add(card)
+
+    def add(self, card: FlashCard) -> None:
+        """Index a single card under each of its tags.
+
+        Args:
+            card: FlashCard to index
+        """
+        for tag in dict.fromkeys(card.tags):
+            if tag not in self._cards:
+                self._trie.add(tag)
+            self._cards[tag].append(card)
+
+    def tags(self) -> list[str]:
+        """Return all indexed tags in sorted order."""
+        return sorted(self._cards)
+
+    def expand(self, tags: Iterable[str]) -> list[str]:
+        """Return the indexed tags matching exact tags and ``::*`` subtrees."""
+        return self._trie.expand(tags)
+
+    def cards_for(self, tags: Iterable[str]) -> list[FlashCard]:
+        """Return cards carrying any of the given tags (OR logic).
+
+        Args:
+            tags: Tags to look up, or ``prefix::*`` subtrees
+
+        Returns:
+            Matching cards without duplicates, in first-seen order
+        """
+        seen: dict[int, FlashCard] = {}
+        for tag in self.expand(tags):
+            for card in self._cards.get(tag, ()):
+                seen.setdefault(id(card), card)
+        return list(seen.values())
+
+    def partition(
+        self,
+        prefix_depth: int = 0,
+        tags: Optional[Iterable[str]] = None
+    ) -> dict[str, list[FlashCard]]:
+        """Group cards by tag or by tag prefix.
+
+        A card with several tags appears in every group it belongs to.
+
+        Args:
+            prefix_depth: Number of leading ``::``-separated tag components
+                to group on. 0 groups on the full tag.
+            tags: Optional subset of tags to partition on, which may
+                include ``prefix::*`` subtrees (default: all)
+
+        Returns:
+            Mapping of group name to its cards
+        """
+        selected = self.tags() if tags is None else sorted(self.expand(tags))
+
+        if prefix_depth <= 0:
+            return {tag: list(self._cards[tag]) for tag in selected}
+
+        groups: dict[str, list[str]] = defaultdict(list)
+        for tag in selected:
+            prefix = TAG_SEPARATOR.join(tag.split(TAG_SEPARATOR)[:prefix_depth])
+            groups[prefix].append(tag)
+
+        return {prefix: self.cards_for(tags) for prefix, tags in groups.items()}
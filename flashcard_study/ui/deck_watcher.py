@@ -0,0 +1,104 @@
+"""Watch the database file and tell screens which cards changed."""
+
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from textual.app import App
+from textual.message import Message
+
+from ..data.models import ArchiveSummary, FlashCardDatabase
+from ..data.repository import FlashCardRepository
+from ..domain.card_diff import CardDiff, diff_cards
+from ..domain.sync import DigestCache
+
+# Seconds between checks of the database file
+POLL_INTERVAL = 1.0
+
+
+class DeckChanged(Message):
+    """Posted to every open screen when cards changed on disk.
+
+    Cards moved to or from the archive show up as removed or added; the
+    archive's new summary is passed along.
+    """
+
+    def __init__(self, diff: CardDiff, archive: Optional[ArchiveSummary] = None):
+        super().__init__()
+        self.diff = diff
+        self.archive = archive
+
+
+class DeckWatcher:
+    """Polls the database file and broadcasts card-level diffs.
+
+    Each check only stats the file. When it changed (a slash command, the
+    CLI, the daemon or this app saved), the new version is loaded and
+    compared with the previous one in a worker thread, and the resulting
+    diff is posted to the screens so they can patch what they show
+    instead of reloading. Card digests are kept per segment file, so only
+    cards in rewritten segments are hashed again.
+    """
+
+    def __init__(self, app: App, repository: FlashCardRepository):
+        """Initialize watcher.
+
+        Args:
+            app: App whose screens are notified
+            repository: FlashCardRepository to watch
+        """
+        self.app = app
+        self.repository = repository
+        self._stat: Optional[tuple[int, int]] = None
+        self._database: Optional[FlashCardDatabase] = None
+        self._digests: dict[UUID, str] = {}
+        self._digest_cache = DigestCache()
+        self._checking = False
+
+    def start(self) -> None:
+        """Take the current version as the baseline and start polling."""
+        self.app.run_worker(self._check(), group="deck-watcher")
+        self.app.set_interval(POLL_INTERVAL, self._poll)
+
+    def _poll(self) -> None:
+        if self._checking or self.repository.file_stat() == self._stat:
+            return
+        self.app.run_worker(self._check(), group="deck-watcher")
+
+    async def _check(self) -> None:
+        """Load the changed file and broadcast what changed."""
+        if self._checking:
+            return
+        self._checking = True
+        try:
+            stat = self.repository.file_stat()
+            try:
+                database = await self.repository.asnapshot()
+            except ValueError:
+                # Unreadable mid-write or corrupt: keep the last good version
+                return
+            if database is self._database:
+                self._stat = stat
+                return
+            digests = await asyncio.to_thread(self._card_digests, database)
+            previous, self._database, self._stat = self._database, database, stat
+            previous_digests, self._digests = self._digests, digests
+            if previous is None:
+                return
+
+            diff = await asyncio.to_thread(
+                diff_cards, previous.cards, database.cards, previous_digests, digests
+            )
+            if diff:
+                for screen in self.app.screen_stack:
+                    screen.post_message(DeckChanged(diff, database.archive))
+        finally:
+            self._checking = False
+
+    def _card_digests(self, database: FlashCardDatabase) -> dict[UUID, str]:
+        """Digest every card of the database, reusing unchanged segments' digests."""
+        digests = {}
+        for source, cards in self.repository.card_sources(database, include_archived=False):
+            digests.update(self._digest_cache.digests(source, cards))
+        self._digest_cache.prune()
+        return digests
@@ -1,7 +1,5 @@
 """Card creation and editing form."""
 
-from datetime import datetime
-from uuid import uuid4
 from textual.app import ComposeResult
 from textual.screen import ModalScreen
 from textual.containers import Container, Horizontal, Vertical
@@ -11,8 +9,11 @@ from ...data.repository import FlashCardRepository
 from ...data.models import FlashCard
 
 
-class CardFormScreen(ModalScreen):
-    """Modal screen for creating or editing a card."""
+class CardFormScreen(ModalScreen[FlashCard]):
+    """Modal screen for creating or editing a card.
+
+    Dismisses with the saved card, or None if cancelled.
+    """
 
     def __init__(self, repository: FlashCardRepository, card: FlashCard = None):
         """Initialize card form screen.
@@ -95,23 +96,12 @@ class CardFormScreen(ModalScreen):
                 "question": question,
                 "answer": answer,
                 "tags": tags,
+                "version": self.card.version + 1,
             })
             self.repository.update_card(updated_card)
+            self.dismiss(updated_card)
         else:
             # Create new card
-            now = datetime.now()
-            new_card = FlashCard(
-                id=uuid4(),
-                type=card_type,
-                question=question,
-                answer=answer,
-                tags=tags,
-                created_at=now,
-                next_review=now,
-                ease_factor=2.5,
-                interval_days=0.0,
-                review_count=0,
-            )
+            new_card = FlashCard.new(card_type, question, answer, tags)
             self.repository.add_card(new_card)
-
-        self.dismiss()
+            self.dismiss(new_card)
@@ -1,20 +1,49 @@
 """Card list and management screen."""
 
+import asyncio
+from typing import Optional
+from uuid import UUID
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.containers import Container, Horizontal
-from textual.widgets import Header, Footer, DataTable, Button, Static
+from textual.widgets import Header, Footer, DataTable, Button, Static, Input
 
 from ...data.repository import FlashCardRepository
+from ...data.models import FlashCard
+from ...domain.search import SearchIndex
+from ..deck_watcher import DeckChanged
+
+# Rows kept in the table beyond the visible area, above and below
+WINDOW_BUFFER = 30
+
+# Columns as (key, label); keyed columns can be sorted by selecting the header
+COLUMNS = [
+    ("question", "Question"),
+    ("tags", "Tags"),
+    ("review_count", "Reviews"),
+    ("ease_factor", "Ease"),
+    ("next_review", "Next Review"),
+]
+SORTABLE_COLUMNS = {"review_count", "ease_factor", "next_review"}
 
 
 class CardListScreen(Screen):
-    """Screen for browsing and managing cards."""
+    """Screen for browsing and managing cards.
+
+    The table is virtualized: it only ever holds the rows around the
+    cursor (the visible area plus a buffer), fetched a window at a time
+    from the repository. Moving the cursor near either edge of the window
+    slides the window along the full, sorted result set. Archived cards
+    are listed and searched along with the others.
+    """
 
     BINDINGS = [
         ("n", "new_card", "New Card"),
         ("e", "edit_card", "Edit"),
         ("d", "delete_card", "Delete"),
+        ("o", "cycle_sort", "Sort"),
+        ("r", "reverse_sort", "Reverse"),
+        ("slash", "focus_search", "Search"),
         ("escape", "go_back", "Back"),
     ]
 
@@ -26,13 +55,23 @@ class CardListScreen(Screen):
         """
         super().__init__()
         self.repository = repository
+        self.search_index: Optional[SearchIndex] = None
+        self.sort_by: Optional[str] = None
+        self.descending = False
+        self.result_ids: Optional[list[UUID]] = None
+        self.total = 0
+        self.window_start = 0
+        self.window_cards: list[FlashCard] = []
+        self._sliding = False
 
     def compose(self) -> ComposeResult:
         """Compose the card list screen."""
         yield Header()
         yield Container(
             Static("Flash Cards", id="title"),
+            Input(placeholder="Search questions, answers and tags (/)", id="input-search"),
             DataTable(id="card-table"),
+            Static("", id="list-status"),
             Horizontal(
                 Button("New (n)", id="btn-new", variant="primary"),
                 Button("Edit (e)", id="btn-edit"),
@@ -45,23 +84,142 @@ class CardListScreen(Screen):
     def on_mount(self) -> None:
         """Set up the data table."""
         table = self.query_one(DataTable)
-        table.add_columns("Question", "Tags", "Reviews", "Ease", "Next Review")
-
-        database = self.repository.load()
-        for card in database.cards:
-            tags_str = ", ".join(card.tags) if card.tags else ""
-            next_review_str = card.next_review.strftime("%Y-%m-%d %H:%M")
-            table.add_row(
-                card.question[:50] + "..." if len(card.question) > 50 else card.question,
-                tags_str,
-                str(card.review_count),
-                f"{card.ease_factor:.2f}",
-                next_review_str,
-                key=str(card.id)
-            )
-
-        if database.cards:
-            table.cursor_type = "row"
+        for key, label in COLUMNS:
+            table.add_column(label, key=key)
+        table.cursor_type = "row"
+        table.loading = True
+        table.focus()
+        self.call_after_refresh(self.run_worker, self._load_cards(), exclusive=True)
+
+    async def _load_cards(self) -> None:
+        """Load the deck and its archive off the event loop, then show the first window."""
+        await asyncio.to_thread(self.repository.snapshot_cards)
+        self.query_one(DataTable).loading = False
+        self._reset_window()
+
+    @property
+    def window_size(self) -> int:
+        """Number of rows to hold: the visible area plus a buffer each side."""
+        visible = max(self.query_one(DataTable).size.height, 20)
+        return visible + 2 * WINDOW_BUFFER
+
+    def _fetch(self, offset: int, limit: int) -> list[FlashCard]:
+        """Fetch one window of cards from the current result set."""
+        if self.result_ids is not None:
+            return self.repository.get_cards(self.result_ids[offset:offset + limit])
+        return self.repository.page(offset, limit, self.sort_by, self.descending)
+
+    def _reset_window(self) -> None:
+        """Show the first window of the current result set."""
+        if self.result_ids is not None:
+            self.total = len(self.result_ids)
+        else:
+            self.total = self.repository.count()
+        self._show_window(0, 0)
+
+    def _show_window(self, start: int, cursor_row: int) -> None:
+        """Replace the table contents with the window starting at start.
+
+        Args:
+            start: Absolute index of the first row in the window
+            cursor_row: Absolute index of the row to put the cursor on
+        """
+        table = self.query_one(DataTable)
+        self.window_start = start
+        self.window_cards = self._fetch(start, self.window_size)
+
+        self._sliding = True
+        try:
+            table.clear()
+            for card in self.window_cards:
+                table.add_row(*self._format_row(card), key=str(card.id))
+            if self.window_cards:
+                table.move_cursor(row=min(cursor_row - start, len(self.window_cards) - 1))
+        finally:
+            self._sliding = False
+        self._update_status()
+
+    def _update_status(self) -> None:
+        """Show the cursor position and sort order."""
+        table = self.query_one(DataTable)
+        position = self.window_start + table.cursor_row + 1 if self.total else 0
+        sort_label = self.sort_by or "created"
+        direction = "desc" if self.descending else "asc"
+        source = "matches" if self.result_ids is not None else "cards"
+        self.query_one("#list-status", Static).update(
+            f"{position} of {self.total} {source} | sort: {sort_label} ({direction})"
+        )
+
+    @staticmethod
+    def _format_row(card: FlashCard) -> tuple[str, ...]:
+        """Format a card as a table row."""
+        tags_str = ", ".join(card.tags) if card.tags else ""
+        next_review_str = card.next_review.strftime("%Y-%m-%d %H:%M")
+        return (
+            card.question[:50] + "..." if len(card.question) > 50 else card.question,
+            tags_str,
+            str(card.review_count),
+            f"{card.ease_factor:.2f}",
+            next_review_str,
+        )
+
+    def _selected_card(self) -> Optional[FlashCard]:
+        """Return the card under the table cursor, if any."""
+        table = self.query_one(DataTable)
+        if not self.window_cards:
+            return None
+        return self.window_cards[table.cursor_row]
+
+    def on_data_table_row_highlighted(self, event: DataTable.RowHighlighted) -> None:
+        """Slide the window when the cursor nears either edge."""
+        if self._sliding:
+            return
+        # Events are queued, so read the live cursor rather than event.cursor_row
+        row = self.query_one(DataTable).cursor_row
+        absolute = self.window_start + row
+        window_end = self.window_start + len(self.window_cards)
+
+        near_bottom = row >= len(self.window_cards) - WINDOW_BUFFER // 2 and window_end < self.total
+        near_top = row < WINDOW_BUFFER // 2 and self.window_start > 0
+        if near_bottom or near_top:
+            # Re-centre the window on the cursor
+            start = max(0, absolute - self.window_size // 2)
+            self.call_after_refresh(self._show_window, start, absolute)
+        else:
+            self._update_status()
+
+    def on_data_table_header_selected(self, event: DataTable.HeaderSelected) -> None:
+        """Sort by the selected column, toggling direction on repeat."""
+        key = event.column_key.value
+        if key not in SORTABLE_COLUMNS:
+            return
+        if self.sort_by == key:
+            self.descending = not self.descending
+        else:
+            self.sort_by, self.descending = key, False
+        self._clear_search()
+        self._reset_window()
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        """Filter the table as the search query changes."""
+        if event.input.id != "input-search":
+            return
+        query = event.value.strip()
+        if not query:
+            self.result_ids = None
+        else:
+            if self.search_index is None:
+                # Built on first use so opening the list stays fast
+                self.search_index = SearchIndex(self.repository.snapshot_cards())
+            self.result_ids = [
+                card_id for card_id, _ in self.search_index.search(query, limit=0)
+            ]
+        self._reset_window()
+
+    def on_input_submitted(self, event: Input.Submitted) -> None:
+        """Move focus from the search box to the results."""
+        if event.input.id == "input-search":
+            self.query_one(DataTable).focus()
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
@@ -74,24 +232,113 @@ class CardListScreen(Screen):
         elif event.button.id == "btn-back":
             self.action_go_back()
 
+    def _clear_search(self) -> None:
+        """Drop any active search filter."""
+        self.result_ids = None
+        search = self.query_one("#input-search", Input)
+        with search.prevent(Input.Changed):
+            search.value = ""
+
+    def action_cycle_sort(self) -> None:
+        """Cycle the sort column: created, next review, ease, reviews."""
+        order = [None, "next_review", "ease_factor", "review_count"]
+        self.sort_by = order[(order.index(self.sort_by) + 1) % len(order)]
+        self._clear_search()
+        self._reset_window()
+
+    def action_reverse_sort(self) -> None:
+        """Reverse the sort direction."""
+        self.descending = not self.descending
+        self._clear_search()
+        self._reset_window()
+
+    def action_focus_search(self) -> None:
+        """Focus the search box."""
+        self.query_one("#input-search", Input).focus()
+
     def action_new_card(self) -> None:
         """Create a new card."""
         from .card_form import CardFormScreen
-        self.app.push_screen(CardFormScreen(self.repository))
+        self.app.push_screen(CardFormScreen(self.repository), self._on_card_saved)
 
     def action_edit_card(self) -> None:
         """Edit the selected card."""
+        from .card_form import CardFormScreen
+        card = self._selected_card()
+        if card is not None:
+            self.app.push_screen(CardFormScreen(self.repository, card), self._on_card_saved)
+
+    def _on_card_saved(self, card: Optional[FlashCard]) -> None:
+        """Update the index and visible rows after a card is saved."""
+        if card is None:
+            return
+        if self.search_index is not None:
+            self.search_index.update(card)
+
+        if self._update_row(card):
+            # Edited card in view: just its row changed
+            return
+
+        # New card: counts and sort positions changed
+        self.total = self.repository.count() if self.result_ids is None else self.total
+        self._update_status()
+
+    def on_deck_changed(self, message: DeckChanged) -> None:
+        """Patch the list for cards changed outside this screen."""
+        diff = message.diff
+        if self.search_index is not None:
+            # Cards moved to the archive are still listed
+            archived = {card.id for card in self.repository.get_cards(c.id for c in diff.removed)}
+            for card in diff.removed:
+                if card.id not in archived:
+                    self.search_index.remove(card.id)
+            for card in diff.added + [new for _, new in diff.updated]:
+                self.search_index.update(card)
+
         table = self.query_one(DataTable)
-        if table.cursor_row >= 0:
-            row_key = table.get_row_at(table.cursor_row)
-            # TODO: Get card by ID and push edit screen
-            pass
+        if table.loading:
+            return
+
+        searching = self.result_ids is not None
+        reordered = diff.added or diff.removed or (diff.updated and (self.sort_by or searching))
+        if not reordered:
+            # Positions are stable: update just the visible rows that changed
+            for _, card in diff.updated:
+                self._update_row(card)
+            return
+
+        # Rows moved, appeared or disappeared: refetch only the current window
+        if searching:
+            query = self.query_one("#input-search", Input).value.strip()
+            self.result_ids = [
+                card_id for card_id, _ in self.search_index.search(query, limit=0)
+            ]
+            self.total = len(self.result_ids)
+        else:
+            self.total = self.repository.count()
+        cursor = min(self.window_start + table.cursor_row, max(0, self.total - 1))
+        start = min(self.window_start, max(0, self.total - len(self.window_cards)))
+        self._show_window(start, cursor)
+
+    def _update_row(self, card: FlashCard) -> bool:
+        """Update the row of a card if it's in the window.
+
+        Returns:
+            True if the card was in the window
+        """
+        table = self.query_one(DataTable)
+        for i, shown in enumerate(self.window_cards):
+            if shown.id == card.id:
+                self.window_cards[i] = card
+                for (key, _), value in zip(COLUMNS, self._format_row(card)):
+                    table.update_cell(str(card.id), key, value)
+                return True
+        return False
 
     def action_delete_card(self) -> None:
         """Delete the selected card."""
-        table = self.query_one(DataTable)
-        if table.cursor_row >= 0:
-            row_key = table.get_row_at(table.cursor_row)
+        card = self._selected_card()
+        if card is not None:
             # TODO: Show confirmation and delete card
             pass
 
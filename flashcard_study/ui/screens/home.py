@@ -1,13 +1,16 @@
 """Home screen with dashboard and navigation."""
 
+import asyncio
 from datetime import datetime
+from typing import Optional
 from textual.app import ComposeResult
 from textual.screen import Screen
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Header, Footer, Static, Button
 
 from ...data.repository import FlashCardRepository
-from ...domain.statistics import StatisticsCalculator
+from ...domain.statistics import DashboardCounters
+from ..deck_watcher import DeckChanged
 from ..widgets.stat_card import StatCard
 
 
@@ -30,22 +33,23 @@ class HomeScreen(Screen):
         """
         super().__init__()
         self.repository = repository
+        self.counters: Optional[DashboardCounters] = None
 
     def compose(self) -> ComposeResult:
-        """Compose the home screen."""
-        # Load data and calculate stats
-        database = self.repository.load()
-        stats = StatisticsCalculator.calculate(database.cards, datetime.now())
+        """Compose the home screen.
 
+        Stat cards start as placeholders and are filled in once the
+        database has loaded in the background.
+        """
         yield Header(show_clock=True)
         yield Container(
             Static("Flash Card Study", id="title"),
             Horizontal(
-                StatCard("Due Today", str(stats.cards_due_today), "red"),
-                StatCard("Reviewed", str(stats.cards_reviewed_today), "green"),
-                StatCard("Streak", f"{stats.review_streak_days}d", "cyan"),
-                StatCard("Total", str(stats.total_cards), "blue"),
-                id="stats-row"
+                StatCard("Due Today", "…", "red", id="stat-due"),
+                StatCard("Reviewed", "…", "green", id="stat-reviewed"),
+                StatCard("Streak", "…", "cyan", id="stat-streak"),
+                StatCard("Total", "…", "blue", id="stat-total"),
+                classes="stats-row"
             ),
             Vertical(
                 Button("Start Quiz (s)", id="btn-quiz", variant="primary"),
@@ -58,6 +62,43 @@ class HomeScreen(Screen):
         )
         yield Footer()
 
+    def on_mount(self) -> None:
+        """Start loading statistics once the placeholders have been painted."""
+        # Parsing holds the GIL, so let the skeleton reach the screen first
+        self.call_after_refresh(self.run_worker, self._load_stats(), exclusive=True)
+
+    async def _load_stats(self) -> None:
+        """Load the database and compute stats off the event loop."""
+        database = await self.repository.asnapshot()
+        self.counters = await asyncio.to_thread(
+            DashboardCounters, database.cards, datetime.now(), database.archive
+        )
+        self._show_stats()
+
+    def _show_stats(self) -> None:
+        """Fill the stat cards."""
+        counters = self.counters
+        self.query_one("#stat-due", StatCard).set_value(str(counters.due_today))
+        self.query_one("#stat-reviewed", StatCard).set_value(str(counters.reviewed_today))
+        self.query_one("#stat-streak", StatCard).set_value(f"{counters.streak}d")
+        self.query_one("#stat-total", StatCard).set_value(str(counters.total))
+
+    def on_deck_changed(self, message: DeckChanged) -> None:
+        """Adjust the counters for just the cards that changed."""
+        if self.counters is None:
+            # Stats are still loading
+            return
+        diff = message.diff
+        self.counters.set_archive(message.archive)
+        for card in diff.removed:
+            self.counters.remove(card)
+        for old, new in diff.updated:
+            self.counters.remove(old)
+            self.counters.add(new)
+        for card in diff.added:
+            self.counters.add(card)
+        self._show_stats()
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
         if event.button.id == "btn-quiz":
@@ -1,16 +1,25 @@
 """Quiz mode screens."""
 
+import asyncio
 from datetime import datetime
 from textual.app import ComposeResult
+from textual.message import Message
 from textual.screen import ModalScreen, Screen
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Static, Button, Input, Label, ProgressBar
 
 from ...data.repository import FlashCardRepository
 from ...data.models import FlashCard
+from ...data.write_behind import WriteBehindWriter
 from ...domain.card_selector import CardSelector
+from ...domain.load_balance import LoadBalancer
+from ...domain.query import QueryError, parse_query
 from ...domain.spaced_repetition import apply_review
-from ..widgets.card_display import CardDisplay
+from ..deck_watcher import DeckChanged
+from ..widgets.card_display import CardDisplay, render_card
+
+# Cards after the current one whose views are rendered in advance
+PREFETCH_DEPTH = 3
 
 
 class QuizSetupScreen(ModalScreen[dict]):
@@ -21,7 +30,9 @@ class QuizSetupScreen(ModalScreen[dict]):
         yield Container(
             Static("Quiz Setup", id="title"),
             Label("Tags (comma-separated, optional):"),
-            Input(placeholder="e.g., python,algorithms", id="input-tags"),
+            Input(placeholder="e.g., python::*,algorithms", id="input-tags"),
+            Label("Query (optional):"),
+            Input(placeholder="e.g., ease<2.0 AND due<7d AND NOT tag:legacy", id="input-query"),
             Label("Number of cards:"),
             Input(value="10", id="input-count"),
             Label("Include all cards (not just due):"),
@@ -65,6 +76,7 @@ class QuizSetupScreen(ModalScreen[dict]):
     def action_start(self) -> None:
         """Start the quiz with configured parameters."""
         tags_input = self.query_one("#input-tags", Input).value
+        query_input = self.query_one("#input-query", Input).value
         count_input = self.query_one("#input-count", Input).value
 
         tags = [t.strip() for t in tags_input.split(",") if t.strip()]
@@ -72,14 +84,19 @@ class QuizSetupScreen(ModalScreen[dict]):
             count = int(count_input)
         except ValueError:
             count = 10
+        try:
+            query = parse_query(query_input) if query_input.strip() else None
+        except QueryError as e:
+            self.app.notify(f"Invalid query: {e}", severity="error")
+            return
 
         # Load cards and select for quiz
-        database = self.repository.load()
-        selected_cards = CardSelector.select_for_quiz(
-            database.cards,
+        selected_cards = CardSelector.select_from_repository(
+            self.repository,
             tags=tags if tags else None,
             count=count,
-            include_all=self.include_all
+            include_all=self.include_all,
+            query=query
         )
 
         if not selected_cards:
@@ -91,7 +108,24 @@ class QuizSetupScreen(ModalScreen[dict]):
 
 
 class QuizScreen(ModalScreen):
-    """Modal screen for quiz mode."""
+    """Modal screen for quiz mode.
+
+    Reviewed cards are handed to a background WriteBehindWriter so scoring
+    never waits on disk I/O; pending writes are flushed in a worker when
+    the quiz ends, and the summary is shown once they are written.
+
+    After each card is shown, the question and answer views of the next
+    PREFETCH_DEPTH cards are rendered while the user reads it, so
+    advancing only swaps an already-rendered view into the display.
+    """
+
+    class SaveFailed(Message):
+        """Posted from the writer thread when reviewed cards couldn't be saved."""
+
+        def __init__(self, error: Exception, cards: list[FlashCard]):
+            super().__init__()
+            self.error = error
+            self.cards = cards
 
     BINDINGS = [
         ("space", "reveal_answer", "Show Answer"),
@@ -114,6 +148,39 @@ class QuizScreen(ModalScreen):
         self.current_index = 0
         self.scores = []
         self.answer_revealed = False
+        self.writer = WriteBehindWriter(repository, on_error=self._on_save_error)
+        self._unreported_failures: list[SaveFailed] = []
+        # Due dates of the whole deck, if it balances its reviews
+        self.balancer = LoadBalancer.for_repository(repository)
+
+    def _on_save_error(self, error: Exception, cards: list[FlashCard]) -> None:
+        """Forward a writer failure to the UI (runs on the writer thread)."""
+        failure = self.SaveFailed(error, cards)
+        self._unreported_failures.append(failure)
+        # post_message is thread-safe and doesn't block the writer
+        self.post_message(failure)
+
+    def on_quiz_screen_save_failed(self, message: SaveFailed) -> None:
+        """Tell the user that reviews weren't saved."""
+        if message in self._unreported_failures:
+            self._unreported_failures.remove(message)
+            self._notify_save_failed(message)
+
+    def _notify_save_failed(self, failure: SaveFailed) -> None:
+        self.app.notify(
+            f"Failed to save {len(failure.cards)} review(s): {failure.error}",
+            title="Save failed",
+            severity="error",
+            timeout=10,
+        )
+
+    def on_unmount(self) -> None:
+        """Flush pending writes when the quiz closes (finish, cancel or exit)."""
+        self.writer.close()
+        # Failures during the final flush can't be delivered to this screen
+        for failure in self._unreported_failures:
+            self._notify_save_failed(failure)
+        self._unreported_failures.clear()
 
     def compose(self) -> ComposeResult:
         """Compose the quiz screen."""
@@ -136,6 +203,48 @@ class QuizScreen(ModalScreen):
             id="quiz-container"
         )
 
+    def on_mount(self) -> None:
+        """Prepare the first upcoming cards once the quiz is on screen."""
+        self.call_after_refresh(self._prefetch)
+
+    def _prefetch(self) -> None:
+        """Render the question and answer views of the next cards.
+
+        Rendered views are kept in CardDisplay's render cache, which the
+        display reuses when it is pointed at one of these cards.
+        """
+        upcoming = self.cards[self.current_index + 1:self.current_index + 1 + PREFETCH_DEPTH]
+        for card in upcoming:
+            render_card(card, show_answer=False)
+            render_card(card, show_answer=True)
+
+    def on_deck_changed(self, message: DeckChanged) -> None:
+        """Refresh upcoming cards that were changed or deleted elsewhere.
+
+        Cards already scored and the card on screen are left alone, so
+        local reviews are never replaced by an older version from disk.
+        """
+        diff = message.diff
+        updated = {new.id: new for _, new in diff.updated}
+        removed = {card.id for card in diff.removed}
+        if not updated.keys() | removed:
+            return
+
+        done = self.cards[:self.current_index + 1]
+        upcoming = [
+            updated.get(card.id, card)
+            for card in self.cards[self.current_index + 1:]
+            if card.id not in removed
+        ]
+        self.cards = done + upcoming
+
+        total = len(self.cards)
+        self.query_one(ProgressBar).update(total=total)
+        self.query_one("#counter", Static).update(
+            f"Card {self.current_index + 1} of {total}"
+        )
+        self._prefetch()
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses."""
         if event.button.id == "btn-reveal":
@@ -178,16 +287,13 @@ class QuizScreen(ModalScreen):
 
     def _record_score(self, score: float) -> None:
         """Record score and move to next card."""
+        if self.current_index >= len(self.cards):
+            return  # Finishing: pending writes are being flushed
         current_card = self.cards[self.current_index]
-        updated_card = apply_review(current_card, score, datetime.now())
+        updated_card = apply_review(current_card, score, datetime.now(), self.balancer)
 
-        # Update in database
-        database = self.repository.load()
-        for i, card in enumerate(database.cards):
-            if card.id == updated_card.id:
-                database.cards[i] = updated_card
-                break
-        self.repository.save(database)
+        # Persist in the background
+        self.writer.submit(updated_card)
 
         self.scores.append(score)
 
@@ -212,7 +318,7 @@ class QuizScreen(ModalScreen):
             f"Card {self.current_index + 1} of {total}"
         )
 
-        # Update card display
+        # Swap the prepared view into the card display
         card_display = self.query_one(CardDisplay)
         card_display.card = self.cards[self.current_index]
         card_display.set_show_answer(False)
@@ -224,8 +330,23 @@ class QuizScreen(ModalScreen):
         for button in score_row.query(Button):
             button.disabled = True
 
+        # Prepare the cards after this one once it has been painted
+        self.call_after_refresh(self._prefetch)
+
     def _finish_quiz(self) -> None:
-        """Finish quiz and show summary."""
+        """Finish quiz: flush pending writes in a worker, then show the summary."""
+        for button in self.query_one("#score-row").query(Button):
+            button.disabled = True
+        self.query_one("#counter", Static).update("Saving reviews...")
+        self.run_worker(self._flush_and_summarize(), exclusive=True)
+
+    async def _flush_and_summarize(self) -> None:
+        """Wait for the writer off the event loop, then show the summary.
+
+        Save failures reach the user through SaveFailed as usual, or from
+        on_unmount if the screen is gone before the message is handled.
+        """
+        await asyncio.to_thread(self.writer.flush)
         avg_score = sum(self.scores) / len(self.scores) if self.scores else 0
         self.dismiss()
         self.app.push_screen(QuizSummaryScreen(len(self.scores), avg_score))
@@ -1,5 +1,6 @@
 """Statistics screen."""
 
+import asyncio
 from datetime import datetime
 from textual.app import ComposeResult
 from textual.screen import Screen
@@ -7,7 +8,7 @@ from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Header, Footer, Static, Button
 
 from ...data.repository import FlashCardRepository
-from ...domain.statistics import StatisticsCalculator
+from ...domain.statistics import Statistics, StatisticsCalculator
 from ..widgets.stat_card import StatCard
 
 
@@ -28,48 +29,82 @@ class StatisticsScreen(Screen):
         self.repository = repository
 
     def compose(self) -> ComposeResult:
-        """Compose the statistics screen."""
-        database = self.repository.load()
-        stats = StatisticsCalculator.calculate(database.cards, datetime.now())
+        """Compose the statistics screen.
 
+        Renders placeholders immediately; values are filled in once the
+        database has loaded in the background.
+        """
         yield Header()
         yield Container(
             Static("Statistics", id="title"),
             Horizontal(
-                StatCard("Total Cards", str(stats.total_cards), "blue"),
-                StatCard("Due Today", str(stats.cards_due_today), "red"),
-                StatCard("Due This Week", str(stats.cards_due_this_week), "yellow"),
-                StatCard("Reviewed Today", str(stats.cards_reviewed_today), "green"),
-                id="stats-row"
+                StatCard("Total Cards", "…", "blue", id="stat-total"),
+                StatCard("Due Today", "…", "red", id="stat-due"),
+                StatCard("Due This Week", "…", "yellow", id="stat-due-week"),
+                StatCard("Reviewed Today", "…", "green", id="stat-reviewed"),
+                classes="stats-row"
             ),
             Horizontal(
-                StatCard("Streak", f"{stats.review_streak_days} days", "cyan"),
-                StatCard("Avg Ease", f"{stats.average_ease_factor:.2f}", "purple"),
-                id="stats-row"
+                StatCard("Streak", "…", "cyan", id="stat-streak"),
+                StatCard("Avg Ease", "…", "purple", id="stat-ease"),
+                StatCard("Retention", "…", "green", id="stat-retention"),
+                classes="stats-row"
             ),
             Container(
                 Static("Mastery Distribution", classes="stat-section-title"),
-                Static(f"New: {stats.mastery_distribution['new']}"),
-                Static(f"Learning: {stats.mastery_distribution['learning']}"),
-                Static(f"Mastered: {stats.mastery_distribution['mastered']}"),
+                Static("New: …", id="mastery-new"),
+                Static("Learning: …", id="mastery-learning"),
+                Static("Mastered: …", id="mastery-mastered"),
                 classes="stat-section"
             ),
             Container(
                 Static("Top Tags", classes="stat-section-title"),
-                *[
-                    Static(f"{tag}: {count}")
-                    for tag, count in sorted(
-                        stats.tag_distribution.items(),
-                        key=lambda x: x[1],
-                        reverse=True
-                    )[:10]
-                ],
+                Static("Loading…", id="top-tags"),
                 classes="stat-section"
             ),
             Button("Back (Esc)", id="btn-back"),
         )
         yield Footer()
 
+    def on_mount(self) -> None:
+        """Start loading statistics once the placeholders have been painted."""
+        # Parsing holds the GIL, so let the skeleton reach the screen first
+        self.call_after_refresh(self.run_worker, self._load_stats(), exclusive=True)
+
+    async def _load_stats(self) -> None:
+        """Load the database and compute stats off the event loop."""
+        database = await self.repository.asnapshot()
+        stats = await asyncio.to_thread(
+            StatisticsCalculator.calculate, database.cards, datetime.now(), database.archive
+        )
+        self._show_stats(stats)
+
+    def _show_stats(self, stats: Statistics) -> None:
+        """Fill the placeholders with calculated statistics."""
+        self.query_one("#stat-total", StatCard).set_value(str(stats.total_cards))
+        self.query_one("#stat-due", StatCard).set_value(str(stats.cards_due_today))
+        self.query_one("#stat-due-week", StatCard).set_value(str(stats.cards_due_this_week))
+        self.query_one("#stat-reviewed", StatCard).set_value(str(stats.cards_reviewed_today))
+        self.query_one("#stat-streak", StatCard).set_value(f"{stats.review_streak_days} days")
+        self.query_one("#stat-ease", StatCard).set_value(f"{stats.average_ease_factor:.2f}")
+        self.query_one("#stat-retention", StatCard).set_value(f"{stats.retention_rate:.0%}")
+
+        mastery = stats.mastery_distribution
+        self.query_one("#mastery-new", Static).update(f"New: {mastery['new']}")
+        self.query_one("#mastery-learning", Static).update(f"Learning: {mastery['learning']}")
+        self.query_one("#mastery-mastered", Static).update(f"Mastered: {mastery['mastered']}")
+
+        # Parent tags are listed with their whole subtree's count
+        top_tags = sorted(
+            [*stats.tag_distribution.items(),
+             *((f"{tag}::*", count) for tag, count in stats.tag_subtrees.items())],
+            key=lambda x: x[1],
+            reverse=True
+        )[:10]
+        self.query_one("#top-tags", Static).update(
+            "\n".join(f"{tag}: {count}" for tag, count in top_tags)
+        )
+
     def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button press."""
         if event.button.id == "btn-back":
@@ -1,10 +1,105 @@
 """Widget for displaying flash cards."""
 
-import re
+from functools import lru_cache
+from typing import Optional
+
 from textual.widgets import Static
 from rich.text import Text
 
 from ...data.models import FlashCard
+from ...domain.cloze import ClozeError, parse_cloze
+
+# Rendered cards kept across widgets; covers a quiz session's worth of cards
+# in both question and answer state
+RENDER_CACHE_SIZE = 512
+
+CLOZE_BLANK = "_____"
+
+
+def render_card(card: FlashCard, show_answer: bool = False) -> Text:
+    """Render a card, reusing a cached result for unchanged content.
+
+    Args:
+        card: The flash card to render
+        show_answer: Whether to show the answer
+
+    Returns:
+        Rendered card text (shared; do not modify)
+    """
+    options = tuple(card.options) if card.options else None
+    return _render(card.type, card.question, card.answer, options, show_answer)
+
+
+@lru_cache(maxsize=RENDER_CACHE_SIZE)
+def _render(
+    card_type: str,
+    question: str,
+    answer: str,
+    options: Optional[tuple[str, ...]],
+    show_answer: bool
+) -> Text:
+    if card_type == "qa":
+        return _render_qa(question, answer, show_answer)
+    elif card_type == "cloze":
+        return _render_cloze(question, show_answer)
+    else:
+        return _render_multiple_choice(question, answer, options, show_answer)
+
+
+def _render_qa(question: str, answer: str, show_answer: bool) -> Text:
+    """Render Q&A card."""
+    content = Text()
+    content.append("Question:\n", style="bold cyan")
+    content.append(question + "\n\n")
+
+    if show_answer:
+        content.append("Answer:\n", style="bold green")
+        content.append(answer)
+
+    return content
+
+
+def _render_cloze(question: str, show_answer: bool) -> Text:
+    """Render cloze deletion card."""
+    content = Text()
+
+    try:
+        segments = parse_cloze(question)
+    except ClozeError:
+        # Malformed markup: show the raw question rather than guessing
+        content.append(question)
+        return content
+
+    for segment in segments:
+        if not segment.is_deletion:
+            content.append(segment.text)
+        elif show_answer:
+            # Highlight the answer
+            content.append(segment.text, style="bold green on #3a3a3a")
+        else:
+            content.append(CLOZE_BLANK)
+
+    return content
+
+
+def _render_multiple_choice(
+    question: str,
+    answer: str,
+    options: Optional[tuple[str, ...]],
+    show_answer: bool
+) -> Text:
+    """Render multiple choice card."""
+    content = Text()
+    content.append(question + "\n\n", style="bold")
+
+    if options:
+        for i, option in enumerate(options, 1):
+            if show_answer and option == answer:
+                content.append(f"{i}. {option}\n", style="bold green")
+            else:
+                content.append(f"{i}. {option}\n")
+
+    return content
 
 
 class CardDisplay(Static):
@@ -24,59 +119,7 @@ class CardDisplay(Static):
 
     def render(self) -> Text:
         """Render card based on type."""
-        if self.card.type == "qa":
-            return self._render_qa()
-        elif self.card.type == "cloze":
-            return self._render_cloze()
-        else:
-            return self._render_multiple_choice()
-
-    def _render_qa(self) -> Text:
-        """Render Q&A card."""
-        content = Text()
-        content.append("Question:\n", style="bold cyan")
-        content.append(self.card.question + "\n\n")
-
-        if self.show_answer:
-            content.append("Answer:\n", style="bold green")
-            content.append(self.card.answer)
-
-        return content
-
-    def _render_cloze(self) -> Text:
-        """Render cloze deletion card."""
-        content = Text()
-
-        if self.show_answer:
-            # Highlight the answer
-            pattern = r'\{\{(.+?)\}\}'
-            parts = re.split(pattern, self.card.question)
-
-            for i, part in enumerate(parts):
-                if i % 2 == 1:  # This is the answer part
-                    content.append(part, style="bold green on #3a3a3a")
-                else:
-                    content.append(part)
-        else:
-            # Replace with blanks
-            text = re.sub(r'\{\{.+?\}\}', '_____', self.card.question)
-            content.append(text)
-
-        return content
-
-    def _render_multiple_choice(self) -> Text:
-        """Render multiple choice card."""
-        content = Text()
-        content.append(self.card.question + "\n\n", style="bold")
-
-        if self.card.options:
-            for i, option in enumerate(self.card.options, 1):
-                if self.show_answer and option == self.card.answer:
-                    content.append(f"{i}. {option}\n", style="bold green")
-                else:
-                    content.append(f"{i}. {option}\n")
-
-        return content
+        return render_card(self.card, self.show_answer)
 
     def set_show_answer(self, show: bool) -> None:
         """Update whether to show answer.
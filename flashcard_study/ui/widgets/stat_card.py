@@ -1,5 +1,6 @@
 """Stat card widget for dashboard."""
 
+from typing import Optional
 from textual.app import ComposeResult
 from textual.containers import Container
 from textual.widgets import Static
@@ -8,15 +9,22 @@ from textual.widgets import Static
 class StatCard(Container):
     """A card displaying a single statistic."""
 
-    def __init__(self, label: str, value: str, color: str = "cyan"):
+    def __init__(
+        self,
+        label: str,
+        value: str,
+        color: str = "cyan",
+        id: Optional[str] = None
+    ):
         """Initialize stat card.
 
         Args:
             label: The stat label (e.g., "Due Today")
             value: The stat value (e.g., "5")
             color: Color name for styling
+            id: Optional widget ID
         """
-        super().__init__()
+        super().__init__(id=id)
         self.label = label
         self.value = value
         self.color = color
@@ -26,3 +34,13 @@ class StatCard(Container):
         """Compose the stat card."""
         yield Static(self.value, classes="stat-value")
         yield Static(self.label, classes="stat-label")
+
+    def set_value(self, value: str) -> None:
+        """Update the displayed value.
+
+        Args:
+            value: New stat value
+        """
+        self.value = value
+        if self.is_mounted:
+            self.query_one(".stat-value", Static).update(value)
@@ -0,0 +1,58 @@
+"""Shared fixtures.
+
+HOME points at a throwaway directory before the package is imported, so
+default deck paths (computed at import time) never touch a real deck.
+"""
+
+import os
+import tempfile
+
+os.environ["HOME"] = tempfile.mkdtemp(prefix="flashcard-tests-")
+
+from datetime import datetime  # noqa: E402
+
+import pytest  # noqa: E402
+from typer.testing import CliRunner  # noqa: E402
+
+from flashcard_study.cli import app  # noqa: E402
+from flashcard_study.data import catalog  # noqa: E402
+from flashcard_study.data.models import FlashCard  # noqa: E402
+from flashcard_study.data.repository import FlashCardRepository  # noqa: E402
+
+# Fixed reference time, so schedules are reproducible
+NOW = datetime(2025, 3, 1, 9, 0)
+
+
+@pytest.fixture
+def make_card():
+    """Factory for cards created at NOW, with any field overridden."""
+    def make(question="What is 2 + 2?", answer="4", tags=None, type="qa", options=None, **fields):
+        card = FlashCard.new(type, question, answer, tags, options, now=NOW)
+        return card.model_copy(update=fields) if fields else card
+    return make
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Repository for an empty deck in a temporary directory."""
+    return FlashCardRepository(tmp_path / "flashcards.json")
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """Point the default deck, named decks and the catalog into tmp_path."""
+    root = tmp_path / ".flashcards"
+    monkeypatch.setattr(catalog, "DEFAULT_FLASHCARD_PATH", root / "flashcards.json")
+    monkeypatch.setattr(catalog, "DECKS_DIR", root / "decks")
+    monkeypatch.setattr(catalog, "DECK_CATALOG_PATH", root / "catalog.json")
+    return root
+
+
+@pytest.fixture
+def run_cli(home):
+    """Run the CLI against the temporary home; returns the click Result."""
+    runner = CliRunner()
+
+    def run(*args, input=None):
+        return runner.invoke(app, list(args), input=input)
+    return run
@@ -0,0 +1,58 @@
+"""Tests for the JSONL 'add' command."""
+
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from flashcard_study.data.models import CardSpec
+from flashcard_study.data.repository import FlashCardRepository
+
+
+def _lines(*specs):
+    return "".join(json.dumps(spec) + "\n" for spec in specs)
+
+
+def test_card_spec_accepts_comma_separated_tags():
+    spec = CardSpec.model_validate({"question": "Q", "answer": "A", "tags": "a, b,,c"})
+    assert spec.tags == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("spec", [
+    {"question": " ", "answer": "A"},
+    {"question": "Q", "answer": "A", "type": "multiple_choice"},
+    {"question": "No blank here", "answer": "A", "type": "cloze"},
+])
+def test_card_spec_rejects_invalid_cards(spec):
+    with pytest.raises(ValidationError):
+        CardSpec.model_validate(spec)
+
+
+def test_add_appends_every_card(run_cli):
+    result = run_cli("add", input=_lines(
+        {"question": "What is O(1)?", "answer": "Constant time", "tags": ["algorithms"]},
+        {"question": "The {{GIL}} serializes bytecode", "answer": "GIL", "type": "cloze"},
+    ))
+
+    assert result.exit_code == 0, result.output
+    cards = FlashCardRepository().load().cards
+    assert [card.type for card in cards] == ["qa", "cloze"]
+    assert cards[0].tags == ["algorithms"]
+
+
+def test_add_writes_nothing_if_a_line_is_invalid(run_cli):
+    result = run_cli("add", input=_lines({"question": "Q", "answer": "A"}) + "{not json\n")
+
+    assert result.exit_code == 1
+    assert "Line 2" in result.output
+    assert FlashCardRepository().load().cards == []
+
+
+def test_add_skip_invalid_keeps_valid_lines(run_cli):
+    result = run_cli("add", "--skip-invalid", input=_lines(
+        {"question": "Q", "answer": "A"},
+        {"question": "Q2"},
+    ))
+
+    assert result.exit_code == 1
+    assert len(FlashCardRepository().load().cards) == 1
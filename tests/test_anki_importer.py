@@ -0,0 +1,58 @@
+"""Tests for importing Anki packages."""
+
+from flashcard_study.domain.anki_exporter import AnkiExporter
+from flashcard_study.domain.anki_importer import AnkiImporter
+
+
+def _cards(make_card):
+    return [
+        make_card("Capital of France?", "Paris", ["geo"]),
+        make_card("The {{answer}} is 42", "answer", ["trivia"], type="cloze"),
+        make_card("Pick a prime", "7", ["math"], type="multiple_choice", options=["4", "6", "7", "9"]),
+    ]
+
+
+def test_round_trip_through_exporter(tmp_path, make_card):
+    cards = _cards(make_card)
+    package = tmp_path / "deck.apkg"
+    AnkiExporter("Deck").export(cards, package)
+
+    summary = AnkiImporter().import_cards(package)
+
+    assert summary.duplicates == 0
+    assert {card.id for card in summary.imported} == {card.id for card in cards}
+    imported = {card.id: card for card in summary.imported}
+    for card in cards:
+        assert imported[card.id].type == card.type
+        assert imported[card.id].answer == card.answer
+
+
+def test_reimport_skips_existing_cards(tmp_path, make_card):
+    cards = _cards(make_card)
+    package = tmp_path / "deck.apkg"
+    AnkiExporter("Deck").export(cards, package)
+
+    summary = AnkiImporter().import_cards(package, existing=cards)
+
+    assert summary.imported == []
+    assert summary.duplicates == len(cards)
+
+
+def test_extra_tags_are_added(tmp_path, make_card):
+    package = tmp_path / "deck.apkg"
+    AnkiExporter("Deck").export(_cards(make_card)[:1], package)
+
+    summary = AnkiImporter().import_cards(package, tags=["imported"])
+
+    assert set(summary.imported[0].tags) == {"geo", "imported"}
+
+
+def test_same_content_under_another_id_is_a_duplicate(tmp_path, make_card):
+    package = tmp_path / "deck.apkg"
+    AnkiExporter("Deck").export(_cards(make_card)[:1], package)
+    existing = make_card("Capital of France?", "Paris")
+
+    summary = AnkiImporter().import_cards(package, existing=[existing])
+
+    assert summary.imported == []
+    assert summary.duplicates == 1
@@ -0,0 +1,103 @@
+"""Tests for the cold-tier archive."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from flashcard_study.app import FlashcardStudyApp
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.repository import FlashCardRepository
+from flashcard_study.domain.archive import is_cold
+from flashcard_study.ui.screens.card_list import CardListScreen
+
+
+@pytest.fixture
+def cold(make_card):
+    """A mastered card with a long interval, reviewed before today."""
+    now = datetime.now()
+    return make_card(
+        "Archived question", "Archived answer", ["history"],
+        review_count=12, interval_days=90.0,
+        last_reviewed=now - timedelta(days=2), next_review=now + timedelta(days=88),
+    )
+
+
+@pytest.fixture
+def deck(repository, make_card, cold):
+    hot = make_card("Hot question", "Hot answer")
+    repository.save(FlashCardDatabase(cards=[hot, cold]))
+    return hot, cold
+
+
+def test_save_moves_cold_cards_to_the_archive(repository, deck):
+    hot, cold = deck
+    database = repository.load()
+
+    assert is_cold(cold, datetime.now())
+    assert [card.id for card in database.cards] == [hot.id]
+    assert database.archive.count == 1
+    assert [card.id for card in repository.archived_cards(database)] == [cold.id]
+    assert repository.all_cards(database) == [hot, cold]
+
+
+def test_promote_due_and_unarchive(repository, deck):
+    _, cold = deck
+
+    assert repository.promote_due(datetime.now()) == 0
+    assert repository.promote_due(cold.next_review + timedelta(days=1)) == 1
+
+    database = repository.load()
+    assert repository.unarchive(database, [cold.id]) == 1
+    assert cold.id in {card.id for card in database.cards}
+    assert database.archive is None
+
+
+def test_listing_and_lookup_include_archived_cards(repository, deck):
+    hot, cold = deck
+
+    assert repository.count() == 2
+    assert repository.page(0, 10) == [hot, cold]
+    assert repository.page(0, 1, sort_by="next_review", descending=True) == [cold]
+    assert repository.get_cards([cold.id]) == [cold]
+    assert repository.get_card(cold.id) == cold
+
+
+def test_update_card_finds_archived_cards(repository, deck):
+    _, cold = deck
+
+    repository.update_card(cold.model_copy(update={"answer": "Edited"}))
+
+    assert repository.get_card(cold.id).answer == "Edited"
+    assert repository.count() == 2
+
+
+def test_delete_card_removes_archived_cards(repository, deck):
+    hot, cold = deck
+
+    repository.delete_card(cold.id)
+
+    assert repository.get_card(cold.id) is None
+    assert [card.id for card in repository.all_cards(repository.load())] == [hot.id]
+    # A fresh repository reads the rewritten archive from disk
+    assert FlashCardRepository(repository.file_path).count() == 1
+
+
+def test_card_list_searches_archived_cards(home, make_card, cold):
+    FlashCardRepository().save(FlashCardDatabase(cards=[make_card("Hot question", "A"), cold]))
+
+    async def run():
+        app = FlashcardStudyApp()
+        async with app.run_test() as pilot:
+            screen = CardListScreen(app.repository)
+            await app.push_screen(screen)
+            for _ in range(100):
+                if screen.total:
+                    break
+                await pilot.pause(0.05)
+            total = screen.total
+            await pilot.press("slash", *"archived")
+            await pilot.pause()
+            return total, [card.id for card in screen.window_cards]
+
+    assert asyncio.run(run()) == (2, [cold.id])
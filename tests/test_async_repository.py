@@ -0,0 +1,47 @@
+"""Tests for the async repository API and the skeleton-first home screen."""
+
+import asyncio
+from datetime import timedelta
+
+from flashcard_study.app import FlashcardStudyApp
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.repository import FlashCardRepository
+from flashcard_study.ui.screens.home import HomeScreen
+from flashcard_study.ui.widgets.stat_card import StatCard
+
+from .conftest import NOW
+
+
+def test_asave_and_aload_round_trip(repository, make_card):
+    card = make_card()
+
+    async def run():
+        await repository.asave(FlashCardDatabase(cards=[card]))
+        return await repository.aload(), await repository.asnapshot()
+
+    loaded, snapshot = asyncio.run(run())
+
+    assert loaded.cards == [card]
+    assert snapshot.cards == [card]
+
+
+def test_home_screen_fills_stats_after_loading(home, make_card):
+    cards = [make_card(next_review=NOW - timedelta(days=1)) for _ in range(3)]
+    FlashCardRepository().save(FlashCardDatabase(cards=cards))
+
+    async def run():
+        app = FlashcardStudyApp()
+        async with app.run_test() as pilot:
+            screen = app.screen
+            assert isinstance(screen, HomeScreen)
+            for _ in range(100):
+                if screen.counters is not None:
+                    break
+                await pilot.pause(0.05)
+            await pilot.pause()
+            return (
+                screen.query_one("#stat-total", StatCard).value,
+                screen.query_one("#stat-due", StatCard).value,
+            )
+
+    assert asyncio.run(run()) == ("3", "3")
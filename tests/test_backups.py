@@ -0,0 +1,121 @@
+"""Tests for backup generations, retention and restore."""
+
+from datetime import datetime, timedelta
+
+from flashcard_study.data.backups import Generation, retained
+from flashcard_study.data.models import BackupPolicy, FlashCardDatabase
+from flashcard_study.data.repository import FlashCardRepository
+from flashcard_study.data.segments import manifest_segments
+
+from .conftest import NOW
+
+
+def _save_versions(repository, make_card, count):
+    """Save `count` versions of the deck, one more card each time."""
+    cards = []
+    for i in range(count):
+        cards.append(make_card(question=f"Q{i}"))
+        repository.save(FlashCardDatabase(cards=list(cards)))
+    return cards
+
+
+def test_each_save_keeps_the_previous_manifest(repository, make_card):
+    _save_versions(repository, make_card, 3)
+
+    generations = repository.backups.generations()
+
+    assert len(generations) == 2
+    assert not any(generation.compressed for generation in generations)
+    assert [len(repository.backups.load(g).cards) for g in generations] == [2, 1]
+
+
+def test_generations_share_segment_files(repository, make_card):
+    _save_versions(repository, make_card, 2)
+    generation = repository.backups.generations()[0]
+
+    assert manifest_segments(generation.path)
+    assert set(manifest_segments(generation.path)) <= repository.backups.pinned_segments()
+    for name in manifest_segments(generation.path):
+        assert (repository.file_path.with_suffix(".segments") / name).exists()
+
+
+def test_restore_can_be_undone(repository, make_card):
+    _save_versions(repository, make_card, 3)
+    oldest = repository.backups.generations()[-1]
+
+    restored = repository.restore(oldest.name)
+    assert [card.question for card in restored.cards] == ["Q0"]
+    assert [card.question for card in repository.load().cards] == ["Q0"]
+
+    latest = repository.backups.generations()[0]
+    repository.restore(latest.name)
+    assert len(repository.load().cards) == 3
+
+
+def test_unreadable_manifest_falls_back_to_a_generation(repository, make_card):
+    _save_versions(repository, make_card, 2)
+    repository.file_path.write_text("{ not json")
+
+    assert [card.question for card in repository.load().cards] == ["Q0"]
+
+
+def test_retention_keeps_recent_and_oldest_per_slot():
+    def generation(taken):
+        return Generation(taken.strftime("%Y%m%dT%H%M%S%f"), taken, None, None)
+
+    generations = [generation(NOW - timedelta(hours=h)) for h in range(0, 72, 6)]
+    kept = retained(generations, BackupPolicy(recent=2, hourly=0, daily=2, weekly=0))
+
+    assert [kept.get(g.name) for g in generations[:2]] == ["recent", "recent"]
+    daily = [g.taken for g in generations if kept.get(g.name) == "daily"]
+    # Today's oldest generation is already kept as a recent one
+    assert daily == [datetime(2025, 2, 28, 3, 0)]
+    assert len(kept) == 3
+
+
+def test_rotation_compresses_old_and_drops_unkept(repository, make_card):
+    _save_versions(repository, make_card, 4)
+    database = repository.load()
+    database.backups = BackupPolicy(recent=1, hourly=1, daily=0, weekly=0)
+    repository.save(database)
+
+    generations = repository.backups.generations()
+    assert [g.compressed for g in generations] == [False, True]
+    assert [card.question for card in repository.backups.load(generations[1]).cards] == ["Q0"]
+
+
+def test_archive_is_backed_up_as_a_generation(repository, make_card):
+    now = datetime.now()
+    cold = [
+        make_card(
+            question=f"Cold {i}", review_count=12, interval_days=90.0,
+            last_reviewed=now - timedelta(days=2), next_review=now + timedelta(days=88),
+        )
+        for i in range(2)
+    ]
+    repository.save(FlashCardDatabase(cards=cold[:1]))
+    database = repository.load()
+    database.cards = cold[1:]
+    repository.save(database)
+
+    generations = repository.archive_backups.generations()
+    assert not repository.archive_path.with_suffix(".json.bak").exists()
+    assert [len(repository.archive_backups.load(g).cards) for g in generations] == [1]
+
+    repository.archive_path.write_text("{ not json")
+    database = repository.load()
+    assert [card.question for card in repository.archived_cards(database)] == ["Cold 0"]
+
+
+def test_backups_and_restore_commands(run_cli, home, make_card):
+    repository = FlashCardRepository(home / "flashcards.json")
+    _save_versions(repository, make_card, 2)
+    generation = repository.backups.generations()[0].name
+
+    listed = run_cli("backups")
+    restored = run_cli("restore", generation)
+    missing = run_cli("restore", "19990101T000000000000")
+
+    assert listed.exit_code == 0 and generation in listed.output
+    assert "Restored 1 card(s)" in restored.output
+    assert missing.exit_code == 1 and "No backup generation" in missing.output
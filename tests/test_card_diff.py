@@ -0,0 +1,92 @@
+"""Tests for card-level deck diffs and incrementally kept dashboard counts."""
+
+import threading
+from datetime import timedelta
+
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.domain import card_diff
+from flashcard_study.domain.card_diff import diff_cards
+from flashcard_study.domain.spaced_repetition import apply_review
+from flashcard_study.domain.statistics import DashboardCounters
+
+from .conftest import NOW
+
+
+def test_diff_finds_added_updated_and_removed(make_card):
+    kept, edited, removed = make_card("Kept"), make_card("Edited"), make_card("Removed")
+    new_edited = edited.model_copy(update={"answer": "changed"})
+    added = make_card("Added")
+
+    diff = diff_cards([kept, edited, removed], [kept, new_edited, added])
+
+    assert diff.added == [added]
+    assert diff.updated == [(edited, new_edited)]
+    assert diff.removed == [removed]
+    assert diff.changed_ids() == {added.id, edited.id, removed.id}
+
+
+def test_identical_decks_have_an_empty_diff(make_card):
+    cards = [make_card("A"), make_card("B")]
+    copies = [card.model_copy() for card in cards]
+
+    assert not diff_cards(cards, cards)
+    assert not diff_cards(cards, copies)
+
+
+def test_diff_compares_the_digests_kept_per_card(make_card, monkeypatch):
+    cards = [make_card("A"), make_card("B")]
+    copies = [card.model_copy() for card in cards]
+    digests = {card.id: str(i) for i, card in enumerate(cards)}
+    monkeypatch.setattr(card_diff, "card_digest", lambda card: 1 / 0)
+
+    assert not diff_cards(cards, copies, digests, dict(digests))
+    changed = diff_cards(cards, copies, digests, {**digests, cards[1].id: "edited"})
+    assert changed.updated == [(cards[1], copies[1])]
+
+
+def test_snapshot_stays_consistent_while_another_thread_saves(repository, make_card):
+    repository.save(FlashCardDatabase(cards=[make_card(f"Card {i}") for i in range(20)]))
+    done = threading.Event()
+
+    def save_repeatedly():
+        for i in range(20):
+            database = repository.load()
+            database.cards.append(make_card(f"Extra {i}"))
+            repository.save(database)
+        done.set()
+
+    saver = threading.Thread(target=save_repeatedly)
+    saver.start()
+    while not done.is_set():
+        ids = [card.id for card in repository.page(0, 1000, sort_by="created_at")]
+        assert [card.id for card in repository.get_cards(ids)] == ids
+    saver.join()
+
+    assert repository.count() == 40
+    assert len(repository.page(0, 1000, sort_by="created_at")) == 40
+
+
+def test_counters_follow_diffs_like_a_recount(make_card):
+    now = NOW + timedelta(days=1)
+    old = [make_card(f"Card {i}") for i in range(5)]
+    counters = DashboardCounters(old, now)
+
+    new = list(old)
+    new[0] = apply_review(old[0], 1.0, now)
+    new[1] = apply_review(old[1], 0.0, now - timedelta(days=1))
+    del new[2]
+    new.append(make_card("Added"))
+    diff = diff_cards(old, new)
+    for card in diff.removed:
+        counters.remove(card)
+    for before, after in diff.updated:
+        counters.remove(before)
+        counters.add(after)
+    for card in diff.added:
+        counters.add(card)
+
+    recount = DashboardCounters(new, now)
+    assert (counters.total, counters.due_today, counters.reviewed_today, counters.streak) == (
+        recount.total, recount.due_today, recount.reviewed_today, recount.streak
+    )
+    assert (counters.total, counters.reviewed_today, counters.streak) == (5, 1, 2)
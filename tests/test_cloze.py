@@ -0,0 +1,56 @@
+"""Tests for the shared cloze parser and cached card rendering."""
+
+import pytest
+
+from flashcard_study.domain.cloze import ClozeError, ClozeSegment, deletions, parse_cloze, to_anki
+from flashcard_study.ui.widgets.card_display import CLOZE_BLANK, render_card
+
+
+def test_parse_splits_text_and_deletions():
+    segments = parse_cloze("The {{GIL}} guards {{bytecode}}.")
+
+    assert segments == (
+        ClozeSegment("The "),
+        ClozeSegment("GIL", is_deletion=True),
+        ClozeSegment(" guards "),
+        ClozeSegment("bytecode", is_deletion=True),
+        ClozeSegment("."),
+    )
+    assert deletions(segments) == ["GIL", "bytecode"]
+    assert to_anki(segments) == "The {{c1::GIL}} guards {{c1::bytecode}}."
+
+
+def test_parse_is_cached():
+    assert parse_cloze("a {{b}} c") is parse_cloze("a {{b}} c")
+
+
+@pytest.mark.parametrize("text", [
+    "no deletion",
+    "unclosed {{answer",
+    "stray }} close",
+    "nested {{a {{b}} c}}",
+    "empty {{ }} deletion",
+])
+def test_parse_rejects_malformed_markup(text):
+    with pytest.raises(ClozeError):
+        parse_cloze(text)
+
+
+def test_render_cloze_hides_and_reveals(make_card):
+    card = make_card("The {{GIL}} guards bytecode", "GIL", type="cloze")
+
+    assert render_card(card).plain == f"The {CLOZE_BLANK} guards bytecode"
+    assert render_card(card, show_answer=True).plain == "The GIL guards bytecode"
+
+
+def test_render_is_shared_between_cards_with_the_same_content(make_card):
+    first = make_card("Same question", "Same answer")
+    second = make_card("Same question", "Same answer")
+
+    assert render_card(first) is render_card(second)
+    assert render_card(first) is not render_card(first, show_answer=True)
+
+
+def test_render_malformed_cloze_shows_raw_question(make_card):
+    card = make_card("Broken {{markup", "x", type="cloze")
+    assert render_card(card).plain == "Broken {{markup"
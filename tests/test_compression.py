@@ -0,0 +1,57 @@
+"""Tests for compressed segment files."""
+
+import gzip
+
+import pytest
+
+from flashcard_study.data.compression import compress, read_bytes
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.segments import manifest_segments, segment_dir, segment_files
+
+
+@pytest.mark.parametrize("codec, suffix", [("gzip", ".gz"), ("lzma", ".xz"), (None, "")])
+def test_read_bytes_decompresses_by_extension(tmp_path, codec, suffix):
+    data = b'{"cards": []}' * 100
+    path = tmp_path / f"deck.json{suffix}"
+    path.write_bytes(compress(data, codec))
+
+    assert read_bytes(path) == data
+    assert (path.stat().st_size < len(data)) == (codec is not None)
+
+
+def test_gzip_output_is_reproducible():
+    # Segment names are content hashes, so equal input must give equal files
+    assert compress(b"x" * 1000, "gzip") == compress(b"x" * 1000, "gzip")
+
+
+def test_changing_codec_rewrites_every_segment(repository, make_card):
+    cards = [make_card(question=f"Q{i}") for i in range(5)]
+    repository.save(FlashCardDatabase(cards=cards))
+
+    database = repository.load()
+    database.compression = "gzip"
+    repository.save(database)
+
+    names = manifest_segments(repository.file_path)
+    assert names and all(name.endswith(".json.gz") for name in names)
+    assert gzip.decompress((segment_dir(repository.file_path) / names[0]).read_bytes())
+    assert repository.load().cards == cards
+
+    database = repository.load()
+    database.compression = None
+    repository.save(database)
+    assert all(name.endswith(".json") for name in manifest_segments(repository.file_path))
+    assert repository.load().cards == cards
+
+
+def test_compression_command(run_cli, home, make_card):
+    run_cli("add", input='{"question": "Q", "answer": "A"}\n')
+
+    assert "Compression: none" in run_cli("compression").output
+    assert run_cli("compression", "lzma").exit_code == 0
+    assert "Compression: lzma" in run_cli("compression").output
+    files = segment_files(segment_dir(home / "flashcards.json"))
+    assert any(path.name.endswith(".json.xz") for path in files)
+
+    result = run_cli("compression", "zip")
+    assert result.exit_code == 1 and "unknown codec" in result.output
@@ -0,0 +1,86 @@
+"""Tests for the deck daemon: service methods, dispatch and the socket client."""
+
+import json
+import threading
+from datetime import timedelta
+
+import pytest
+
+from flashcard_study.daemon import (
+    INVALID_PARAMS, METHOD_NOT_FOUND, PARSE_ERROR,
+    DaemonClient, DaemonError, DaemonServer, DeckService, socket_path,
+)
+from flashcard_study.data.models import FlashCardDatabase
+
+from .conftest import NOW
+
+
+@pytest.fixture
+def service(repository, make_card):
+    cards = [
+        make_card("Due question", "A", ["python"], next_review=NOW - timedelta(days=1)),
+        make_card(
+            "Later question", "B", ["web"],
+            last_reviewed=NOW, review_count=1, next_review=NOW + timedelta(days=3650),
+        ),
+    ]
+    repository.save(FlashCardDatabase(cards=cards))
+    return DeckService(repository)
+
+
+def test_select_returns_due_cards(service):
+    selected = service.select()
+    assert [card["question"] for card in selected] == ["Due question"]
+    assert len(service.select(include_all=True)) == 2
+    assert service.select(tags=["web"]) == []
+
+
+def test_review_applies_and_saves(service, repository):
+    card_id = str(repository.load().cards[0].id)
+
+    result = service.review([[card_id, 1.0, NOW.isoformat()], ["00000000-0000-0000-0000-000000000000", 1, NOW.isoformat()]])
+
+    assert result == {"applied": 1, "unknown": ["00000000-0000-0000-0000-000000000000"]}
+    assert repository.load().cards[0].review_count == 1
+
+
+def test_add_reports_near_duplicates(service, repository):
+    question = "What does the global interpreter lock prevent threads from doing at once"
+    service.add([{"question": question, "answer": "Run bytecode"}])
+
+    result = service.add([{"question": question, "answer": "Run bytecode"}], skip_duplicates=True)
+
+    assert result["added"] == []
+    assert [dup[3] for dup in result["duplicates"]] == [question]
+    assert len(repository.load().cards) == 3
+
+
+def test_dispatch_errors(service, tmp_path):
+    server = DaemonServer(tmp_path / "d.sock", service)
+    try:
+        assert server.dispatch(b"{nope")["error"]["code"] == PARSE_ERROR
+        assert server.dispatch(b'{"method": "drop"}')["error"]["code"] == METHOD_NOT_FOUND
+        bad = server.dispatch(json.dumps({"id": 1, "method": "add", "params": {"specs": [{"question": "Q"}]}}).encode())
+        assert bad["error"]["code"] == INVALID_PARAMS
+        bad_query = server.dispatch(json.dumps({"id": 2, "method": "select", "params": {"query": "ease<"}}).encode())
+        assert bad_query["error"]["code"] == INVALID_PARAMS
+    finally:
+        server.server_close()
+
+
+def test_client_round_trip(service):
+    path = socket_path(service.repository)
+    server = DaemonServer(path, service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with DaemonClient.connect(path) as client:
+            assert client.call("stats")["total_cards"] == 2
+            with pytest.raises(DaemonError):
+                client.call("select", count="many", unknown=True)
+        with pytest.raises(RuntimeError):
+            DaemonServer(path, service)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert DaemonClient.connect(path) is None
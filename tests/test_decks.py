@@ -0,0 +1,76 @@
+"""Tests for named decks, the deck catalog and the merged due queue."""
+
+from datetime import timedelta
+
+import pytest
+
+from flashcard_study.data.catalog import DeckCatalog, deck_names, deck_path
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.repository import FlashCardRepository
+from flashcard_study.domain.decks import merge_due, refresh_catalog
+
+from .conftest import NOW
+
+
+def _save_deck(name, cards):
+    FlashCardRepository(deck=name).save(FlashCardDatabase(cards=cards))
+
+
+def test_deck_paths(home):
+    assert deck_path("default") == home / "flashcards.json"
+    assert deck_path("python-3_x") == home / "decks" / "python-3_x.json"
+    for name in ("../escape", "-flag", "a b", ""):
+        with pytest.raises(ValueError):
+            deck_path(name)
+
+
+def test_saves_record_catalog_entries(home, make_card):
+    _save_deck("python", [make_card(next_review=NOW), make_card(next_review=NOW + timedelta(days=2))])
+    _save_deck("default", [make_card()])
+
+    entries = DeckCatalog().load()
+
+    assert deck_names() == ["default", "python"]
+    assert entries["python"].cards == 2
+    assert entries["python"].earliest_next_review == NOW
+    assert entries["python"].due_before((NOW + timedelta(days=1)).date()) == 1
+
+
+def test_refresh_recounts_changed_decks_and_forgets_deleted_ones(home, make_card):
+    _save_deck("python", [make_card()])
+    _save_deck("web", [make_card()])
+    # Saved without the catalog, like a hand edit
+    FlashCardRepository(deck_path("python")).save(FlashCardDatabase(cards=[make_card(), make_card()]))
+    deck_path("web").unlink()
+
+    entries = refresh_catalog()
+
+    assert {name: info.cards for name, info in entries.items()} == {"python": 2}
+    assert set(DeckCatalog().load()) == {"python"}
+
+
+def test_unreadable_catalog_reads_as_empty(home):
+    home.mkdir(parents=True)
+    (home / "catalog.json").write_text("not json")
+    assert DeckCatalog().load() == {}
+
+
+def test_merge_due_interleaves_decks_by_due_date(home, make_card):
+    a = [make_card(f"a{i}", next_review=NOW - timedelta(days=d)) for i, d in enumerate((5, 1))]
+    b = [make_card("b0", next_review=NOW - timedelta(days=3)), make_card("b1", next_review=NOW + timedelta(days=1))]
+    _save_deck("alpha", a)
+    _save_deck("beta", b)
+
+    merged = [(name, card.question) for name, card in merge_due(NOW)]
+
+    assert merged == [("alpha", "a0"), ("beta", "b0"), ("alpha", "a1")]
+    assert [card.question for _, card in merge_due(NOW, decks=["beta"])] == ["b0"]
+
+
+def test_cli_deck_option_selects_the_deck(run_cli, home):
+    result = run_cli("--deck", "spanish", "add", input='{"question": "Hola?", "answer": "Hello"}\n')
+
+    assert result.exit_code == 0, result.output
+    assert len(FlashCardRepository(deck="spanish").load().cards) == 1
+    assert not (home / "flashcards.json").exists()
+    assert run_cli("--deck", "../x", "add", input="").exit_code == 1
@@ -0,0 +1,102 @@
+"""Tests for the integrity check and repair (fsck)."""
+
+import json
+from datetime import timedelta
+
+from flashcard_study.data.models import FlashCardDatabase, ReviewHistory
+from flashcard_study.data.segments import manifest_segments, segment_dir
+from flashcard_study.domain.integrity import check_card, check_repository
+
+from .conftest import NOW
+
+
+def _segment(repository):
+    return segment_dir(repository.file_path) / manifest_segments(repository.file_path)[0]
+
+
+def test_check_card_repairs_impossible_values(make_card):
+    history = [
+        ReviewHistory(date=NOW + timedelta(days=2), score=1.5, interval_days=1.0),
+        ReviewHistory(date=NOW + timedelta(days=1), score=0.5, interval_days=1.0),
+    ]
+    card = make_card(
+        review_history=history, review_count=1, last_reviewed=NOW, ease_factor=9.0,
+        interval_days=-1.0, next_review=NOW,
+    )
+
+    repaired, found = check_card(card)
+
+    assert len(found) == 7
+    assert [entry.date for entry in repaired.review_history] == sorted(e.date for e in history)
+    assert max(entry.score for entry in repaired.review_history) == 1.0
+    assert repaired.review_count == 2
+    assert repaired.last_reviewed == NOW + timedelta(days=2)
+    assert repaired.ease_factor == 3.0 and repaired.interval_days == 0.0
+    assert repaired.next_review == repaired.last_reviewed
+    assert check_card(repaired) == (repaired, [])
+
+
+def test_clean_deck_has_no_problems(repository, make_card):
+    repository.save(FlashCardDatabase(cards=[make_card(question=f"Q{i}") for i in range(3)]))
+
+    report = check_repository(repository, workers=1)
+
+    assert report.ok and report.records == 3
+
+
+def test_invalid_records_are_reported_and_dropped(repository, make_card):
+    cards = [make_card(question=f"Q{i}") for i in range(3)]
+    repository.save(FlashCardDatabase(cards=cards))
+    records = json.loads(_segment(repository).read_text())
+    records[1]["ease_factor"] = "high"
+    _segment(repository).write_text(json.dumps(records))
+
+    report = check_repository(repository, workers=1)
+    database, archived = report.repaired()
+
+    assert [(p.position, p.repair) for p in report.problems] == [(1, "card dropped")]
+    assert database.cards == [cards[0], cards[2]] and archived == []
+
+
+def test_duplicate_ids_keep_the_highest_version(repository, make_card):
+    card = make_card()
+    newer = card.model_copy(update={"question": "Newer", "version": 3})
+    repository.save(FlashCardDatabase(cards=[make_card(question="Other")]))
+    records = json.loads(_segment(repository).read_text())
+    records += [json.loads(card.model_dump_json()), json.loads(newer.model_dump_json())]
+    _segment(repository).write_text(json.dumps(records))
+
+    report = check_repository(repository, workers=1)
+    database, _ = report.repaired()
+
+    assert len(report.problems) == 1 and "duplicate" in report.problems[0].message
+    assert [c.question for c in database.cards] == ["Other", "Newer"]
+
+
+def test_unreadable_manifest_is_rebuilt_from_segments(repository, make_card):
+    cards = [make_card(question=f"Q{i}") for i in range(2)]
+    repository.save(FlashCardDatabase(cards=cards))
+    repository.file_path.write_text("{ broken")
+
+    report = check_repository(repository, workers=1)
+
+    assert not report.ok
+    assert report.problems[0].repair == "rebuilt from segment files"
+    assert sorted(c.question for c in report.repaired()[0].cards) == ["Q0", "Q1"]
+
+
+def test_fsck_command_reports_then_repairs(run_cli, home, make_card):
+    run_cli("add", input='{"question": "Q1", "answer": "A"}\n{"question": "Q2", "answer": "A"}\n')
+    manifest = home / "flashcards.json"
+    path = segment_dir(manifest) / manifest_segments(manifest)[0]
+    records = json.loads(path.read_text())
+    records[0]["ease_factor"] = 0.5
+    path.write_text(json.dumps(records))
+
+    checked = run_cli("fsck")
+    repaired = run_cli("fsck", "--repair")
+    again = run_cli("fsck")
+
+    assert checked.exit_code == 1 and "1 problem(s)" in checked.output
+    assert repaired.exit_code == 0 and "Wrote repaired deck with 2 card(s)" in repaired.output
+    assert again.exit_code == 0 and "No problems in 2" in again.output
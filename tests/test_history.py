@@ -0,0 +1,135 @@
+"""Tests for review history compaction and non-mutating reviews."""
+
+from datetime import timedelta
+
+from flashcard_study.data.models import DEFAULT_HISTORY_LIMIT, FlashCardDatabase
+from flashcard_study.domain.history import (
+    compact_cards, compact_history, review_days, review_totals, streak_start
+)
+from flashcard_study.domain.spaced_repetition import apply_review, apply_reviews
+from flashcard_study.domain.statistics import StatisticsCalculator
+
+from .conftest import NOW
+
+
+def _reviewed(card, scores):
+    for day, score in enumerate(scores):
+        card = apply_review(card, score, NOW + timedelta(days=day))
+    return card
+
+
+def test_apply_review_leaves_the_input_card_untouched(make_card):
+    card = _reviewed(make_card(), [1.0])
+    history = list(card.review_history)
+
+    updated = apply_review(card, 0.0, NOW + timedelta(days=5))
+
+    assert card.review_history == history
+    assert updated.review_history is not card.review_history
+    assert len(updated.review_history) == 2
+
+
+def test_apply_reviews_appends_each_review_once(make_card):
+    card = _reviewed(make_card(), [1.0])
+    reviews = [(card.id, 1.0, NOW + timedelta(days=d)) for d in (3, 4, 5)]
+
+    cards, applied, _ = apply_reviews([card], reviews)
+
+    assert applied == 3
+    assert len(card.review_history) == 1
+    assert [entry.date for entry in cards[0].review_history][1:] == [r[2] for r in reviews]
+
+
+def test_compaction_keeps_totals_and_review_days(make_card):
+    card = _reviewed(make_card(), [1.0, 0.0, 1.0, 0.5, 0.0, 1.0])
+
+    compacted = compact_history(card, keep=2)
+
+    assert len(compacted.review_history) == 2
+    assert compacted.history_summary.count == 4
+    assert compacted.history_summary.first_review == NOW
+    assert review_totals(compacted) == review_totals(card) == (6, 2)
+    assert review_days(compacted) == review_days(card)
+
+
+def test_compacting_twice_merges_summaries(make_card):
+    card = _reviewed(make_card(), [1.0] * 6)
+
+    twice = compact_history(compact_history(card, keep=4), keep=1)
+
+    assert twice.history_summary.count == 5
+    assert review_days(twice) == review_days(card)
+
+
+def test_compact_cards_skips_short_histories(make_card):
+    short, long = _reviewed(make_card(), [1.0]), _reviewed(make_card(), [1.0] * 5)
+
+    cards, compacted, rolled = compact_cards([short, long], keep=2)
+
+    assert cards[0] is short
+    assert (compacted, rolled) == (1, 3)
+
+
+def test_save_compacts_when_a_history_limit_is_set(repository, make_card):
+    card = _reviewed(make_card(), [1.0] * 5)
+    repository.save(FlashCardDatabase(cards=[card], history_limit=2))
+
+    saved = repository.load().cards[0]
+
+    assert len(saved.review_history) == 2
+    assert review_totals(saved) == (5, 0)
+
+
+def test_saves_compact_by_default(repository, make_card):
+    card = _reviewed(make_card(), [0.0] * (DEFAULT_HISTORY_LIMIT + 5))
+    repository.save(FlashCardDatabase(cards=[card]))
+
+    saved = repository.load().cards[0]
+
+    assert len(saved.review_history) == DEFAULT_HISTORY_LIMIT
+    assert review_totals(saved) == review_totals(card)
+
+
+def test_history_limit_of_old_files_defaults_on():
+    old = FlashCardDatabase.model_validate({"version": "1.0", "history_limit": None})
+    off = FlashCardDatabase.model_validate({"version": "1.1", "history_limit": None})
+
+    assert old.history_limit == DEFAULT_HISTORY_LIMIT
+    assert off.history_limit is None
+
+
+def test_streak_start_ends_today_or_yesterday():
+    today = NOW.date()
+    days = [today - timedelta(days=d) for d in (1, 2, 3, 5, 6)]
+
+    assert streak_start(days, today) == today - timedelta(days=3)
+    assert streak_start(days + [today], today) == today - timedelta(days=3)
+    assert streak_start(days[3:], today) == today - timedelta(days=1)
+
+
+def test_compaction_only_keeps_review_days_of_the_streak(make_card):
+    # Reviews every other day for a while, then daily up to today
+    card = make_card()
+    for day in [-30, -28, -26, -24, -4, -3, -2, -1, 0]:
+        card = apply_review(card, 1.0, NOW + timedelta(days=day))
+    other = _reviewed(make_card(), [1.0])
+    now = NOW + timedelta(hours=1)
+
+    cards, _, _ = compact_cards([card, other], keep=2, today=now.date())
+
+    assert cards[0].history_summary.review_days == [
+        (NOW + timedelta(days=d)).date() for d in (-4, -3, -2)
+    ]
+    assert review_totals(cards[0]) == review_totals(card)
+    assert StatisticsCalculator._calculate_streak(cards, now) == 5
+    assert StatisticsCalculator._calculate_streak([card, other], now) == 5
+
+
+def test_reviewed_card_is_saved(repository, make_card):
+    repository.save(FlashCardDatabase(cards=[make_card()]))
+    database = repository.load()
+
+    database.cards[0] = apply_review(database.cards[0], 1.0, NOW)
+    repository.save(database)
+
+    assert repository.load().cards[0].review_count == 1
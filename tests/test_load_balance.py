@@ -0,0 +1,109 @@
+"""Tests for load-balanced review dates."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from flashcard_study.domain.load_balance import DueHistogram, LoadBalancer, fuzz_days
+from flashcard_study.domain.spaced_repetition import apply_review
+
+from .conftest import NOW
+
+START = NOW.date()
+
+
+def test_fuzz_days_grows_with_the_interval():
+    assert [fuzz_days(i) for i in (1, 2, 6, 20, 45, 365)] == [0, 1, 1, 2, 4, 7]
+
+
+def test_histogram_counts_days():
+    histogram = DueHistogram(START, [START, START + timedelta(days=3), START - timedelta(days=5)])
+    histogram.add(START + timedelta(days=3))
+    histogram.remove(START + timedelta(days=9))
+
+    assert histogram.count(START) == 2  # Overdue cards count towards today
+    assert histogram.count(START + timedelta(days=3)) == 2
+    assert histogram.count(START + timedelta(days=9)) == 0
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_least_loaded_matches_brute_force(seed):
+    rng = random.Random(seed)
+    counts = [rng.randrange(4) for _ in range(60)]
+    histogram = DueHistogram(START, [START + timedelta(days=d) for d, n in enumerate(counts) for _ in range(n)])
+
+    for _ in range(50):
+        first = rng.randrange(50)
+        last = first + rng.randrange(10)
+        near = rng.randint(first, last)
+        best = min(range(first, last + 1), key=lambda d: (counts[d], abs(d - near), d))
+
+        first_day, last_day, near_day = (START + timedelta(days=d) for d in (first, last, near))
+        assert histogram.least_loaded(first_day, last_day, near_day) == START + timedelta(days=best)
+
+
+def test_window_before_the_histogram_is_not_moved():
+    histogram = DueHistogram(START, [START - timedelta(days=1)] * 5)
+    near = START - timedelta(days=20)
+
+    assert histogram.least_loaded(near - timedelta(days=2), near + timedelta(days=2), near) == near
+
+
+def test_past_review_stays_within_its_fuzz_window(make_card):
+    balancer = LoadBalancer.from_cards([], NOW)
+    review_time = NOW - timedelta(days=60)
+    card = make_card(interval_days=20.0, review_count=5, last_reviewed=review_time - timedelta(days=20))
+
+    balanced = apply_review(card, 1.0, review_time, balancer)
+    plain = apply_review(card, 1.0, review_time)
+
+    assert abs((balanced.next_review - plain.next_review).days) <= fuzz_days(plain.interval_days)
+    assert balanced.next_review < NOW
+
+
+def test_placements_move_at_most_fuzz_days(make_card):
+    rng = random.Random(0)
+    cards = [make_card(question=f"Q{i}") for i in range(300)]
+    balancer = LoadBalancer.from_cards(cards, NOW)
+
+    for day in range(60):
+        review_time = NOW + timedelta(days=day - 10)
+        for i in rng.sample(range(len(cards)), 20):
+            card = cards[i]
+            score = rng.choice([1.0, 1.0, 0.5, 0.0])
+            plain = apply_review(card, score, review_time)
+            cards[i] = apply_review(card, score, review_time, balancer)
+
+            shift = (cards[i].next_review - plain.next_review).days
+            assert abs(shift) <= fuzz_days(plain.interval_days)
+            assert cards[i].next_review.date() > review_time.date()
+            assert cards[i].interval_days == plain.interval_days + shift
+
+
+def test_balancing_flattens_a_bulk_import(make_card):
+    def peak(balance):
+        cards = [make_card(question=f"Q{i}") for i in range(400)]
+        balancer = LoadBalancer.from_cards(cards, NOW) if balance else None
+        due: dict[date, list] = {START: cards}
+        load = []
+        for day in range(60):
+            today = NOW + timedelta(days=day)
+            reviewed = due.pop(today.date(), [])
+            load.append(len(reviewed))
+            for card in reviewed:
+                updated = apply_review(card, 1.0, today, balancer)
+                next_day = max(updated.next_review.date(), today.date() + timedelta(days=1))
+                due.setdefault(next_day, []).append(updated)
+        return max(load[2:])
+
+    assert peak(True) < peak(False)
+
+
+def test_balance_command(run_cli):
+    run_cli("add", input='{"question": "Q", "answer": "A"}\n')
+
+    assert "Load balancing: off" in run_cli("balance").output
+    assert run_cli("balance", "on").exit_code == 0
+    assert "Load balancing: on" in run_cli("balance").output
+    assert run_cli("balance", "maybe").exit_code == 1
@@ -0,0 +1,46 @@
+"""Tests for repository-side paging of the card list."""
+
+from datetime import timedelta
+
+import pytest
+
+from flashcard_study.data.models import FlashCardDatabase
+
+from .conftest import NOW
+
+
+@pytest.fixture
+def cards(repository, make_card):
+    cards = [
+        make_card(f"Card {i}", "A", next_review=NOW + timedelta(days=(i * 7) % 10))
+        for i in range(10)
+    ]
+    repository.save(FlashCardDatabase(cards=cards))
+    return cards
+
+
+def test_page_in_file_order(repository, cards):
+    assert repository.count() == 10
+    assert repository.page(3, 4) == cards[3:7]
+    assert repository.page(8, 5) == cards[8:]
+
+
+def test_page_sorted(repository, cards):
+    expected = sorted(cards, key=lambda c: c.next_review)
+
+    assert repository.page(0, 4, sort_by="next_review") == expected[:4]
+    assert repository.page(0, 4, sort_by="next_review", descending=True) == expected[::-1][:4]
+    assert repository.page(8, 4, sort_by="next_review", descending=True) == expected[::-1][8:]
+
+
+def test_page_rejects_unknown_sort_key(repository, cards):
+    with pytest.raises(ValueError):
+        repository.page(0, 5, sort_by="question")
+
+
+def test_snapshot_follows_saves(repository, cards, make_card):
+    extra = make_card("Extra", "A")
+    repository.add_card(extra)
+
+    assert repository.count() == 11
+    assert repository.get_cards([extra.id, cards[0].id]) == [extra, cards[0]]
@@ -0,0 +1,125 @@
+"""Tests for the query language and its planners."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.domain.query import (
+    And, CompareTerm, Not, Or, QueryError, TagTerm, TextTerm, filter_query, parse_query,
+    plan_cards, plan_repository,
+)
+from flashcard_study.domain.search import SearchIndex
+from flashcard_study.domain.spaced_repetition import apply_review
+from flashcard_study.domain.tag_index import TagIndex
+
+
+def test_parse_precedence_and_implicit_and():
+    query = parse_query("tag:a OR tag:b NOT tag:c ease<2")
+
+    assert query == Or((
+        TagTerm("a"),
+        And((TagTerm("b"), Not(TagTerm("c")), CompareTerm("ease_factor", "<", 2.0))),
+    ))
+    assert str(parse_query("(tag:a OR is:new) AND due<7d")) == "(tag:a OR is:new) AND due<7d"
+
+
+def test_parse_words_and_quoted_text():
+    assert parse_query('text:"binary search"') == TextTerm(("binary", "search"))
+    assert parse_query("HEAP") == TextTerm(("heap",))
+
+
+@pytest.mark.parametrize("text", ["tag:a AND", "(tag:a", "type:essay", "speed>3", ")"])
+def test_malformed_queries_raise(text):
+    with pytest.raises(QueryError):
+        parse_query(text)
+
+
+@pytest.fixture
+def cards(make_card):
+    now = datetime.now()
+    hard = apply_review(make_card(question="Heap sort", tags=["algorithms"]), 0.0, now - timedelta(days=1))
+    return [
+        hard,
+        make_card(question="Heap push", tags=["python::heapq"]),
+        make_card(question="List append", tags=["python"], type="cloze", answer="{{c1::append}}"),
+        make_card(question="Binary search", tags=["algorithms"]),
+    ]
+
+
+def test_plan_cards_uses_the_most_selective_index(cards):
+    query = parse_query("tag:algorithms AND sort")
+    indexes = {"tag_index": TagIndex(cards), "search_index": SearchIndex(cards)}
+
+    plan = plan_cards(query, cards, **indexes)
+    by_tag = plan_cards(parse_query("tag:python AND heap"), cards, **indexes)
+
+    assert plan.steps[0] == "Look up text:sort in the search index: 1 of 4 cards"
+    assert plan.steps[1] == "Check tag:algorithms on those cards"
+    assert plan.run() == [cards[0]]
+    assert by_tag.steps[0] == "Look up tag:python in the tag index: 1 of 4 cards"
+    assert by_tag.run() == []
+
+
+def test_plan_cards_scans_without_indexes(cards):
+    plan = plan_cards(parse_query("tag:python::*"), cards)
+
+    assert plan.steps[0].startswith("Scan 4 cards")
+    assert plan.run() == cards[1:3]
+
+
+def test_plan_repository_tests_the_most_selective_term_first(repository, cards):
+    repository.save(FlashCardDatabase(cards=cards))
+    query = parse_query("reviews<5 AND tag:python::* AND type:cloze AND list")
+
+    plan = plan_repository(query, repository)
+
+    assert plan.steps[0] == "Scan the schedule index for type:cloze: 1 of 4 cards"
+    assert plan.steps[1] == "Check tag:python::* AND reviews<5 on those records: 1 cards"
+    assert plan.steps[-1] == "Check text:list on those cards"
+    assert plan.run() == [cards[2]]
+
+
+def test_plan_repository_matches_a_full_scan(repository, cards):
+    repository.save(FlashCardDatabase(cards=cards))
+    now = datetime.now()
+
+    for text in ["tag:algorithms OR is:new", "NOT is:new", "ease<2.5 AND due<7d", "heap"]:
+        query = parse_query(text)
+        expected = filter_query(cards, query, now)
+        assert sorted(c.question for c in plan_repository(query, repository, now).run()) == sorted(
+            c.question for c in expected
+        ), text
+
+
+def test_plan_repository_run_falls_back_when_segments_are_gone(repository, cards, monkeypatch):
+    repository.save(FlashCardDatabase(cards=cards))
+    plan = plan_repository(parse_query("tag:algorithms"), repository)
+
+    def gone(records):
+        raise FileNotFoundError("segment collected")
+    monkeypatch.setattr("flashcard_study.data.schedule_index.ScheduleIndex.fetch", lambda self, r: gone(r))
+
+    assert plan.run() == [cards[0], cards[3]]
+
+
+def test_search_command_uses_the_tag_index(run_cli):
+    run_cli("add", input=(
+        '{"question": "Heap sort", "answer": "A", "tags": ["algorithms"]}\n'
+        '{"question": "Heap push", "answer": "A", "tags": ["python"]}\n'
+        '{"question": "Quick sort", "answer": "A", "tags": ["algorithms"]}\n'
+    ))
+
+    explained = run_cli("search", "--explain", "tag:python AND heap")
+    result = run_cli("search", "tag:python AND heap")
+
+    assert "in the tag index: 1 of 3" in explained.output
+    assert "Heap push" in result.output and "Heap sort" not in result.output
+
+
+@pytest.mark.parametrize("query", ["", "   "])
+def test_search_command_rejects_an_empty_query(run_cli, query):
+    result = run_cli("search", query)
+
+    assert result.exit_code == 1
+    assert "Invalid query: Empty query" in result.output
@@ -0,0 +1,107 @@
+"""Tests for the quiz screen: prefetching and saving reviews."""
+
+import asyncio
+import threading
+
+from flashcard_study.app import FlashcardStudyApp
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.repository import FlashCardRepository
+from flashcard_study.ui.screens import quiz
+from flashcard_study.ui.screens.quiz import PREFETCH_DEPTH, QuizScreen, QuizSummaryScreen
+
+
+def _deck(make_card, size=6):
+    cards = [make_card(f"Question {i}", f"Answer {i}") for i in range(size)]
+    FlashCardRepository().save(FlashCardDatabase(cards=cards))
+    return cards
+
+
+def test_upcoming_cards_are_rendered_in_advance(home, make_card, monkeypatch):
+    cards = _deck(make_card)
+    rendered = []
+    monkeypatch.setattr(quiz, "render_card", lambda card, show_answer: rendered.append((card.id, show_answer)))
+
+    async def run():
+        app = FlashcardStudyApp()
+        async with app.run_test() as pilot:
+            await app.push_screen(QuizScreen(cards, app.repository))
+            await pilot.pause()
+            await pilot.pause()
+
+    asyncio.run(run())
+
+    upcoming = [card.id for card in cards[1:1 + PREFETCH_DEPTH]]
+    assert rendered[:2 * PREFETCH_DEPTH] == [(i, shown) for i in upcoming for shown in (False, True)]
+
+
+def test_scored_cards_are_saved(home, make_card):
+    cards = _deck(make_card, size=3)
+
+    async def run():
+        app = FlashcardStudyApp()
+        async with app.run_test() as pilot:
+            await app.push_screen(QuizScreen(cards, app.repository))
+            await pilot.pause()
+            for key in ("1", "0", "5"):
+                await pilot.press("space")
+                await pilot.press(key)
+                await pilot.pause()
+
+    asyncio.run(run())
+
+    saved = {card.id: card for card in FlashCardRepository().load().cards}
+    assert [saved[card.id].review_history[-1].score for card in cards] == [1.0, 0.0, 0.5]
+
+
+def test_finishing_flushes_off_the_event_loop(home, make_card, monkeypatch):
+    cards = _deck(make_card, size=1)
+    flushed_on = []
+    real_flush = quiz.WriteBehindWriter.flush
+
+    def flush(writer):
+        flushed_on.append(threading.current_thread() is threading.main_thread())
+        real_flush(writer)
+    monkeypatch.setattr(quiz.WriteBehindWriter, "flush", flush)
+
+    async def run():
+        app = FlashcardStudyApp()
+        async with app.run_test() as pilot:
+            await app.push_screen(QuizScreen(cards, app.repository))
+            await pilot.pause()
+            await pilot.press("space")
+            await pilot.press("1")
+            await pilot.press("1")  # Ignored while the reviews are saved
+            for _ in range(20):
+                await pilot.pause()
+                if isinstance(app.screen, QuizSummaryScreen):
+                    break
+            return app.screen
+
+    screen = asyncio.run(run())
+
+    assert flushed_on == [False]
+    assert isinstance(screen, QuizSummaryScreen) and screen.cards_reviewed == 1
+    assert FlashCardRepository().load().cards[0].review_count == 1
+
+
+def test_save_failure_on_finish_is_reported(home, make_card, monkeypatch):
+    cards = _deck(make_card, size=1)
+    monkeypatch.setattr(FlashCardRepository, "update_cards", lambda self, cards: 1 / 0)
+    notified = []
+
+    async def run():
+        app = FlashcardStudyApp()
+        monkeypatch.setattr(app, "notify", lambda message, **kw: notified.append((message, kw["severity"])))
+        async with app.run_test() as pilot:
+            await app.push_screen(QuizScreen(cards, app.repository))
+            await pilot.pause()
+            await pilot.press("space")
+            await pilot.press("1")
+            for _ in range(20):
+                await pilot.pause()
+                if isinstance(app.screen, QuizSummaryScreen):
+                    break
+
+    asyncio.run(run())
+
+    assert notified and notified[0][1] == "error" and "Failed to save 1 review(s)" in notified[0][0]
@@ -0,0 +1,81 @@
+"""Tests for batch review records and the 'review' command."""
+
+from datetime import datetime, timedelta
+from uuid import uuid4
+
+import pytest
+
+from flashcard_study.cli import _parse_review_record
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.repository import FlashCardRepository
+from flashcard_study.domain.spaced_repetition import apply_reviews
+
+from .conftest import NOW
+
+
+def test_parse_csv_and_json_records():
+    card_id = uuid4()
+    csv = _parse_review_record(f"{card_id}, 1, 2025-01-31T09:00:00")
+    json = _parse_review_record(
+        f'{{"card_id": "{card_id}", "score": 0.5, "timestamp": "2025-01-31T09:00:00"}}'
+    )
+
+    assert csv == (card_id, 1.0, datetime(2025, 1, 31, 9))
+    assert json == (card_id, 0.5, datetime(2025, 1, 31, 9))
+
+
+@pytest.mark.parametrize("line", [
+    "not-a-uuid,1,2025-01-31T09:00:00",
+    f"{uuid4()},1.5,2025-01-31T09:00:00",
+    f"{uuid4()},1",
+    f"{uuid4()},1,yesterday",
+])
+def test_parse_rejects_malformed_records(line):
+    with pytest.raises(ValueError):
+        _parse_review_record(line)
+
+
+def test_apply_reviews_in_timestamp_order(make_card):
+    card = make_card()
+    later, earlier = NOW + timedelta(days=2), NOW + timedelta(days=1)
+
+    cards, applied, unknown = apply_reviews([card], [(card.id, 1.0, later), (card.id, 0.0, earlier)])
+
+    assert applied == 2 and unknown == []
+    assert [entry.date for entry in cards[0].review_history] == [earlier, later]
+    assert cards[0].review_count == 2
+
+
+def test_apply_reviews_leaves_input_cards_untouched(make_card):
+    card = make_card()
+
+    cards, _, _ = apply_reviews([card], [(card.id, 1.0, NOW)])
+
+    assert card.review_history == [] and card.review_count == 0
+    assert cards[0] is not card
+
+
+def test_apply_reviews_reports_unknown_cards(make_card):
+    missing = uuid4()
+    _, applied, unknown = apply_reviews([make_card()], [(missing, 1.0, NOW)])
+    assert applied == 0 and unknown == [missing]
+
+
+def test_review_command_saves_once(run_cli, make_card):
+    card = make_card()
+    FlashCardRepository().save(FlashCardDatabase(cards=[card]))
+
+    result = run_cli("review", input=f"card_id,score,timestamp\n{card.id},1,2025-03-02T09:00:00\n")
+
+    assert result.exit_code == 0, result.output
+    assert FlashCardRepository().load().cards[0].review_count == 1
+
+
+def test_review_dry_run_does_not_save(run_cli, make_card):
+    card = make_card()
+    FlashCardRepository().save(FlashCardDatabase(cards=[card]))
+
+    result = run_cli("review", "--dry-run", input=f"{card.id},1,2025-03-02T09:00:00\n")
+
+    assert "Would apply 1 review(s)" in result.output
+    assert FlashCardRepository().load().cards[0].review_count == 0
@@ -0,0 +1,104 @@
+"""Tests for the fixed-width schedule index."""
+
+import os
+from datetime import datetime, timedelta
+
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.schedule_index import ARCHIVED, from_micros, index_path, to_micros
+from flashcard_study.domain.card_selector import CardSelector
+from flashcard_study.domain.statistics import StatisticsCalculator
+from flashcard_study.domain.spaced_repetition import apply_review
+
+
+def _deck(repository, make_card, monkeypatch):
+    monkeypatch.setattr("flashcard_study.data.repository.SEGMENT_SIZE", 2)
+    now = datetime.now()
+    cards = [
+        make_card(question="Python", tags=["python::basics"]),
+        make_card(question="Web", tags=["web"]),
+        apply_review(make_card(question="Reviewed", tags=["python"]), 1.0, now - timedelta(days=1)),
+        make_card(
+            question="Archived", tags=["python::async"], review_count=12, interval_days=90.0,
+            last_reviewed=now - timedelta(days=2), next_review=now + timedelta(days=88),
+        ),
+    ]
+    repository.save(FlashCardDatabase(cards=cards))
+    return cards
+
+
+def test_timestamps_round_trip():
+    moment = datetime(2025, 3, 1, 9, 30, 15, 123456)
+    assert from_micros(to_micros(moment)) == moment
+
+
+def test_records_cover_deck_and_archive(repository, make_card, monkeypatch):
+    cards = _deck(repository, make_card, monkeypatch)
+    index = repository.schedule_index()
+
+    records = list(index.records())
+
+    assert [r[0] for r in records] == [card.id.bytes for card in cards]
+    assert records[-1][9] == ARCHIVED
+    assert from_micros(records[2][1]) == cards[2].next_review
+    assert index.fetch(records) == cards
+
+
+def test_records_filter_by_tag_subtree(repository, make_card, monkeypatch):
+    cards = _deck(repository, make_card, monkeypatch)
+    index = repository.schedule_index()
+
+    python = [r[0] for r in index.records(["python::*"])]
+    web = [r[0] for r in index.records(["web"])]
+
+    assert python == [cards[0].id.bytes, cards[2].id.bytes, cards[3].id.bytes]
+    assert web == [cards[1].id.bytes]
+
+
+def test_fetch_reads_only_needed_segments(repository, make_card, monkeypatch):
+    cards = _deck(repository, make_card, monkeypatch)
+    index = repository.schedule_index()
+
+    records = list(index.records(["web"]))
+
+    assert index.segments_for(records) == (1, 2)
+    assert index.fetch(records) == [cards[1]]
+
+
+def test_stale_index_is_ignored(repository, make_card, monkeypatch):
+    _deck(repository, make_card, monkeypatch)
+    stat = repository.file_path.stat()
+    os.utime(repository.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert repository.schedule_index() is None
+
+
+def test_missing_index_is_ignored(repository, make_card, monkeypatch):
+    _deck(repository, make_card, monkeypatch)
+    index_path(repository.file_path).unlink()
+
+    assert repository.schedule_index() is None
+
+
+def test_statistics_from_index_match_loaded_deck(repository, make_card, monkeypatch):
+    _deck(repository, make_card, monkeypatch)
+    now = datetime.now()
+    database = repository.load()
+
+    from_index = StatisticsCalculator.calculate_from_index(repository.schedule_index(), now)
+    loaded = StatisticsCalculator.calculate(database.cards, now, database.archive)
+
+    assert from_index == loaded
+
+
+def test_selection_from_index_matches_loaded_deck(repository, make_card, monkeypatch):
+    _deck(repository, make_card, monkeypatch)
+    now = datetime.now()
+
+    with monkeypatch.context() as patched:
+        patched.setattr(repository, "load", lambda: 1 / 0)
+        from_index = CardSelector.select_from_repository(repository, count=10, include_all=True, now=now)
+    index_path(repository.file_path).unlink()
+    loaded = CardSelector.select_from_repository(repository, count=10, include_all=True, now=now)
+
+    assert [card.id for card in from_index] == [card.id for card in loaded]
+    assert len(from_index) == 3
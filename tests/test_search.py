@@ -0,0 +1,53 @@
+"""Tests for the full-text search index."""
+
+from flashcard_study.domain.search import SearchIndex, tokenize
+
+
+def test_tokenize_lowercases_words():
+    assert tokenize("What's O(n log n)?") == ["what", "s", "o", "n", "log", "n"]
+
+
+def test_search_requires_every_term(make_card):
+    binary = make_card("Binary search complexity", "O(log n)")
+    linear = make_card("Linear search complexity", "O(n)")
+    index = SearchIndex([binary, linear])
+
+    assert {card_id for card_id, _ in index.search("search complexity")} == {binary.id, linear.id}
+    assert [card_id for card_id, _ in index.search("binary complexity")] == [binary.id]
+    assert index.search("binary trees") == []
+
+
+def test_prefixes_match_and_exact_tokens_rank_higher(make_card):
+    exact = make_card("What is a heap", "A tree")
+    prefix = make_card("Explain heapsort", "Sorting with a tree")
+    index = SearchIndex([prefix, exact])
+
+    assert [card_id for card_id, _ in index.search("heap")] == [exact.id, prefix.id]
+
+
+def test_question_outweighs_answer(make_card):
+    in_question = make_card("Python decorators", "Functions wrapping functions")
+    in_answer = make_card("Wrapping functions", "Python decorators")
+    index = SearchIndex([in_answer, in_question])
+
+    assert [card_id for card_id, _ in index.search("python")][0] == in_question.id
+
+
+def test_update_and_remove(make_card):
+    card = make_card("Old question", "Answer", ["legacy"])
+    index = SearchIndex([card])
+
+    index.update(card.model_copy(update={"question": "New question"}))
+    assert index.search("old") == []
+    assert [card_id for card_id, _ in index.search("new")] == [card.id]
+    assert [card_id for card_id, _ in index.search("legacy")] == [card.id]
+
+    index.remove(card.id)
+    assert len(index) == 0
+    assert index.search("new") == []
+
+
+def test_limit(make_card):
+    index = SearchIndex(make_card(f"Card number {i}", "x") for i in range(10))
+    assert len(index.search("card", limit=3)) == 3
+    assert len(index.search("card", limit=0)) == 10
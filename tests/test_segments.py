@@ -0,0 +1,98 @@
+"""Tests for the segmented deck layout."""
+
+from datetime import timedelta
+
+from flashcard_study.data import segments
+from flashcard_study.data.models import BackupPolicy, FlashCardDatabase
+from flashcard_study.data.segments import manifest_segments, segment_dir, segment_files
+from flashcard_study.domain.spaced_repetition import apply_review
+
+from .conftest import NOW
+
+
+def _save_deck(repository, make_card, monkeypatch, count, size=4):
+    monkeypatch.setattr("flashcard_study.data.repository.SEGMENT_SIZE", size)
+    cards = [make_card(question=f"Q{i}") for i in range(count)]
+    repository.save(FlashCardDatabase(cards=cards))
+    return cards
+
+
+def test_cards_are_split_into_segments(repository, make_card, monkeypatch):
+    cards = _save_deck(repository, make_card, monkeypatch, 10)
+
+    names = manifest_segments(repository.file_path)
+    database = repository.load()
+
+    assert len(names) == 3
+    assert [len(cards) for _, cards in database._loaded_segments] == [4, 4, 2]
+    assert database.cards == cards
+    assert "cards" not in repository.file_path.read_text()
+
+
+def test_save_rewrites_only_changed_segments(repository, make_card, monkeypatch):
+    _save_deck(repository, make_card, monkeypatch, 10)
+    before = manifest_segments(repository.file_path)
+    written = []
+    real_write = segments.write_segment
+    monkeypatch.setattr(
+        "flashcard_study.data.repository.write_segment",
+        lambda *args: written.append(args[1]) or real_write(*args),
+    )
+
+    database = repository.load()
+    database.cards[5] = apply_review(database.cards[5], 1.0, NOW + timedelta(days=1))
+    repository.save(database)
+    after = manifest_segments(repository.file_path)
+
+    assert len(written) == 1 and written[0][1].id == database.cards[5].id
+    assert after[0] == before[0] and after[2] == before[2]
+    assert after[1] != before[1]
+
+
+def test_new_cards_fill_the_last_segment(repository, make_card, monkeypatch):
+    _save_deck(repository, make_card, monkeypatch, 6)
+
+    database = repository.load()
+    database.cards += [make_card(question=f"New {i}") for i in range(3)]
+    repository.save(database)
+
+    assert [len(cards) for _, cards in repository.load()._loaded_segments] == [4, 4, 1]
+
+
+def test_unused_segments_are_collected(repository, make_card, monkeypatch):
+    _save_deck(repository, make_card, monkeypatch, 8)
+    database = repository.load()
+    database.backups = BackupPolicy(recent=0, hourly=0, daily=0, weekly=0)
+    repository.save(database)
+
+    database = repository.load()
+    database.cards = database.cards[:4]
+    repository.save(database)
+
+    files = {path.name for path in segment_files(segment_dir(repository.file_path))}
+    assert files == set(manifest_segments(repository.file_path))
+    assert len(files) == 1
+
+
+def test_segments_pinned_by_backups_are_kept(repository, make_card, monkeypatch):
+    _save_deck(repository, make_card, monkeypatch, 8)
+    before = set(manifest_segments(repository.file_path))
+
+    database = repository.load()
+    database.cards = database.cards[:4]
+    repository.save(database)
+
+    files = {path.name for path in segment_files(segment_dir(repository.file_path))}
+    assert before <= files
+
+
+def test_inline_database_is_converted_on_save(repository, make_card):
+    cards = [make_card(question=f"Q{i}") for i in range(3)]
+    repository.file_path.write_text(FlashCardDatabase(cards=cards).model_dump_json())
+
+    database = repository.load()
+    assert database.cards == cards and database._loaded_segments is None
+    repository.save(database)
+
+    assert len(manifest_segments(repository.file_path)) == 1
+    assert repository.load().cards == cards
@@ -0,0 +1,71 @@
+"""Tests for the MinHash/LSH near-duplicate index."""
+
+from flashcard_study.domain.similarity import SimilarityIndex
+
+QUESTION = "What does the global interpreter lock in CPython prevent threads from doing at the same time"
+
+
+def _deck(make_card):
+    return [
+        make_card(QUESTION, "Running bytecode in parallel"),
+        make_card(QUESTION + " exactly", "Running bytecode in parallel"),
+        make_card("Which sorting algorithm has guaranteed n log n worst case time", "Heapsort"),
+    ]
+
+
+def test_query_finds_near_duplicates_only(make_card):
+    cards = _deck(make_card)
+    index = SimilarityIndex()
+    index.sync(cards)
+
+    matches = index.query(make_card(QUESTION, "Running bytecode in parallel"))
+
+    assert {card_id for card_id, _ in matches} == {cards[0].id, cards[1].id}
+    assert all(similarity >= index.threshold for _, similarity in matches)
+
+
+def test_query_ignores_the_card_itself(make_card):
+    cards = _deck(make_card)
+    index = SimilarityIndex()
+    index.sync(cards)
+
+    assert [card_id for card_id, _ in index.query(cards[0])] == [cards[1].id]
+
+
+def test_clusters_group_duplicates(make_card):
+    cards = _deck(make_card)
+    index = SimilarityIndex()
+    index.sync(cards)
+
+    assert [set(cluster) for cluster in index.clusters()] == [{cards[0].id, cards[1].id}]
+
+
+def test_sync_drops_removed_and_resigns_edited_cards(make_card):
+    cards = _deck(make_card)
+    index = SimilarityIndex()
+    index.sync(cards)
+
+    edited = cards[1].model_copy(update={"question": "Name a stable sorting algorithm", "answer": "Merge sort"})
+    index.sync([edited, cards[2]])
+
+    assert len(index) == 2
+    assert index.query(make_card(QUESTION, "Running bytecode in parallel")) == []
+
+
+def test_save_and_load_round_trip(tmp_path, make_card):
+    cards = _deck(make_card)
+    index = SimilarityIndex()
+    index.sync(cards)
+    path = tmp_path / "similarity.json"
+    index.save(path)
+
+    loaded = SimilarityIndex.load(path)
+
+    assert len(loaded) == len(cards)
+    assert loaded.query(cards[0]) == index.query(cards[0])
+
+
+def test_load_of_unreadable_cache_is_empty(tmp_path):
+    path = tmp_path / "similarity.json"
+    path.write_text("{broken")
+    assert len(SimilarityIndex.load(path)) == 0
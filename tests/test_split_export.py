@@ -0,0 +1,66 @@
+"""Tests for export --split-by-tag."""
+
+import pytest
+import typer
+
+from flashcard_study.cli import _clashing_names, _split_file_names, export_split_by_tag
+from flashcard_study.domain.tag_index import TagIndex
+
+
+def test_partition_groups_cards_by_tag_prefix(make_card):
+    cards = [
+        make_card(tags=["python::basics"]),
+        make_card(tags=["python::async", "web"]),
+        make_card(tags=["web"]),
+    ]
+    index = TagIndex(cards)
+
+    by_tag = index.partition()
+    by_prefix = index.partition(prefix_depth=1)
+
+    assert {tag: len(group) for tag, group in by_tag.items()} == {
+        "python::async": 1, "python::basics": 1, "web": 2,
+    }
+    assert {tag: len(group) for tag, group in by_prefix.items()} == {"python": 2, "web": 2}
+
+
+def test_file_names_are_slugs_when_unique():
+    assert _split_file_names(["python::basics", "web"]) == {
+        "python::basics": "python_basics.apkg",
+        "web": "web.apkg",
+    }
+
+
+def test_clashing_slugs_get_distinct_names():
+    names = _split_file_names(["c#", "c++", "C", "go"])
+
+    assert len(set(name.lower() for name in names.values())) == 4
+    assert names["go"] == "go.apkg"
+    assert names["c#"].startswith("c-") and names["c++"].startswith("c-")
+    assert _clashing_names(names) == {}
+
+
+def test_clashing_names_reports_shared_files():
+    assert _clashing_names({"a": "x.apkg", "b": "X.apkg", "c": "y.apkg"}) == {"x.apkg": ["a", "b"]}
+
+
+def test_split_export_writes_one_deck_per_tag(tmp_path, make_card):
+    cards = [make_card(tags=["c#"]), make_card(tags=["c++"]), make_card(tags=["c++"])]
+
+    export_split_by_tag(cards, tmp_path, "Deck", None, 0, 1)
+
+    files = sorted(tmp_path.glob("*.apkg"))
+    assert len(files) == 2
+    assert all(path.stat().st_size > 0 for path in files)
+
+
+def test_split_export_refuses_to_overwrite(tmp_path, make_card, monkeypatch):
+    monkeypatch.setattr(
+        "flashcard_study.cli._split_file_names",
+        lambda tags: {tag: "same.apkg" for tag in tags},
+    )
+    cards = [make_card(tags=["a"]), make_card(tags=["b"])]
+
+    with pytest.raises(typer.Exit):
+        export_split_by_tag(cards, tmp_path, "Deck", None, 0, 1)
+    assert not list(tmp_path.glob("*.apkg"))
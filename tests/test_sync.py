@@ -0,0 +1,141 @@
+"""Tests for two-way sync: Merkle diff, card merges and digest caching."""
+
+from datetime import timedelta
+
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.repository import FlashCardRepository
+from flashcard_study.domain import sync
+from flashcard_study.domain.spaced_repetition import apply_review
+from flashcard_study.domain.sync import DigestCache, MerkleTree, merge_card, plan_sync
+
+from .conftest import NOW
+
+
+def _review(card, score, days):
+    return apply_review(card, score, NOW + timedelta(days=days))
+
+
+def test_merkle_diff_finds_only_changed_cards(make_card):
+    cards = [make_card(question=f"Q{i}") for i in range(200)]
+    changed = _review(cards[7], 1.0, 1)
+    added = make_card(question="New")
+    other = cards[:7] + [changed] + cards[8:] + [added]
+
+    assert MerkleTree(cards).diff(MerkleTree(list(reversed(cards)))) == set()
+    assert MerkleTree(cards).diff(MerkleTree(other)) == {changed.id, added.id}
+    assert MerkleTree(cards).root != MerkleTree(other).root
+
+
+def test_merkle_tree_uses_given_digests(make_card, monkeypatch):
+    cards = [make_card(question=f"Q{i}") for i in range(3)]
+    digests = {card.id: sync.card_digest(card) for card in cards}
+    monkeypatch.setattr(sync, "card_digest", lambda card: 1 / 0)
+
+    assert MerkleTree(cards, digests=digests).root == MerkleTree(cards, digests=dict(digests)).root
+
+
+def test_merge_card_side_with_every_review_wins(make_card):
+    card = _review(make_card(), 1.0, 0)
+    newer = _review(card, 1.0, 3)
+
+    assert merge_card(newer, card) is newer
+    assert merge_card(card, newer) is newer
+
+
+def test_merge_card_replays_reviews_from_both_sides(make_card):
+    card = _review(make_card(), 1.0, 0)
+    local = _review(card, 1.0, 2)
+    remote = _review(card, 0.0, 3)
+
+    merged = merge_card(local, remote)
+
+    assert [entry.date for entry in merged.review_history] == [
+        NOW, NOW + timedelta(days=2), NOW + timedelta(days=3)
+    ]
+    assert merged.review_count == 3
+    assert merged.version == max(local.version, remote.version) + 1
+    assert merged == merge_card(remote, local).model_copy(update={"version": merged.version})
+
+
+def test_merge_card_keeps_an_edit_made_at_the_same_version(make_card):
+    card = _review(make_card(), 1.0, 0)
+    local = card.model_copy(update={"answer": "Local answer"})
+    remote = card.model_copy(update={"answer": "Remote answer"})
+
+    merged = merge_card(local, remote)
+
+    assert merged == merge_card(remote, local)
+    assert merged.answer == max(local, remote, key=lambda c: c.content_hash()).answer
+    assert merged.version == card.version + 1
+    assert merged.review_history == card.review_history
+    assert merge_card(card, card.model_copy()) is card
+
+
+def test_plan_sync_counts_pulled_pushed_and_merged(make_card):
+    base = [_review(make_card(question=f"Q{i}"), 1.0, 0) for i in range(4)]
+    local = [_review(base[0], 1.0, 2), base[1], _review(base[2], 1.0, 2), base[3]]
+    remote = [base[0], _review(base[1], 1.0, 2), _review(base[2], 0.0, 3), base[3]]
+    only_remote = make_card(question="Remote only")
+
+    plan = plan_sync(local, remote + [only_remote])
+
+    assert (plan.pushed, plan.pulled, plan.merged) == (1, 2, 1)
+    assert set(plan.to_local) == {base[1].id, base[2].id, only_remote.id}
+    assert set(plan.to_remote) == {base[0].id, base[2].id}
+    assert plan.to_local[base[2].id] is plan.to_remote[base[2].id]
+
+
+def test_digest_cache_hashes_each_source_once(tmp_path, make_card, monkeypatch):
+    cards = [make_card(question=f"Q{i}") for i in range(3)]
+    path = tmp_path / "deck.merkle.json"
+    cache = DigestCache()
+    first = cache.digests("segment:a", cards)
+    cache.digests("segment:b", cards[:1])
+    cache.save(path)
+
+    reloaded = DigestCache.load(path)
+    monkeypatch.setattr(sync, "card_digest", lambda card: 1 / 0)
+    assert reloaded.digests("segment:a", cards) == first
+    reloaded.save(path)
+    assert DigestCache.load(path)._sources.keys() == {"segment:a"}
+
+
+def test_digest_cache_ignores_unreadable_file(tmp_path):
+    path = tmp_path / "deck.merkle.json"
+    path.write_text("not json")
+
+    assert DigestCache.load(path)._sources == {}
+
+
+def test_card_sources_change_with_segments(tmp_path, make_card):
+    repository = FlashCardRepository(tmp_path / "flashcards.json")
+    cards = [make_card(question=f"Q{i}") for i in range(3)]
+    repository.save(FlashCardDatabase(cards=cards))
+
+    database = repository.load()
+    sources = repository.card_sources(database)
+    database.cards[1] = _review(database.cards[1], 1.0, 1)
+    repository.save(database)
+    changed = repository.card_sources(repository.load())
+
+    assert [card.id for _, group in sources for card in group] == [card.id for card in cards]
+    assert sources[0][0].startswith("segment:")
+    assert sources[0][0] != changed[0][0]
+
+
+def test_sync_command_merges_both_decks(run_cli, home, tmp_path, make_card):
+    card = _review(make_card(), 1.0, 0)
+    local = FlashCardRepository(home / "flashcards.json")
+    remote = FlashCardRepository(tmp_path / "remote" / "flashcards.json")
+    local.save(FlashCardDatabase(cards=[_review(card, 1.0, 2)]))
+    remote.save(FlashCardDatabase(cards=[_review(card, 0.0, 3), make_card(question="Other")]))
+
+    result = run_cli("sync", str(tmp_path / "remote"))
+    again = run_cli("sync", str(tmp_path / "remote"))
+
+    assert result.exit_code == 0, result.output
+    assert "Pulled 1, pushed 0, merged 1" in result.output
+    assert "Pulled 0, pushed 0, merged 0" in again.output
+    assert (home / "flashcards.merkle.json").exists()
+    assert sorted(c.question for c in local.all_cards(local.load())) == ["Other", "What is 2 + 2?"]
+    assert local.all_cards(local.load()) == remote.all_cards(remote.load())
@@ -0,0 +1,71 @@
+"""Tests for hierarchical tags and subtree filters."""
+
+from flashcard_study.domain.tag_index import (
+    TagIndex, TagQuery, TagTrie, filter_cards, parent_counts, subtree_counts, tag_prefixes,
+)
+
+
+def test_tag_prefixes_run_from_the_root():
+    assert list(tag_prefixes("a::b::c")) == ["a", "a::b", "a::b::c"]
+    assert list(tag_prefixes("plain")) == ["plain"]
+
+
+def test_query_matches_exact_tags_and_subtrees():
+    query = TagQuery(["web", "python::*"])
+
+    assert query.matches(["python"])
+    assert query.matches(["python::asyncio::tasks"])
+    assert query.matches(["web"])
+    assert not query.matches(["web::css"])
+    assert not query.matches(["pythonic"])
+
+
+def test_filter_cards_keeps_order(make_card):
+    cards = [
+        make_card(tags=["python::basics"]),
+        make_card(tags=["go"]),
+        make_card(tags=["python"]),
+    ]
+
+    assert filter_cards(cards, ["python::*"]) == [cards[0], cards[2]]
+    assert filter_cards(cards, None) == cards
+
+
+def test_trie_expands_subtree_patterns():
+    trie = TagTrie(["python", "python::asyncio", "python::basics", "pythonic"])
+
+    assert sorted(trie.expand(["python::*"])) == ["python", "python::asyncio", "python::basics"]
+    assert trie.expand(["python::asyncio", "missing", "missing::*"]) == ["python::asyncio"]
+    assert "python" in trie and "python::a" not in trie
+
+
+def test_subtree_counts_count_each_card_once_per_subtree():
+    counts = subtree_counts([(["python", "python::asyncio"], 1), (["python::basics"], 2)])
+
+    assert counts == {"python": 3, "python::asyncio": 1, "python::basics": 2}
+    assert parent_counts(counts) == {"python": 3}
+
+
+def test_tag_index_looks_up_subtrees(make_card):
+    cards = [
+        make_card(tags=["python::asyncio", "python"]),
+        make_card(tags=["python::basics"]),
+        make_card(tags=["web"]),
+    ]
+    index = TagIndex(cards)
+
+    assert index.cards_for(["python::*"]) == [cards[0], cards[1]]
+    assert index.cards_for(["web", "python::basics"]) == [cards[2], cards[1]]
+    assert list(index.partition(tags=["python::*"])) == ["python", "python::asyncio", "python::basics"]
+
+
+def test_select_accepts_subtree_patterns(run_cli):
+    run_cli("add", input=(
+        '{"question": "Q1", "answer": "A", "tags": ["python::asyncio"]}\n'
+        '{"question": "Q2", "answer": "A", "tags": ["web"]}\n'
+    ))
+
+    result = run_cli("select", "--tags", "python::*")
+
+    assert result.exit_code == 0, result.output
+    assert '"Q1"' in result.output and '"Q2"' not in result.output
@@ -0,0 +1,47 @@
+"""Tests for the background write-behind writer."""
+
+import pytest
+
+from flashcard_study.data.models import FlashCardDatabase
+from flashcard_study.data.write_behind import WriteBehindWriter
+
+
+def test_flush_writes_latest_version_of_each_card(repository, make_card):
+    card = make_card()
+    repository.save(FlashCardDatabase(cards=[card]))
+    writer = WriteBehindWriter(repository)
+
+    writer.submit(card.model_copy(update={"answer": "first"}))
+    writer.submit(card.model_copy(update={"answer": "second"}))
+    writer.flush()
+
+    assert repository.load().cards[0].answer == "second"
+    writer.close()
+
+
+def test_close_flushes_and_rejects_later_submits(repository, make_card):
+    card = make_card()
+    repository.save(FlashCardDatabase(cards=[card]))
+    writer = WriteBehindWriter(repository)
+
+    writer.submit(card.model_copy(update={"answer": "saved"}))
+    writer.close()
+    writer.close()
+
+    assert repository.load().cards[0].answer == "saved"
+    with pytest.raises(RuntimeError):
+        writer.submit(card)
+
+
+def test_errors_are_reported_with_the_failed_cards(repository, make_card):
+    failures = []
+    writer = WriteBehindWriter(repository, on_error=lambda error, cards: failures.append((error, cards)))
+    missing = make_card()
+
+    writer.submit(missing)
+    writer.close()
+
+    assert len(failures) == 1
+    error, cards = failures[0]
+    assert isinstance(error, ValueError)
+    assert cards == [missing]